@@ -0,0 +1,93 @@
+import argparse
+import random
+
+from mtg_draft_ai import deckbuild, scalebench, synergy, synthcube
+from mtg_draft_ai.brains import all_common_neighbors
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Measures how the runtime and memory of hot paths grow with the size of synthetic cubes.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[250, 500, 1000, 2000, 5000, 10000],
+                        help='Cube sizes to measure')
+    parser.add_argument('--paths', nargs='+', choices=list(PATHS.keys()), default=list(PATHS.keys()),
+                        help='Hot paths to measure')
+    parser.add_argument('--themes', type=int, default=10, help='Number of synergy themes in each cube')
+    parser.add_argument('--pools', type=int, default=5, help='Number of pools to build for each deckbuild measurement')
+    parser.add_argument('--max-seconds', type=float, default=60,
+                        help='Stop measuring a path at larger sizes once it takes longer than this')
+    parser.add_argument('--no-memory', action='store_true', help='Skip the peak memory measurements')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='Number of timed runs of each path, after a warm-up run. The fastest is reported')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed for generating cubes and pools')
+    parser.add_argument('--csv', type=str, default='output/cube_scaling.csv', help='CSV file to write results to')
+    parser.add_argument('--plot', type=str, default=None, help='Image file to plot results to; requires matplotlib')
+
+    args = parser.parse_args()
+
+    measurements = []
+    too_slow = set()
+    for size in sorted(args.sizes):
+        cards, fixers = synthcube.generate_cube(size, num_themes=args.themes, seed=args.seed)
+        cube_list = synthcube.cube_list(cards, fixers)
+        pools = _pools(cube_list, args.pools, random.Random(args.seed))
+
+        for path in args.paths:
+            if path in too_slow:
+                print('{} cards, {}: skipped, slower than {}s at a smaller size'.format(size, path, args.max_seconds))
+                continue
+
+            seconds, peak_memory = scalebench.measure(lambda: PATHS[path](cube_list, pools),
+                                                      measure_memory=not args.no_memory, repeat=args.repeat)
+            measurements.append(scalebench.Measurement(path=path, size=size, seconds=seconds,
+                                                       peak_memory_bytes=peak_memory))
+            print('{} cards, {}: {:.3f}s{}'.format(size, path, seconds, '' if peak_memory is None else
+                                                   ', peak memory {:.1f} MiB'.format(peak_memory / 2 ** 20)))
+            if seconds > args.max_seconds:
+                too_slow.add(path)
+
+    for path in args.paths:
+        path_measurements = [m for m in measurements if m.path == path]
+        for metric in ['seconds', 'peak_memory_bytes']:
+            exponent = scalebench.scaling_exponent([m.size for m in path_measurements],
+                                                   [getattr(m, metric) for m in path_measurements])
+            if exponent is not None:
+                print('{} {} ~ size^{:.2f}'.format(path, metric, exponent))
+    for path, metric, exponent in scalebench.superlinear_paths(measurements):
+        print('WARNING: {} {} grows super-linearly with cube size (~size^{:.2f})'.format(path, metric, exponent))
+
+    scalebench.write_csv(measurements, args.csv)
+    print('Results written to {}'.format(args.csv))
+    if args.plot:
+        scalebench.plot(measurements, args.plot, size_label='Cube size (cards)')
+        print('Plot written to {}'.format(args.plot))
+
+
+def _pools(cube_list, num_pools, rng, pool_size=45):
+    """Samples pools resembling drafted pools: mostly cards from 3 colors, plus some cards from anywhere."""
+    pools = []
+    for _ in range(0, num_pools):
+        colors = set(rng.sample(synthcube.COLORS, 3))
+        candidates = [c for c in cube_list if set(c.color_id) <= colors or c.color_id == 'C']
+        pool = rng.sample(candidates, pool_size * 2 // 3) + rng.sample(cube_list, pool_size - pool_size * 2 // 3)
+        pools.append(list(dict.fromkeys(pool)))
+    return pools
+
+
+def _build_pools(cube_list, pools):
+    for pool in pools:
+        try:
+            deckbuild.best_two_color_synergy_build(pool, prune=True)
+        except deckbuild.DeckbuildError:
+            pass
+
+
+PATHS = {
+    'create_graph': lambda cube_list, pools: synergy.create_graph(cube_list),
+    'all_common_neighbors': lambda cube_list, pools: all_common_neighbors(cube_list),
+    'best_two_color_synergy_build': _build_pools,
+}
+
+
+if __name__ == '__main__':
+    main()
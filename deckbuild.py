@@ -1,14 +1,34 @@
+from concurrent.futures import ProcessPoolExecutor
+import functools
 import sys
-from mtg_draft_ai import draftlog, deckbuild, display, synergy
+from mtg_draft_ai import draftlog, deckbuild, deckcache, display, synergy
 from mtg_draft_ai.api import read_cube_toml
 
 log_file = sys.argv[1]
 output_file = 'output/build.html' if len(sys.argv) < 3 else sys.argv[2]
+# Optional - number of processes to build color combinations with
+num_processes = None if len(sys.argv) < 4 else int(sys.argv[3])
+# Decks are cached by pool, so building the same log again is instant
+cache = deckcache.DeckbuildCache('output/deckbuild_cache.sqlite3')
 
 cube_list = read_cube_toml('cube_81183_tag_data.toml')
 drafters = draftlog.load_drafters_from_log(log_file, card_list=cube_list)
 
-decks = [deckbuild.best_two_color_synergy_build(d.cards_owned) for d in drafters]
+
+def print_build_results(results):
+    print(deckbuild.format_build_results(results))
+
+
+version = deckcache.cube_version(cube_list)
+if num_processes:
+    with ProcessPoolExecutor(max_workers=num_processes) as executor:
+        build_fn = functools.partial(deckbuild.best_two_color_synergy_build, executor=executor, prune=True,
+                                     batch_size=num_processes, on_results=print_build_results)
+        decks = [cache.build(d.cards_owned, version, build_fn, deckcache.deckbuild_options(build_fn))
+                 for d in drafters]
+else:
+    build_fn = functools.partial(deckbuild.best_two_color_synergy_build, prune=True, on_results=print_build_results)
+    decks = [cache.build(d.cards_owned, version, build_fn, deckcache.deckbuild_options(build_fn)) for d in drafters]
 
 
 def decks_to_html(decks):
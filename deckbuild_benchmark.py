@@ -0,0 +1,86 @@
+import argparse
+import functools
+import random
+import statistics
+import time
+
+from mtg_draft_ai import communities, deckbuild, synergy
+from mtg_draft_ai.api import read_cube_toml
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Compares deckbuild runtime and deck edge counts for each community detection backend.')
+    parser.add_argument('-n', type=int, help='Number of pools to build', default=50)
+    parser.add_argument('--seed', type=int, help='Random seed for generating the pools', default=0)
+    parser.add_argument('--pool-size', type=int, help='Number of cards in each pool', default=45)
+    parser.add_argument('--card-data', type=str, help='Path to card data',
+                        default='tests/data/cube_81183_tag_data.toml')
+    parser.add_argument('--fixer-data', type=str, help='Path to fixer data',
+                        default='tests/data/cube_81183_fixer_data.toml')
+    parser.add_argument('--backends', nargs='+', choices=list(communities.BACKENDS.keys()),
+                        default=list(communities.BACKENDS.keys()),
+                        help='Backends to compare, the first is the baseline')
+    parser.add_argument('--prune', action='store_true', help='Prune color combinations that can\'t beat the best')
+    parser.add_argument('--search-seconds', type=float, default=None,
+                        help='Improve each color combination\'s build with local search for this many seconds')
+
+    args = parser.parse_args()
+
+    cube_list = read_cube_toml(args.card_data, args.fixer_data)
+    pools = fixed_pools(cube_list, args.n, args.pool_size, args.seed)
+
+    edges_by_backend = {}
+    for backend in args.backends:
+        start = time.perf_counter()
+        builds = [build_edges(pool, backend, args.prune, args.search_seconds) for pool in pools]
+        elapsed = time.perf_counter() - start
+        edges_by_backend[backend] = [num_edges for num_edges, _ in builds]
+
+        edges = [e for e in edges_by_backend[backend] if e is not None]
+        print('{}: {:.2f}s total, {:.1f}ms per pool, mean edges {:.2f} (min {}, max {}), {} pools failed, '
+              '{:.1f} of 40 color combos skipped per pool'.format(
+                  backend, elapsed, elapsed * 1000 / len(pools), statistics.mean(edges), min(edges), max(edges),
+                  len(pools) - len(edges), statistics.mean(num_skipped for _, num_skipped in builds)))
+
+    baseline = args.backends[0]
+    for backend in args.backends[1:]:
+        pairs = [(b, e) for b, e in zip(edges_by_backend[baseline], edges_by_backend[backend])
+                 if b is not None and e is not None]
+        print('{} vs {}: better on {} pools, worse on {}, same on {}'.format(
+            backend, baseline, sum(e > b for b, e in pairs), sum(e < b for b, e in pairs),
+            sum(e == b for b, e in pairs)))
+
+
+def fixed_pools(cube_list, num_pools, pool_size, seed):
+    """Generates pools resembling drafted pools: mostly cards from 3 colors, plus some cards from anywhere."""
+    rng = random.Random(seed)
+    pools = []
+    for _ in range(0, num_pools):
+        colors = rng.sample('WUBRG', 3)
+        candidates = [c for c in cube_list if c.color_id and
+                      (set(c.color_id) <= set(colors) or c.color_id == 'C' or 'land' in c.types)]
+        pool = rng.sample(candidates, pool_size * 2 // 3) + rng.sample(cube_list, pool_size - pool_size * 2 // 3)
+        pools.append(list(dict.fromkeys(pool)))
+    return pools
+
+
+def build_edges(pool, backend, prune, search_seconds):
+    """Returns the number of edges in the pool's best build (None if it can't be built), and the number of color
+    combinations pruning skipped."""
+    results = []
+    kwargs = {'community_backend': backend, 'prune': prune, 'on_results': results.extend}
+    if search_seconds is not None:
+        kwargs['build_fn'] = functools.partial(deckbuild.local_search_build, time_budget=search_seconds)
+    try:
+        deck = deckbuild.best_two_color_synergy_build(pool, **kwargs)
+    except deckbuild.DeckbuildError:
+        deck = None
+    num_skipped = len([r for r in results if r.skipped])
+    if deck is None:
+        return None, num_skipped
+    return len(synergy.create_graph(deck, remove_isolated=False).edges), num_skipped
+
+
+if __name__ == '__main__':
+    main()
@@ -27,7 +27,6 @@ with open(draft_log_file, 'w') as f:
 print('Draft log written to {}'.format(draft_log_file))
 
 # Write draft.html - HTML display of full draft from every seat
-html = draftlog.log_to_html(draft_log_file)
 with open(output_file, 'w') as f:
-    f.write(html)
+    draftlog.write_drafters_html(controller.drafters, f)
 print('Draft HTML written to {}'.format(output_file))
@@ -0,0 +1,41 @@
+import argparse
+
+from mtg_draft_ai import synthcube
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Generates a synthetic cube as card data and fixer data TOML files, e.g. for scaling benchmarks.')
+    parser.add_argument('num_cards', type=int, help='Number of cards in the cube')
+    parser.add_argument('--card-data', type=str, help='Card data TOML file to write',
+                        default='synthetic_cube_tag_data.toml')
+    parser.add_argument('--fixer-data', type=str, help='Fixer data TOML file to write',
+                        default='synthetic_cube_fixer_data.toml')
+    parser.add_argument('--themes', type=int, default=10, help='Number of synergy themes')
+    parser.add_argument('--enabler-ratio', type=float, default=0.75,
+                        help='Fraction of theme tags which are Enabler tags, the rest are Payoff tags')
+    parser.add_argument('--themes-per-card', type=float, nargs='+', default=synthcube.DEFAULT_THEMES_PER_CARD,
+                        help='Probability of a nonland card having 0, 1, 2, ... theme tags')
+    parser.add_argument('--color-weights', type=float, nargs=5, default=[1, 1, 1, 1, 1],
+                        metavar=tuple(synthcube.COLORS),
+                        help='Relative frequency of each color (WUBRG) among colored cards')
+    parser.add_argument('--multicolor-fraction', type=float, default=0.15,
+                        help='Fraction of colored nonland cards which are two colors')
+    parser.add_argument('--land-fraction', type=float, default=0.08, help='Fraction of cards which are lands')
+    parser.add_argument('--fixer-fraction', type=float, default=0.6, help='Fraction of lands which are fixers')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed')
+
+    args = parser.parse_args()
+
+    cards, fixers = synthcube.generate_cube(
+        args.num_cards, num_themes=args.themes, enabler_ratio=args.enabler_ratio,
+        themes_per_card=args.themes_per_card, color_weights=dict(zip(synthcube.COLORS, args.color_weights)),
+        multicolor_fraction=args.multicolor_fraction, land_fraction=args.land_fraction,
+        fixer_fraction=args.fixer_fraction, seed=args.seed)
+    synthcube.write_cube_toml(cards, fixers, args.card_data, args.fixer_data)
+    print('Wrote {} cards to {} and {} fixers to {}'.format(len(cards), args.card_data, len(fixers),
+                                                             args.fixer_data))
+
+
+if __name__ == '__main__':
+    main()
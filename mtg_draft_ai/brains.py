@@ -3,8 +3,9 @@
 import abc
 import copy
 import random
+import time
 import networkx as nx
-from mtg_draft_ai import synergy
+from mtg_draft_ai import pickertiming, synergy
 from mtg_draft_ai.api import Card, Picker
 
 
@@ -34,9 +35,25 @@ class Factory:
     def __init__(self, output_class, kwargs):
         self.output_class = output_class
         self.kwargs = kwargs
+        self.timings = None
 
     def create(self):
-        return self.output_class(**self.kwargs)
+        picker = self.output_class(**self.kwargs)
+        if self.timings is not None:
+            picker.enable_timing(self.timings)
+        return picker
+
+    def enable_timing(self, timings=None):
+        """Makes every picker created from now on record per-component timings into the same ComponentTimings.
+
+        Args:
+            timings (pickertiming.ComponentTimings): Optional - timings to add to. A new one if not provided.
+
+        Returns:
+            pickertiming.ComponentTimings: The timings, which are also kept in the timings attribute.
+        """
+        self.timings = timings if timings is not None else pickertiming.ComponentTimings()
+        return self.timings
 
 
 class RatedCard:
@@ -116,20 +133,54 @@ class TwoColorComboRatingsPicker(Picker):
 
     def __init__(self, component_raters):
         self.component_raters = component_raters
+        # Per-component timings of every pick, only recorded once enabled since timing every call has a cost
+        self.timings = None
+
+    def enable_timing(self, timings=None):
+        """Records the wall time and number of calls of every component rater's rate and normalize, per pick.
+
+        Args:
+            timings (pickertiming.ComponentTimings): Optional - timings to add to, e.g. shared by several pickers.
+                A new one if not provided.
+
+        Returns:
+            pickertiming.ComponentTimings: The timings, which are also kept in the timings attribute.
+        """
+        self.timings = timings if timings is not None else pickertiming.ComponentTimings()
+        return self.timings
 
     def pick(self, pack, cards_owned, draft_info):
         ranked_candidates = self.ratings(pack, cards_owned, draft_info)
         return ranked_candidates[0].card if len(ranked_candidates) > 0 else pack[0]
 
     def ratings(self, pack, cards_owned, draft_info):
-        cards_with_rating_components = self._raw_rating_components(pack, cards_owned, draft_info)
-        cards_with_normalized_rating_components = self._normalized_ratings(cards_with_rating_components, cards_owned)
+        cards_with_normalized_rating_components = self.normalized_rating_components(pack, cards_owned, draft_info)
         rated_cards = self._final_ratings(cards_with_normalized_rating_components, cards_owned, draft_info)
         sorted_rated_cards = sorted(rated_cards, key=lambda rc: rc.rating, reverse=True)
 
         return sorted_rated_cards
 
-    def _raw_rating_components(self, pack, cards_owned, draft_info):
+    def normalized_rating_components(self, pack, cards_owned, draft_info):
+        """Returns unrated RatedCards for every on-color candidate x color combo, with normalized components.
+
+        Components don't depend on the component weights, so these can be reused to rate a pick with many different
+        weights, e.g. by replay.ComponentCorpus.
+        """
+        if self.timings is None:
+            cards_with_rating_components = self._raw_rating_components(pack, cards_owned, draft_info,
+                                                                       self.component_raters)
+            return self._normalized_ratings(cards_with_rating_components, cards_owned, self.component_raters)
+
+        start = time.perf_counter()
+        pick_timing = pickertiming.PickTiming()
+        component_raters = [_TimedComponentRater(cr, pick_timing) for cr in self.component_raters]
+        cards_with_rating_components = self._raw_rating_components(pack, cards_owned, draft_info, component_raters)
+        normalized_ratings = self._normalized_ratings(cards_with_rating_components, cards_owned, component_raters)
+        pick_timing.add(*pickertiming.TOTAL, time.perf_counter() - start)
+        self.timings.record_pick(pick_timing)
+        return normalized_ratings
+
+    def _raw_rating_components(self, pack, cards_owned, draft_info, component_raters):
         raw_rating_components = []
 
         for color_combo in COLOR_PAIRS:
@@ -137,16 +188,16 @@ class TwoColorComboRatingsPicker(Picker):
 
             for candidate in on_color_candidates:
                 rating_components = {cr.name(): cr.rate(candidate, color_combo, cards_owned, draft_info)
-                                     for cr in self.component_raters}
+                                     for cr in component_raters}
                 raw_rating_components.append(RatedCard(card=candidate, color_combo=color_combo,
                                              components=rating_components))
         random.shuffle(raw_rating_components) # Randomize order to avoid biasing towards certain colors in case of ties
         return raw_rating_components
 
-    def _normalized_ratings(self, cards_with_rating_components, cards_owned):
+    def _normalized_ratings(self, cards_with_rating_components, cards_owned, component_raters):
         normalized_ratings = [copy.copy(r) for r in cards_with_rating_components]
 
-        for component_rater in self.component_raters:
+        for component_rater in component_raters:
             key = component_rater.name()
             all_values = [rating.components[key] for rating in normalized_ratings]
             for rating in normalized_ratings:
@@ -168,6 +219,31 @@ class TwoColorComboRatingsPicker(Picker):
         return final_ratings
 
 
+class _TimedComponentRater(ComponentRater):
+    """Wraps a ComponentRater to add the time taken by every call to rate and normalize to a PickTiming."""
+
+    def __init__(self, component_rater, pick_timing):
+        super().__init__(weight=component_rater.weight)
+        self.component_rater = component_rater
+        self.pick_timing = pick_timing
+        self._name = component_rater.name()
+
+    def name(self):
+        return self._name
+
+    def rate(self, card, color_combo, cards_owned, draft_info):
+        start = time.perf_counter()
+        value = self.component_rater.rate(card, color_combo, cards_owned, draft_info)
+        self.pick_timing.add(self._name, 'rate', time.perf_counter() - start)
+        return value
+
+    def normalize(self, value, all_values, color_combo, cards_owned):
+        start = time.perf_counter()
+        normalized_value = self.component_rater.normalize(value, all_values, color_combo, cards_owned)
+        self.pick_timing.add(self._name, 'normalize', time.perf_counter() - start)
+        return normalized_value
+
+
 class CardsOwnedPowerRater(ComponentRater):
     """Rates the total power of the pool for a color combo, not counting the candidate card."""
 
@@ -310,22 +386,41 @@ class FixingLandsRater(ComponentRater):
 class SynergyPowerFixingPicker(TwoColorComboRatingsPicker):
     """Current best known configuration for 'New World Order' cube (81183)."""
 
-    def __init__(self, common_neighbors):
+    # Weight of each component rater, by name. Hand-tuned, see tune_weights.py for searching for better ones.
+    DEFAULT_WEIGHTS = {
+        'cards_owned_power': LinearProgressWeight(start=1, end=2),
+        'power_delta': LinearProgressWeight(start=2, end=1),
+        'cards_owned_syn_edges': LinearProgressWeight(start=1, end=2),
+        'syn_edges_delta': LinearProgressWeight(start=1, end=2),
+        'common_neighbors_weighted': LinearProgressWeight(start=2, end=1),
+        # Weight is equal to sum of weights for power delta + synergy delta + common neighbors,
+        # which are generally all 0 for fixing lands.
+        'land_fixer': ConstantWeight(5),
+    }
+
+    def __init__(self, common_neighbors, weights=None):
+        """
+        Args:
+            common_neighbors (Dict[Card, Dict[Card, List[Card]]]): Common neighbors of every pair of cards in the cube.
+            weights (Dict[str, object]): Optional - weights to use instead of DEFAULT_WEIGHTS, by component name.
+                Components not included keep their default weight.
+        """
+        weights = {**self.DEFAULT_WEIGHTS, **(weights or {})}
         component_raters = [
-            CardsOwnedPowerRater(weight=LinearProgressWeight(start=1, end=2)),
-            PowerDeltaRater(weight=LinearProgressWeight(start=2, end=1)),
-            CardsOwnedSynergyRater(weight=LinearProgressWeight(start=1, end=2)),
-            SynergyDeltaRater(weight=LinearProgressWeight(start=1, end=2)),
-            CommonNeighborsRater(common_neighbors=common_neighbors, weight=LinearProgressWeight(start=2, end=1)),
-            # Weight is equal to sum of weights for power delta + synergy delta + common neighbors,
-            # which are generally all 0 for fixing lands.
-            FixingLandsRater(weight=ConstantWeight(5))
+            CardsOwnedPowerRater(weight=weights['cards_owned_power']),
+            PowerDeltaRater(weight=weights['power_delta']),
+            CardsOwnedSynergyRater(weight=weights['cards_owned_syn_edges']),
+            SynergyDeltaRater(weight=weights['syn_edges_delta']),
+            CommonNeighborsRater(common_neighbors=common_neighbors, weight=weights['common_neighbors_weighted']),
+            FixingLandsRater(weight=weights['land_fixer'])
         ]
         super().__init__(component_raters)
 
     @classmethod
-    def factory(cls, card_list):
+    def factory(cls, card_list, weights=None):
         kwargs = {'common_neighbors': all_common_neighbors(card_list)}
+        if weights is not None:
+            kwargs['weights'] = weights
         return Factory(cls, kwargs)
 
 
@@ -345,6 +440,10 @@ class PowerFixingPicker(TwoColorComboRatingsPicker):
         return Factory(cls, {})
 
 
+# Pickers with a factory(card_list) method, by name, e.g. for choosing one from the command line
+PICKERS = {cls.__name__: cls for cls in [SynergyPowerFixingPicker, PowerFixingPicker]}
+
+
 def all_common_neighbors(cards):
     """Computes common neighbors for all pairs of cards.
 
@@ -0,0 +1,143 @@
+"""Community detection backends for synergy graphs.
+
+Every backend takes a networkx graph and returns a list of disjoint frozensets of nodes which cover the graph.
+"""
+
+import networkx as nx
+
+
+def greedy_modularity_communities(graph):
+    """Clauset-Newman-Moore greedy modularity maximization. The most thorough, and slowest, backend."""
+    return nx.algorithms.community.greedy_modularity_communities(graph)
+
+
+def label_propagation_communities(graph):
+    """Semi-synchronous label propagation. Much faster than modularity maximization, but doesn't optimize
+    modularity directly."""
+    return [frozenset(c) for c in nx.algorithms.community.label_propagation_communities(graph)]
+
+
+def louvain_communities(graph, max_levels=10):
+    """Louvain modularity maximization on a compressed sparse row (CSR) adjacency matrix.
+
+    Repeatedly moves single nodes to the neighboring community that most increases modularity until no move helps,
+    then merges each community into a single node and starts over on the merged graph. Nodes are visited in graph
+    order, so results are deterministic.
+
+    Args:
+        graph (networkx.Graph): The graph to partition.
+        max_levels (int): Maximum number of times to merge communities.
+
+    Returns:
+        List[frozenset]: Communities, largest first.
+    """
+    nodes = list(graph)
+    index = {node: i for i, node in enumerate(nodes)}
+    weights = {}
+    for u, v in graph.edges:
+        weights[(index[u], index[v])] = 1.0
+        weights[(index[v], index[u])] = 1.0
+    adjacency = _csr_matrix(len(nodes), weights)
+
+    # Community of each original node, as a row of the current (merged) adjacency matrix
+    membership = list(range(0, len(nodes)))
+
+    for _ in range(0, max_levels):
+        labels, moved = _louvain_local_moves(adjacency)
+        if not moved:
+            break
+
+        membership = [labels[m] for m in membership]
+        adjacency = _merge_rows(adjacency, labels)
+
+    communities = {}
+    for node, label in zip(nodes, membership):
+        communities.setdefault(label, []).append(node)
+    return sorted((frozenset(c) for c in communities.values()), key=len, reverse=True)
+
+
+def _csr_matrix(num_rows, weights):
+    """Builds a CSR matrix as (indptr, indices, data) lists from a dict of (row, column) -> weight."""
+    rows = [[] for _ in range(0, num_rows)]
+    for (row, column), weight in sorted(weights.items()):
+        rows[row].append((column, weight))
+
+    indptr = [0]
+    indices = []
+    data = []
+    for row in rows:
+        indices.extend(column for column, _ in row)
+        data.extend(weight for _, weight in row)
+        indptr.append(len(indices))
+    return indptr, indices, data
+
+
+def _merge_rows(adjacency, labels):
+    """Merges the nodes of a CSR adjacency matrix with the same label, summing the weights of their edges. Edges
+    within a label become self-loops."""
+    indptr, indices, data = adjacency
+    weights = {}
+    for row in range(0, len(indptr) - 1):
+        for i in range(indptr[row], indptr[row + 1]):
+            key = (labels[row], labels[indices[i]])
+            weights[key] = weights.get(key, 0.0) + data[i]
+    return _csr_matrix(max(labels) + 1, weights)
+
+
+def _louvain_local_moves(adjacency):
+    """Runs the node-moving phase of Louvain on a weighted CSR adjacency matrix, which may have self-loops.
+
+    Returns:
+        Tuple[List[int], bool]: The community of each node, numbered from 0, and whether any node was moved.
+    """
+    indptr, indices, weights = adjacency
+    num_nodes = len(indptr) - 1
+    degrees = [sum(weights[indptr[node]:indptr[node + 1]]) for node in range(0, num_nodes)]
+    total_weight = sum(degrees)
+
+    community = list(range(0, num_nodes))
+    community_degrees = list(degrees)
+    moved = False
+    if total_weight == 0:
+        return community, moved
+
+    improved = True
+    while improved:
+        improved = False
+        for node in range(0, num_nodes):
+            weight_to_community = {}
+            for i in range(indptr[node], indptr[node + 1]):
+                neighbor = indices[i]
+                if neighbor != node:
+                    weight_to_community[community[neighbor]] = \
+                        weight_to_community.get(community[neighbor], 0.0) + weights[i]
+
+            # Take the node out of its community, then put it in whichever community gains the most modularity
+            current = community[node]
+            degree_fraction = degrees[node] / total_weight
+            community_degrees[current] -= degrees[node]
+
+            best = current
+            best_gain = weight_to_community.get(current, 0.0) - community_degrees[current] * degree_fraction
+            for candidate, weight in weight_to_community.items():
+                gain = weight - community_degrees[candidate] * degree_fraction
+                if gain > best_gain + 1e-12:
+                    best, best_gain = candidate, gain
+
+            community_degrees[best] += degrees[node]
+            if best != current:
+                community[node] = best
+                improved = True
+                moved = True
+
+    # Renumber communities from 0, in order of first appearance
+    renumbered = {}
+    labels = [renumbered.setdefault(c, len(renumbered)) for c in community]
+    return labels, moved
+
+
+BACKENDS = {
+    'greedy_modularity': greedy_modularity_communities,
+    'label_propagation': label_propagation_communities,
+    'louvain': louvain_communities,
+}
@@ -1,14 +1,24 @@
 """Deckbuilding functions."""
 
-from collections import namedtuple
+from collections import namedtuple, OrderedDict
+import functools
 import itertools
+import networkx as nx
+import os
+import threading
+import time
 
-from mtg_draft_ai import synergy
+from mtg_draft_ai import communities as community_backends, synergy
 
-import networkx as nx
 
+# Version of the deckbuilding algorithm. Bump it whenever a change can build a different deck from the same pool, so
+# that decks cached by earlier versions (see deckcache) are rebuilt.
+BUILD_VERSION = 2
 
 _NONLANDS_IN_DECK_DEFAULT = 23
+DEFAULT_COMMUNITY_BACKEND = 'greedy_modularity'
+# Number of steps a card swapped in or out by local_search_build can't be swapped again
+_TABU_TENURE = 7
 
 _TWO_COLOR_COMBOS = ['WU', 'WB', 'WR', 'WG', 'UB', 'UR', 'UG', 'BR', 'BG', 'RG']
 _THREE_COLOR_COMBOS = ['WUB', 'WUR', 'WUG', 'WBR', 'WBG', 'WRG', 'UBR', 'UBG', 'URG', 'BRG']
@@ -22,33 +32,101 @@ def _num_nonlands(current_build):
 _CardSwap = namedtuple('CardSwap', ['card_to_remove', 'card_to_add', 'improvement'])
 
 
-def _find_best_swap(current_build, candidates_to_add, candidates_to_remove=None):
-    initial_candidates_to_remove = candidates_to_remove or current_build
-    # Only consider nonlands for swaps
-    initial_candidates_to_remove = [c for c in initial_candidates_to_remove if not 'land' in c.types]
-    candidates_to_add = [c for c in candidates_to_add if not 'land' in c.types]
-
-    card_to_add = None
-    card_to_remove = None
-    max_improvement = 0
-
-    for card in candidates_to_add:
-        build_with_card = current_build + [card]
-        graph_with_card = synergy.create_graph(build_with_card, remove_isolated=False)
-        current_removal_candidates = [c for c in initial_candidates_to_remove if c in build_with_card]
-
-        card_degree = graph_with_card.degree(card)
-        worst_card, worst_degree = min([(c, graph_with_card.degree(c)) for c in current_removal_candidates],
-                                       key=lambda tup: tup[1])
-        improvement = card_degree - worst_degree
-
-        if not card_to_add or improvement > max_improvement:
-            card_to_add, card_to_remove, max_improvement = card, worst_card, improvement
-
-    return _CardSwap(card_to_remove=card_to_remove, card_to_add=card_to_add, improvement=max_improvement)
+class _SwapEngine:
+    """Evaluates 1-for-1 swaps between a build and leftover cards without rebuilding synergy graphs.
 
+    Keeps a count of each card's synergy neighbors in the current build. For a card in the build that's its degree in
+    the build's graph, and for a leftover it's the degree it would have if added, so the improvement from any swap can
+    be computed in constant time. The build's lowest-degree cards are kept up to date too, so finding the card to swap
+    out for a candidate doesn't check the whole build.
+    """
 
-def _refine_build(current_build, leftovers):
+    def __init__(self, card_pool_graph, build):
+        """
+        Args:
+            card_pool_graph (networkx.Graph): Synergy graph containing every card in the build and every candidate.
+            build (List[Card]): The current build. Mutated in place by swap.
+        """
+        self.build = build
+        self._neighbors = {c: set(card_pool_graph[c]) for c in card_pool_graph}
+
+        in_build = set(build)
+        self._neighbors_in_build = {c: len(neighbors & in_build) for c, neighbors in self._neighbors.items()}
+        self._lowest_in_build = self._lowest_degrees(build)
+
+    def best_swap(self, candidates_to_add, candidates_to_remove=None):
+        """Finds the swap which adds the most edges to the build, comparing each candidate to add against the card
+        it would leave with the fewest edges.
+
+        Adding a candidate raises the degree of each of its neighbors by one, so that card is either a card with the
+        lowest degree that isn't a neighbor, or a card with one more than the lowest degree. Only those cards are
+        checked for each candidate.
+
+        Args:
+            candidates_to_add (List[Card]): Leftover cards which could be added.
+            candidates_to_remove (List[Card]): Optional - cards in the build which could be removed. Defaults to the
+                whole build.
+        """
+        if candidates_to_remove:
+            in_build = set(self.build)
+            min_degree, lowest_cards = self._lowest_degrees([c for c in candidates_to_remove if c in in_build])
+        else:
+            min_degree, lowest_cards = self._lowest_in_build
+        # Only consider nonlands for swaps
+        candidates_to_add = [c for c in candidates_to_add if not 'land' in c.types]
+
+        card_to_add = None
+        card_to_remove = None
+        max_improvement = 0
+
+        for card in candidates_to_add:
+            if not lowest_cards:
+                raise ValueError('No cards to swap out for {}'.format(card))
+            card_neighbors = self._neighbors[card]
+
+            # Ties go to the card that comes first in the build, as lowest_cards is in build order
+            worst_degree = min_degree
+            worst_card = next((c for c in lowest_cards
+                               if self._neighbors_in_build[c] == min_degree and c not in card_neighbors), None)
+            if worst_card is None:
+                # The candidate neighbors every card with the lowest degree
+                worst_degree = min_degree + 1
+                worst_card = next(c for c in lowest_cards
+                                  if self._neighbors_in_build[c] == min_degree or c not in card_neighbors)
+            improvement = self._neighbors_in_build[card] - worst_degree
+
+            if not card_to_add or improvement > max_improvement:
+                card_to_add, card_to_remove, max_improvement = card, worst_card, improvement
+
+        return _CardSwap(card_to_remove=card_to_remove, card_to_add=card_to_add, improvement=max_improvement)
+
+    def improvement(self, card_to_remove, card_to_add):
+        """Returns the number of edges the build would gain (or lose, if negative) by making the given swap."""
+        return self._neighbors_in_build[card_to_add] - self._neighbors_in_build[card_to_remove] - \
+            (1 if card_to_remove in self._neighbors[card_to_add] else 0)
+
+    def swap(self, card_to_remove, card_to_add):
+        self.build.remove(card_to_remove)
+        for n in self._neighbors[card_to_remove]:
+            self._neighbors_in_build[n] -= 1
+
+        self.build.append(card_to_add)
+        for n in self._neighbors[card_to_add]:
+            self._neighbors_in_build[n] += 1
+
+        self._lowest_in_build = self._lowest_degrees(self.build)
+
+    def _lowest_degrees(self, cards):
+        """Returns the lowest degree in the build of any nonland in cards, and the nonlands whose degree is the lowest
+        or one more than it, in the order they're given."""
+        nonlands = [c for c in cards if 'land' not in c.types]
+        if not nonlands:
+            return None, []
+        min_degree = min(self._neighbors_in_build[c] for c in nonlands)
+        return min_degree, [c for c in nonlands if self._neighbors_in_build[c] <= min_degree + 1]
+
+
+def _refine_build(swap_engine, leftovers):
     """Improves on current build by trying 1-for-1 swaps of leftover cards with cards in the current build.
 
     Checks all leftover cards to see if there exists a 1-for-1 swap with the worst card in the current build
@@ -56,31 +134,97 @@ def _refine_build(current_build, leftovers):
     Removed cards aren't considered for re-adding, so the process is guaranteed to terminate.
     """
     while True:
-        card_swap = _find_best_swap(current_build, leftovers)
+        card_swap = swap_engine.best_swap(leftovers)
 
         if card_swap.card_to_add and card_swap.improvement > 0:
-            current_build.remove(card_swap.card_to_remove)
-            current_build.append(card_swap.card_to_add)
+            swap_engine.swap(card_swap.card_to_remove, card_swap.card_to_add)
             leftovers.remove(card_swap.card_to_add)
         else:
             break
 
-    return current_build
+    return swap_engine.build
+
+
+class _CommunityScorer:
+    """Scores communities by the number of edges they would add to a build per card, without rebuilding graphs.
+
+    Keeps a count of each card's synergy neighbors in the build, which is updated as communities are added.
+    """
+
+    def __init__(self, card_pool_graph, build):
+        """
+        Args:
+            card_pool_graph (networkx.Graph): Synergy graph containing every card in the build and every community.
+            build (List[Card]): Cards already in the build.
+        """
+        self._graph = card_pool_graph
+        self._in_build = set()
+        self._neighbors_in_build = {c: 0 for c in card_pool_graph}
+        self.add(build)
+
+    def add(self, cards):
+        for card in set(cards) - self._in_build:
+            self._in_build.add(card)
+            for neighbor in self._graph[card]:
+                self._neighbors_in_build[neighbor] += 1
+
+    def score(self, comm):
+        new_cards = set(comm) - self._in_build
+        edges_to_build = sum(self._neighbors_in_build[c] for c in new_cards)
+        edges_within = sum(1 for c in new_cards for n in self._graph[c] if n in new_cards) // 2
+        return (edges_to_build + edges_within) / len(comm)
+
+
+# Community detection results for recently built graphs, keyed by the graph's set of cards. Color combinations
+# often end up with the same on-color cards (e.g. when a pool has nothing to splash), and the same pool is often
+# built more than once (e.g. reloading the auto-build page).
+_COMMUNITY_CACHE_SIZE = 256
+_community_cache = OrderedDict()
+_community_cache_lock = threading.Lock()
+
+
+def _communities(card_pool_graph, backend=DEFAULT_COMMUNITY_BACKEND):
+    """Returns communities of a synergy graph, from the cache if the same cards were seen before.
+
+    Synergy edges only depend on the cards themselves, so graphs with the same cards have the same communities.
 
+    Args:
+        card_pool_graph (networkx.Graph): Synergy graph to partition.
+        backend (str): Name of the community detection backend, from communities.BACKENDS.
+    """
+    key = (backend, frozenset(card_pool_graph.nodes))
+    with _community_cache_lock:
+        if key in _community_cache:
+            _community_cache.move_to_end(key)
+            return list(_community_cache[key])
+
+    communities = community_backends.BACKENDS[backend](card_pool_graph)
 
-def _comm_score(current_graph, comm):
-    build_with_comm = list(current_graph.nodes) + list(comm)
-    graph_with_comm = synergy.create_graph(build_with_comm, remove_isolated=False)
-    edges_added = len(graph_with_comm.edges) - len(current_graph.edges)
-    return edges_added / len(comm)
+    with _community_cache_lock:
+        _community_cache[key] = communities
+        if len(_community_cache) > _COMMUNITY_CACHE_SIZE:
+            _community_cache.popitem(last=False)
 
+    return list(communities)
 
-def _communities_build(card_pool_graph, main_colors, splash_colors=[]):
+
+def _least_central(graph):
+    """Returns the card with the lowest eigenvector centrality in a synergy graph, breaking ties by name.
+
+    eigenvector_centrality_numpy starts ARPACK from a random vector, so equally central cards get centralities
+    that differ in the last few bits, in a different order on every call. Rounding them first keeps builds
+    deterministic.
+    """
+    centralities = nx.eigenvector_centrality_numpy(graph)
+    return min(graph.nodes, key=lambda card: (round(centralities[card], 9), card.name))
+
+
+def _communities_build(card_pool_graph, main_colors, splash_colors=[], community_backend=DEFAULT_COMMUNITY_BACKEND):
     """Builds a deck by trying combinations of communities. Ignores all other factors (including color).
 
     Outline of algorithm:
 
-    1). Split the on-color cards into communities using networkx's greedy_modular_communities
+    1). Split the on-color cards into communities (by default using networkx's greedy_modularity_communities)
     2). Find the "best" community to add based on # of edges it would add / # nodes
     3). Add the entire community to the pool
     4). Repeat 2-3 until we have >= the target number of playables
@@ -92,6 +236,7 @@ def _communities_build(card_pool_graph, main_colors, splash_colors=[]):
         card_pool_graph (networkx.Graph): A synergy graph of Cards as the card pool to build from.
         target_playables (int): The number of nonland cards to include in the deck. Utility lands can still be
             included if they are beneficial, but don't count towards this total.
+        community_backend (str): Name of the community detection backend to use, from communities.BACKENDS.
 
     Returns:
         List[Card]: The build for the given pool pool of cards.
@@ -100,13 +245,7 @@ def _communities_build(card_pool_graph, main_colors, splash_colors=[]):
         return list(card_pool_graph.nodes)
 
     current_build = []
-
-    fixers = [c for c in card_pool_graph
-              if _fixer_for_colors(c, list(main_colors) + list(splash_colors)) and
-              # Don't count splashed fixers
-              not _splashed(c, splash_colors)]
-    nonland_fixers = [c for c in fixers if 'land' not in c.types]
-    land_fixers = [c for c in fixers if 'land' in c.types]
+    nonland_fixers, land_fixers = _fixers(card_pool_graph, main_colors, splash_colors)
 
     # Heuristic: start with all nonland fixers in build if there are splash colors. They may get cut later.
     if splash_colors:
@@ -114,43 +253,43 @@ def _communities_build(card_pool_graph, main_colors, splash_colors=[]):
 
     # Add the community with the best ratio of edges added to nodes added. Repeat until we have >=
     # the target number of playables.
-    communities = nx.algorithms.community.greedy_modularity_communities(card_pool_graph)
+    communities = _communities(card_pool_graph, community_backend)
+    scorer = _CommunityScorer(card_pool_graph, current_build)
     while _num_nonlands(current_build) < _NONLANDS_IN_DECK_DEFAULT:
-        current_graph = synergy.create_graph(current_build, remove_isolated=False)
-        communities.sort(key=lambda c: _comm_score(current_graph, c), reverse=True)
-        current_build.extend(communities.pop(0))
+        communities.sort(key=scorer.score, reverse=True)
+        best_community = communities.pop(0)
+        # Communities are sets, so add their cards in graph order rather than set order
+        current_build.extend(c for c in card_pool_graph if c in best_community)
+        scorer.add(best_community)
 
     # Cut least-central cards one by one until we're at the final number of playables
     current_build_graph = synergy.create_graph(current_build, remove_isolated=False, freeze=False)
     while _num_nonlands(current_build_graph.nodes) > _NONLANDS_IN_DECK_DEFAULT:
-        centralities = synergy.sorted_centralities(current_build_graph)
-        least_central_card = centralities[-1][0]
-        current_build_graph.remove_node(least_central_card)
+        current_build_graph.remove_node(_least_central(current_build_graph))
 
     # "Refine" build by trying out leftovers one by one and swapping with worst card if they improve the build
     current_build = list(current_build_graph.nodes)
     leftovers = [c for c in card_pool_graph.nodes if c not in current_build]
-    current_build = _refine_build(current_build, leftovers)
+    swap_engine = _SwapEngine(card_pool_graph, current_build)
+    current_build = _refine_build(swap_engine, leftovers)
     leftovers = [c for c in card_pool_graph.nodes if c not in current_build]
 
     # Replace splashed cards with non-splashed cards if we're over our limit
     if splash_colors:
         nonland_fixers_in_build = [c for c in current_build if c in nonland_fixers]
-        num_fixers = len(nonland_fixers_in_build) + len(land_fixers)
-        max_splash_cards = max(0, num_fixers - 4)
+        max_splash_cards = _max_splash_cards(len(nonland_fixers_in_build) + len(land_fixers))
 
         current_splash_cards = [c for c in current_build if _splashed(c, splash_colors)]
         while len(current_splash_cards) > max_splash_cards:
             nonsplash_leftovers = [c for c in leftovers if not _splashed(c, splash_colors)]
-            card_swap = _find_best_swap(current_build, candidates_to_add=nonsplash_leftovers,
-                                        candidates_to_remove=current_splash_cards)
+            card_swap = swap_engine.best_swap(candidates_to_add=nonsplash_leftovers,
+                                              candidates_to_remove=current_splash_cards)
 
             if not card_swap.card_to_add:
                 raise DeckbuildError('No build found for splashing {} (not enough fixers)'.format(splash_colors))
 
-            current_build.remove(card_swap.card_to_remove)
+            swap_engine.swap(card_swap.card_to_remove, card_swap.card_to_add)
             current_splash_cards.remove(card_swap.card_to_remove)
-            current_build.append(card_swap.card_to_add)
             leftovers.remove(card_swap.card_to_add)
 
     final_build_colors = _colors_from_pool(current_build)
@@ -159,41 +298,274 @@ def _communities_build(card_pool_graph, main_colors, splash_colors=[]):
     return current_build + final_fixer_lands
 
 
-def best_two_color_synergy_build(card_pool, build_fn=_communities_build):
+def local_search_build(card_pool_graph, main_colors, splash_colors=[], time_budget=0.05, max_iterations=None,
+                       community_backend=DEFAULT_COMMUNITY_BACKEND):
+    """Builds a deck with _communities_build, then improves it with a tabu search over 1-for-1 swaps of nonlands
+    until the time budget runs out.
+
+    Each step makes the best swap which isn't tabu, even if it loses edges, so the search can get out of the local
+    optimum where _communities_build's refinement stops. Cards swapped in or out can't be swapped again for the next
+    _TABU_TENURE steps, unless the swap would give the best deck seen so far. The best deck seen is returned, so the
+    result is never worse than _communities_build's.
+
+    Args:
+        card_pool_graph (networkx.Graph): A synergy graph of Cards as the card pool to build from.
+        main_colors (str): The deck's main colors.
+        splash_colors (List[str]): Splash colors. The number of splashed cards is limited by the number of fixers,
+            the same as in _communities_build.
+        time_budget (float): Number of seconds after which to stop searching, including the initial build.
+        max_iterations (int): Optional - maximum number of swaps to make, for reproducible results.
+        community_backend (str): Name of the community detection backend for the initial build.
+
+    Returns:
+        List[Card]: The best build found for the given pool of cards.
+    """
+    deadline = time.monotonic() + time_budget
+    initial_build = _communities_build(card_pool_graph, main_colors, splash_colors, community_backend)
+
+    build = list(dict.fromkeys(initial_build))
+    leftovers = [c for c in card_pool_graph if c not in build and 'land' not in c.types]
+    if _num_nonlands(build) < _NONLANDS_IN_DECK_DEFAULT or not leftovers:
+        return build
+
+    nonland_fixers, land_fixers = _fixers(card_pool_graph, main_colors, splash_colors)
+    nonland_fixers = set(nonland_fixers)
+    num_splashed = len([c for c in build if _splashed(c, splash_colors)])
+    num_fixers = len([c for c in build if c in nonland_fixers]) + len(land_fixers)
+
+    swap_engine = _SwapEngine(card_pool_graph, build)
+    num_edges = len(card_pool_graph.subgraph(build).edges)
+    best_num_edges, best_build = num_edges, list(build)
+    tabu_until = {}
+
+    iteration = 0
+    while time.monotonic() < deadline and (max_iterations is None or iteration < max_iterations):
+        best_move = None
+        for card_to_remove in [c for c in build if 'land' not in c.types]:
+            for card_to_add in leftovers:
+                improvement = swap_engine.improvement(card_to_remove, card_to_add)
+                if best_move and improvement <= best_move[0]:
+                    continue
+
+                tabu = tabu_until.get(card_to_remove, 0) > iteration or tabu_until.get(card_to_add, 0) > iteration
+                if tabu and num_edges + improvement <= best_num_edges:
+                    continue
+
+                splashed_after = num_splashed - _splashed(card_to_remove, splash_colors) + \
+                    _splashed(card_to_add, splash_colors)
+                fixers_after = num_fixers - (card_to_remove in nonland_fixers) + (card_to_add in nonland_fixers)
+                if splashed_after > _max_splash_cards(fixers_after):
+                    continue
+
+                best_move = (improvement, card_to_remove, card_to_add)
+
+        if not best_move:
+            break
+
+        improvement, card_to_remove, card_to_add = best_move
+        swap_engine.swap(card_to_remove, card_to_add)
+        leftovers.remove(card_to_add)
+        leftovers.append(card_to_remove)
+        tabu_until[card_to_remove] = tabu_until[card_to_add] = iteration + _TABU_TENURE
+
+        num_edges += improvement
+        num_splashed += _splashed(card_to_add, splash_colors) - _splashed(card_to_remove, splash_colors)
+        num_fixers += (card_to_add in nonland_fixers) - (card_to_remove in nonland_fixers)
+        if num_edges > best_num_edges:
+            best_num_edges, best_build = num_edges, list(build)
+
+        iteration += 1
+
+    return best_build
+
+
+BuildResult = namedtuple('BuildResult', ['main_colors', 'splash_colors', 'deck', 'num_edges', 'error', 'skipped'])
+
+
+def best_two_color_synergy_build(card_pool, build_fn=_communities_build, executor=None, prune=False,
+                                 community_backend=None, on_results=None, batch_size=None):
     """Attempts to find the 2-color build of the given pool with the most synergy edges.
 
     Args:
         card_pool (List[Card]): The card pool to build.
         build_fn (function): A function which builds a deck, given a synergy graph for a 2-color subset
             of the total card pool.
+        executor (concurrent.futures.Executor): Optional - executor to build color combinations concurrently with.
+            See color_combination_builds.
+        prune (bool): Whether to skip color combinations which can't beat the best build found so far.
+            See color_combination_builds.
+        community_backend (str): Optional - name of the community detection backend for build_fn to use, from
+            communities.BACKENDS. Only supported by build functions with a community_backend argument.
+        on_results (function): Optional - called with the BuildResult of every color combination, e.g. to report
+            combinations which failed or were skipped with format_build_results.
+        batch_size (int): Optional - number of combinations to build at once when pruning.
+            See color_combination_builds.
 
     Returns:
         List[Card]: The best build found among all 2-color combinations for this pool.
     """
+    if community_backend:
+        build_fn = functools.partial(build_fn, community_backend=community_backend)
+
+    results = color_combination_builds(card_pool, build_fn=build_fn, executor=executor, prune=prune,
+                                       batch_size=batch_size)
+    if on_results:
+        on_results(results)
+    candidates = [r for r in results if r.error is None and not r.skipped]
 
-    candidates = []
+    if not candidates:
+        raise DeckbuildError('No build found')
+
+    candidates.sort(key=lambda r: r.num_edges, reverse=True)
+    return candidates[0].deck
+
+
+def color_combination_builds(card_pool, build_fn=_communities_build, executor=None, prune=False, batch_size=None):
+    """Builds the given pool for each combination of 2 main colors and 0 or 1 splash colors.
+
+    Args:
+        card_pool (List[Card]): The card pool to build.
+        build_fn (function): A function which builds a deck, given a synergy graph for a 2-color subset
+            of the total card pool.
+        executor (concurrent.futures.Executor): Optional - executor to build color combinations concurrently with.
+            For a process pool, build_fn must be picklable (i.e. defined at module level). Builds are run in the
+            current thread if not provided.
+        prune (bool): If True, combinations are built in order of an upper bound on the number of edges their
+            deck could have, and combinations whose bound can't beat the best build found so far are skipped.
+            The best build is the same as without pruning, as long as build_fn only returns cards from the graph
+            it's given, with at most 23 nonlands.
+        batch_size (int): Optional - number of combinations to build at once when pruning, e.g. the executor's
+            number of workers. Combinations are only pruned between batches, so larger batches build more
+            combinations but keep more workers busy. Defaults to 1 without an executor, and the number of CPUs with
+            one.
+
+    Returns:
+        List[BuildResult]: One result per color combination, in the order they're listed in _COLOR_COMBOS. Results
+            for combinations which couldn't be built have error set to the reason, and results for skipped
+            combinations have skipped set to True. Both have deck and num_edges set to None.
+    """
     graph = synergy.create_graph(card_pool, remove_isolated=False)
+    color_configs = [(main_colors, [c for c in colors if c not in main_colors])
+                     for colors in _COLOR_COMBOS
+                     for main_colors in itertools.combinations(colors, 2)]
+
+    args = [(graph, card_pool, main_colors, splash_colors, build_fn) for main_colors, splash_colors in color_configs]
+    if not prune:
+        return _map_builds(args, executor)
+
+    bounds = [_edges_upper_bound(graph.subgraph(_relevant_cards(card_pool, main_colors, splash_colors)))
+              for main_colors, splash_colors in color_configs]
+    # Stable sort, so combinations with equal bounds keep their original order
+    order = sorted(range(len(args)), key=lambda i: bounds[i], reverse=True)
+
+    # Build a batch at a time, so an executor can run builds concurrently while still pruning between batches
+    if batch_size is None:
+        batch_size = (os.cpu_count() or 1) if executor else 1
+    results = [None] * len(args)
+    best = None
+    for batch_start in range(0, len(order), batch_size):
+        batch = []
+        for i in order[batch_start:batch_start + batch_size]:
+            # Ties go to the combination listed first, same as an exhaustive search
+            if best and (bounds[i] < best[0] or bounds[i] == best[0] and i > best[1]):
+                main_colors, splash_colors = color_configs[i]
+                results[i] = BuildResult(main_colors=main_colors, splash_colors=splash_colors, deck=None,
+                                         num_edges=None, error=None, skipped=True)
+            else:
+                batch.append(i)
+
+        for i, result in zip(batch, _map_builds([args[i] for i in batch], executor)):
+            results[i] = result
+            if result.error is None and (not best or (result.num_edges, -i) > (best[0], -best[1])):
+                best = (result.num_edges, i)
+
+    return results
+
+
+def format_build_results(results):
+    """Describes every color combination which failed to build or was skipped, and how many of each there were.
 
-    for colors in _COLOR_COMBOS:
-        for main_colors in itertools.combinations(colors, 2):
-            splash_colors = [c for c in colors if c not in main_colors]
+    Args:
+        results (List[BuildResult]): Results from color_combination_builds.
 
-            on_color_subgraph = graph.subgraph(_relevant_cards(card_pool, main_colors, splash_colors))
+    Returns:
+        str: One line per failed or skipped combination, then a summary line.
+    """
+    lines = []
+    for r in results:
+        if r.error is not None:
+            lines.append('Failed to build color combo {} splash {}. Reason: {}'.format(
+                r.main_colors, r.splash_colors, r.error))
+        elif r.skipped:
+            lines.append('Skipped color combo {} splash {}, it can\'t beat the best build'.format(
+                r.main_colors, r.splash_colors))
+    num_failed = len([r for r in results if r.error is not None])
+    num_skipped = len([r for r in results if r.skipped])
+    lines.append('Built {} of {} color combos, {} failed, {} skipped'.format(
+        len(results) - num_failed - num_skipped, len(results), num_failed, num_skipped))
+    return '\n'.join(lines)
+
+
+def _map_builds(args, executor):
+    if not args:
+        return []
+    if executor:
+        return list(executor.map(_build_for_colors, *zip(*args)))
+    return [_build_for_colors(*a) for a in args]
+
+
+def _build_for_colors(graph, card_pool, main_colors, splash_colors, build_fn):
+    on_color_subgraph = _ordered_subgraph(graph, _relevant_cards(card_pool, main_colors, splash_colors))
+
+    try:
+        deck_for_colors = build_fn(on_color_subgraph, main_colors, splash_colors)
+        return BuildResult(main_colors=main_colors, splash_colors=splash_colors, deck=deck_for_colors,
+                           num_edges=len(graph.subgraph(deck_for_colors).edges), error=None, skipped=False)
+    except DeckbuildError as e:
+        return BuildResult(main_colors=main_colors, splash_colors=splash_colors, deck=None, num_edges=None,
+                           error=str(e), skipped=False)
+
+
+def _ordered_subgraph(graph, cards):
+    """Returns the frozen subgraph of graph made of the given cards, with nodes in the order they're given.
+
+    networkx's subgraph views list the nodes of small subgraphs in set order, which changes with PYTHONHASHSEED.
+    Builds break ties by graph order, so they'd differ between processes.
+    """
+    subgraph = nx.Graph()
+    subgraph.add_nodes_from(cards)
+    subgraph.add_edges_from((card, neighbor) for card in cards for neighbor in graph[card] if neighbor in subgraph)
+    return nx.freeze(subgraph)
 
-            try:
-                deck_for_colors = build_fn(on_color_subgraph, main_colors, splash_colors)
 
-                candidates.append((deck_for_colors, len(graph.subgraph(deck_for_colors).edges)))
-            except DeckbuildError as e:
-                print('Failed to build color combo {} splash {}, continuing. Reason: {}'
-                      .format(main_colors, splash_colors, e))
-                pass
+def _edges_upper_bound(on_color_subgraph):
+    """Returns an upper bound on the number of edges in any deck made of cards from the subgraph, with at most
+    _NONLANDS_IN_DECK_DEFAULT nonlands.
+
+    Every edge in a deck is counted twice in the sum of its cards' degrees, and no card in the deck can have a higher
+    degree than it has in the subgraph, or than the number of other cards in the deck.
+    """
+    nonland_degrees = sorted((d for c, d in on_color_subgraph.degree if 'land' not in c.types), reverse=True)
+    land_degrees = [d for c, d in on_color_subgraph.degree if 'land' in c.types]
+
+    degrees = nonland_degrees[:_NONLANDS_IN_DECK_DEFAULT] + land_degrees
+    max_degree = len(degrees) - 1
+    return min(len(on_color_subgraph.edges), sum(min(d, max_degree) for d in degrees) // 2)
+
+
+def _fixers(card_pool_graph, main_colors, splash_colors):
+    """Returns the nonland and land fixers for the given colors in the graph, not counting splashed fixers."""
+    fixers = [c for c in card_pool_graph
+              if _fixer_for_colors(c, list(main_colors) + list(splash_colors)) and
+              # Don't count splashed fixers
+              not _splashed(c, splash_colors)]
+    nonland_fixers = [c for c in fixers if 'land' not in c.types]
+    land_fixers = [c for c in fixers if 'land' in c.types]
+    return nonland_fixers, land_fixers
 
-    if not candidates:
-        raise DeckbuildError('No build found')
 
-    candidates.sort(key=lambda tup: tup[1:], reverse=True)
-    return candidates[0][0]
+def _max_splash_cards(num_fixers):
+    return max(0, num_fixers - 4)
 
 
 def _splashed(card, splash_colors):
@@ -0,0 +1,159 @@
+"""Content-addressed cache of deckbuild results, so identical pools are only built once."""
+
+from collections import OrderedDict
+import functools
+import hashlib
+import json
+import sqlite3
+import threading
+
+from mtg_draft_ai import deckbuild
+
+
+# Arguments of deckbuild functions which change how a deck is built, but not which deck is built
+_EXECUTION_ARGUMENTS = ['on_results', 'executor', 'batch_size']
+
+
+def cube_version(card_list):
+    """Returns a hex digest of every card's deckbuilding-relevant data, which changes whenever the cube does.
+
+    Args:
+        card_list (List[Card]): Every card in the cube.
+    """
+    card_data = sorted((c.name, c.color_id, c.types, c.mana_cost, sorted(c.tags), c.power_tier, c.fixer_color_id)
+                       for c in card_list)
+    return hashlib.sha256(repr(card_data).encode('utf-8')).hexdigest()
+
+
+def deckbuild_options(deckbuild_fn):
+    """Describes a deckbuild function and the arguments it's given, e.g. as the options of pool_fingerprint.
+
+    Functions are described by name, and functools.partial objects by their function and arguments. Arguments which
+    don't change the deck that's built, e.g. executors and callbacks reporting on builds, are left out.
+
+    Args:
+        deckbuild_fn (function): Function which builds a deck from a pool, e.g. a partial of
+            best_two_color_synergy_build.
+
+    Returns:
+        str: JSON description of the function.
+    """
+    return json.dumps(_describe(deckbuild_fn), sort_keys=True)
+
+
+def pool_fingerprint(card_pool, version, options=''):
+    """Returns a hex digest identifying a pool, which doesn't depend on the order of the cards.
+
+    The deckbuilding algorithm's version is part of the fingerprint, so decks built by earlier versions aren't reused.
+
+    Args:
+        card_pool (List[Card]): The card pool.
+        version (str): Version of the cube the pool is from, e.g. from cube_version.
+        options (str): Optional - anything else the build depends on, e.g. from deckbuild_options.
+    """
+    key = json.dumps([version, deckbuild.BUILD_VERSION, options, sorted(c.name for c in card_pool)])
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+
+class DeckbuildCache:
+    """Deckbuild results keyed by pool fingerprint, in a bounded in-memory LRU cache backed by an optional sqlite
+    database on disk.
+
+    Builds which raise an error aren't cached. Safe to share between threads.
+    """
+
+    def __init__(self, path=None, max_entries=1000):
+        """
+        Args:
+            path (str): Optional - path of the sqlite database to persist decks in. Created if it doesn't exist.
+                Only the in-memory cache is used if not provided.
+            max_entries (int): Maximum number of decks to keep in memory.
+        """
+        self.max_entries = max_entries
+
+        self._decks = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            with self._db:
+                self._db.execute('CREATE TABLE IF NOT EXISTS decks (fingerprint TEXT PRIMARY KEY, deck TEXT)')
+
+    def build(self, card_pool, version, deckbuild_fn, options=''):
+        """Returns the deck for the pool from the cache, or builds it and adds it to the cache.
+
+        Args:
+            card_pool (List[Card]): The card pool to build.
+            version (str): Version of the cube the pool is from, e.g. from cube_version.
+            deckbuild_fn (function): Function which builds a deck from a pool, e.g. best_two_color_synergy_build.
+            options (str): Optional - anything else the build depends on, e.g. deckbuild_options(deckbuild_fn).
+
+        Returns:
+            List[Card]: The built deck, as cards from the pool.
+        """
+        deck = self.lookup(card_pool, version, options)
+        if deck is not None:
+            return deck
+
+        deck = deckbuild_fn(card_pool)
+        self.put(pool_fingerprint(card_pool, version, options), [c.name for c in deck])
+        return deck
+
+    def lookup(self, card_pool, version, options=''):
+        """Returns the deck cached for the pool, as cards from the pool, or None if it isn't cached.
+
+        Args:
+            card_pool (List[Card]): The card pool.
+            version (str): Version of the cube the pool is from, e.g. from cube_version.
+            options (str): Optional - anything else the build depends on, e.g. deckbuild_options(deckbuild_fn).
+        """
+        deck_names = self.get(pool_fingerprint(card_pool, version, options))
+        if deck_names is None:
+            return None
+        cards_by_name = {c.name: c for c in card_pool}
+        return [cards_by_name[name] for name in deck_names]
+
+    def get(self, fingerprint):
+        """Returns the card names in the deck cached for the fingerprint, or None if it isn't cached."""
+        with self._lock:
+            if fingerprint in self._decks:
+                self._decks.move_to_end(fingerprint)
+                return self._decks[fingerprint]
+
+            if self._db is None:
+                return None
+            row = self._db.execute('SELECT deck FROM decks WHERE fingerprint = ?', (fingerprint,)).fetchone()
+            if row is None:
+                return None
+
+            deck_names = json.loads(row[0])
+            self._remember(fingerprint, deck_names)
+            return deck_names
+
+    def put(self, fingerprint, deck_names):
+        """Caches the card names in a deck for the fingerprint."""
+        with self._lock:
+            self._remember(fingerprint, deck_names)
+            if self._db is not None:
+                with self._db:
+                    self._db.execute('INSERT OR REPLACE INTO decks (fingerprint, deck) VALUES (?, ?)',
+                                     (fingerprint, json.dumps(deck_names)))
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def _remember(self, fingerprint, deck_names):
+        self._decks[fingerprint] = deck_names
+        self._decks.move_to_end(fingerprint)
+        if len(self._decks) > self.max_entries:
+            self._decks.popitem(last=False)
+
+
+def _describe(value):
+    if isinstance(value, functools.partial):
+        return {'function': _describe(value.func), 'args': [_describe(a) for a in value.args],
+                'keywords': {name: _describe(v) for name, v in value.keywords.items()
+                             if name not in _EXECUTION_ARGUMENTS}}
+    return getattr(value, '__name__', value)
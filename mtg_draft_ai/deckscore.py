@@ -0,0 +1,85 @@
+"""Batched deck quality metrics, computed for many decks at once from a cube-wide synergy adjacency matrix."""
+
+from collections import namedtuple
+
+import networkx as nx
+import numpy as np
+
+from mtg_draft_ai import synergy
+from mtg_draft_ai.brains import power_rating
+
+
+DeckScores = namedtuple('DeckScores', ['num_edges', 'avg_power', 'centrality_orders'])
+
+
+class DeckScorer:
+    """Scores decks given as arrays of card ids, where a card's id is its index in the cube list.
+
+    Builds the synergy graph of the whole cube once. Scoring a batch of decks is then a few array operations on a stack
+    of the decks' adjacency matrices, sliced out of the cube's, instead of a new synergy graph per deck.
+    """
+
+    def __init__(self, card_list):
+        """
+        Args:
+            card_list (List[Card]): Every card in the cube.
+        """
+        self.cards = list(dict.fromkeys(card_list))
+
+        self._ids = {card: i for i, card in enumerate(self.cards)}
+        graph = synergy.create_graph(self.cards, remove_isolated=False)
+        self._adjacency = nx.to_numpy_array(graph, nodelist=self.cards)
+        self._power = np.array([power_rating(c) for c in self.cards])
+        self._nonland = np.array(['land' not in c.types for c in self.cards], dtype=float)
+
+    def card_ids(self, deck):
+        """Returns the ids of the cards in a deck, in deck order and without duplicates."""
+        return np.array(list(dict.fromkeys(self._ids[c] for c in deck)), dtype=np.int64)
+
+    def cards_for(self, card_ids):
+        return [self.cards[i] for i in card_ids]
+
+    def score(self, decks):
+        """Computes the number of synergy edges, mean nonland power rating and cards ordered by eigenvector centrality
+        for each deck.
+
+        Args:
+            decks (List[numpy.ndarray]): Card ids in each deck, e.g. from card_ids.
+
+        Returns:
+            DeckScores: Arrays of edge counts and mean powers, and a list of card id arrays sorted from most to least
+                central, in the same order as decks. Cards with equal centrality keep their order in the deck.
+        """
+        if not decks:
+            return DeckScores(num_edges=np.zeros(0, dtype=np.int64), avg_power=np.zeros(0), centrality_orders=[])
+
+        # Decks are padded to the same size, with a mask marking the real cards
+        max_size = max(len(deck) for deck in decks)
+        padded = np.zeros((len(decks), max_size), dtype=np.int64)
+        mask = np.zeros((len(decks), max_size))
+        for i, deck in enumerate(decks):
+            padded[i, :len(deck)] = deck
+            mask[i, :len(deck)] = 1.0
+
+        # Stack of each deck's adjacency matrix, with padding rows and columns zeroed out
+        adjacency = self._adjacency[padded[:, :, None], padded[:, None, :]] * mask[:, :, None] * mask[:, None, :]
+
+        # Each edge is counted twice in a symmetric adjacency matrix
+        num_edges = np.rint(adjacency.sum(axis=(1, 2)) / 2).astype(np.int64)
+
+        nonlands = self._nonland[padded] * mask
+        avg_power = (self._power[padded] * nonlands).sum(axis=1) / np.maximum(nonlands.sum(axis=1), 1)
+
+        centralities = _eigenvector_centralities(adjacency)
+        centrality_orders = [deck[np.argsort(-c[:len(deck)], kind='stable')] for deck, c in zip(decks, centralities)]
+
+        return DeckScores(num_edges=num_edges, avg_power=avg_power, centrality_orders=centrality_orders)
+
+
+def _eigenvector_centralities(adjacency):
+    """Computes the leading eigenvector of each adjacency matrix in a stack with a single batched eigendecomposition,
+    the same measure as networkx's eigenvector_centrality_numpy."""
+    _, eigenvectors = np.linalg.eigh(adjacency)
+    leading = eigenvectors[:, :, -1]
+    # Eigenvectors are only defined up to sign
+    return leading * np.where(leading.sum(axis=1, keepdims=True) < 0, -1.0, 1.0)
@@ -1,8 +1,11 @@
 """Functions for generating visual displays of cards."""
 
+import functools
 import urllib
 
 
+# Reports show the same cards many times over (e.g. every pick of a draft), so cache the rendered tags.
+@functools.lru_cache(maxsize=4096)
 def image_html(card_name, width=146, height=204, highlighted=False):
     """Formats an img tag for the scryfall card image.
 
@@ -1,8 +1,31 @@
+from collections import namedtuple
+import contextlib
+import fnmatch
+import io
+import multiprocessing
+import os
+import struct
+
 import toml
 from mtg_draft_ai.display import card_names_to_html, default_style
 from mtg_draft_ai.api import DraftInfo, Drafter
 
 
+# Binary log layout (all integers little-endian):
+#   magic (5 bytes) | version (uint8)
+#   num_drafters, num_phases, cards_per_pack (uint16 each)
+#   num_card_names (uint32), then for each name: byte length (uint16) + UTF-8 bytes. A card's id is its index here.
+#   num_drafters_logged (uint16), then for each drafter:
+#       num_picks (uint16), then for each pick: pack size (uint16), pack card ids (uint16 each), picked card id (uint16)
+BINARY_LOG_MAGIC = b'MTGDL'
+BINARY_LOG_VERSION = 1
+
+# Matches the log file names written by trials.py
+LOG_FILE_PATTERN = 'draft-log_*'
+
+LoggedPick = namedtuple('LoggedPick', ['log', 'drafter', 'phase', 'pick', 'pack', 'picked'])
+
+
 def dumps_log(drafters, draft_info):
     """Writes pick history of drafters into a toml log file.
 
@@ -26,33 +49,257 @@ def dumps_log(drafters, draft_info):
     return toml.dumps({'draft_info': draft_info_dict, 'full_draft': full_draft})
 
 
+def dumps_binary_log(drafters, draft_info):
+    """Writes pick history of drafters into the compact binary log format.
+
+    Card names are only stored once, in a dictionary at the start of the log; every pack and pick refers to cards
+    by their index in that dictionary.
+
+    Args:
+        drafters (List[Drafter]): Drafters to create log for.
+        draft_info (DraftInfo): Draft config to record.
+
+    Returns:
+        bytes: Binary log containing every pick for every drafter, as well as the draft info.
+    """
+    card_ids = {}
+    for d in drafters:
+        for pack in d.pack_history:
+            for card in pack:
+                card_ids.setdefault(card.name, len(card_ids))
+
+    if len(card_ids) > 0xFFFF:
+        raise ValueError('Too many distinct cards for binary log: {}'.format(len(card_ids)))
+
+    chunks = [BINARY_LOG_MAGIC,
+              struct.pack('<BHHHI', BINARY_LOG_VERSION, draft_info.num_drafters, draft_info.num_phases,
+                          draft_info.cards_per_pack, len(card_ids))]
+    for name in card_ids:
+        encoded = name.encode('utf-8')
+        chunks.append(struct.pack('<H', len(encoded)))
+        chunks.append(encoded)
+
+    chunks.append(struct.pack('<H', len(drafters)))
+    for d in drafters:
+        chunks.append(struct.pack('<H', len(d.cards_owned)))
+        for pack, pick in zip(d.pack_history, d.cards_owned):
+            ids = [card_ids[c.name] for c in pack] + [card_ids[pick.name]]
+            chunks.append(struct.pack('<H{}H'.format(len(ids)), len(pack), *ids))
+
+    return b''.join(chunks)
+
+
 def load_drafters_from_log(log_file, card_list=None):
     """Returns a list of drafters, with pick history, reconstructed from log file.
 
     Args:
-        log_file: File-like object to load the log from.
+        log_file: File-like object or path to load the log from. Logs in the binary format written by
+            dumps_binary_log are detected automatically when given a path or a file opened in binary mode.
         card_list (List[Card]): Optional - specify in order to return full Card objects instead of just names.
 
     Returns:
         By default, returned pick history contains card names only. If card_list is provided,
         contains full card objects instead.
     """
+    if is_binary_log(log_file):
+        return load_drafters_from_binary_log(log_file, card_list=card_list)
+
     log_obj = toml.load(log_file)
+    picks_by_drafter = [[(pick['pack'], pick['pick']) for pick in drafter_picks['picks']]
+                        for drafter_picks in log_obj['full_draft']]
 
-    draft_info = DraftInfo(card_list=card_list, **log_obj['draft_info'])
+    return _drafters_from_picks(log_obj['draft_info'], picks_by_drafter, card_list)
+
+
+def load_drafters_from_binary_log(log_file, card_list=None):
+    """Same as load_drafters_from_log, for logs written by dumps_binary_log.
+
+    Args:
+        log_file: Path or binary file-like object to load the log from.
+        card_list (List[Card]): Optional - specify in order to return full Card objects instead of just names.
+    """
+    with _open_binary(log_file) as f:
+        draft_info_dict, card_names = _read_binary_header(f)
+
+        picks_by_drafter = []
+        for drafter, pack, picked in _iter_binary_picks(f, card_names):
+            if drafter == len(picks_by_drafter):
+                picks_by_drafter.append([])
+            picks_by_drafter[drafter].append((pack, picked))
+
+    return _drafters_from_picks(draft_info_dict, picks_by_drafter, card_list)
+
+
+def iter_picks(log_file):
+    """Streams every pick from a single log, in either the TOML or binary format.
+
+    Unlike load_drafters_from_log, this doesn't build Drafters, and binary logs are read incrementally.
+
+    Args:
+        log_file: Path or file-like object to load the log from.
+
+    Yields:
+        LoggedPick: Each pick in the log, ordered by drafter, then by phase and pick.
+    """
+    log_name = log_file if isinstance(log_file, str) else None
+
+    if is_binary_log(log_file):
+        with _open_binary(log_file) as f:
+            draft_info_dict, card_names = _read_binary_header(f)
+            picks = _iter_binary_picks(f, card_names)
+            yield from _logged_picks(log_name, draft_info_dict, picks)
+    else:
+        log_obj = toml.load(log_file)
+        picks = ((drafter, pick['pack'], pick['pick'])
+                 for drafter, drafter_picks in enumerate(log_obj['full_draft'])
+                 for pick in drafter_picks['picks'])
+        yield from _logged_picks(log_name, log_obj['draft_info'], picks)
+
+
+def iter_corpus_picks(path, pattern=LOG_FILE_PATTERN):
+    """Streams every pick from a log file, or from every log in a directory, holding one log in memory at a time.
+
+    Args:
+        path (str): Path to a log file or a directory of log files.
+        pattern (str): Glob pattern that log file names in a directory must match.
+
+    Yields:
+        LoggedPick: Each pick in each log, with LoggedPick.log set to the log's path.
+    """
+    for log_path in corpus_log_files(path, pattern):
+        yield from iter_picks(log_path)
+
+
+def map_logs(fn, path, pattern=LOG_FILE_PATTERN, processes=None):
+    """Applies fn to each log in a corpus, optionally fanning out to a pool of worker processes.
+
+    Intended for aggregate analyses: fn should reduce a single log (e.g. with iter_picks) to a small result,
+    which the caller then combines.
+
+    Args:
+        fn (function): Function taking a log file path. Must be picklable (i.e. defined at module level)
+            if processes is set.
+        path (str): Path to a log file or a directory of log files.
+        pattern (str): Glob pattern that log file names in a directory must match.
+        processes (int): Number of worker processes. If None, logs are processed in the current process.
+
+    Yields:
+        The result of fn for each log, in the same order as corpus_log_files.
+    """
+    log_paths = corpus_log_files(path, pattern)
+    if processes is None:
+        yield from map(fn, log_paths)
+        return
+
+    with multiprocessing.Pool(processes) as pool:
+        yield from pool.imap(fn, log_paths)
+
+
+def corpus_log_files(path, pattern=LOG_FILE_PATTERN):
+    """Returns the sorted paths of all logs in a directory, or [path] if path is a single file."""
+    if not os.path.isdir(path):
+        return [path]
+    return sorted(os.path.join(path, name) for name in os.listdir(path) if fnmatch.fnmatch(name, pattern))
+
+
+def log_source_key(log_path):
+    """Returns a key identifying a log file's current version, for indexes which skip logs they've already read.
+
+    The key is the log's path, size and modification time, so it's computed without reading the log. A log which
+    is overwritten (e.g. by another run of trials.py with the same output directory) gets a new key and is read again
+    as a new source.
+    """
+    stat = os.stat(log_path)
+    return 'log:{}:{}:{}'.format(os.path.abspath(log_path), stat.st_size, stat.st_mtime_ns)
+
+
+def is_binary_log(log_file):
+    """Returns whether log_file (a path or file-like object) contains a log in the binary format."""
+    if isinstance(log_file, str):
+        with open(log_file, 'rb') as f:
+            return f.read(len(BINARY_LOG_MAGIC)) == BINARY_LOG_MAGIC
+
+    if not isinstance(log_file.read(0), bytes):
+        return False
+    position = log_file.tell()
+    magic = log_file.read(len(BINARY_LOG_MAGIC))
+    log_file.seek(position)
+    return magic == BINARY_LOG_MAGIC
+
+
+def _logged_picks(log_name, draft_info_dict, picks):
+    cards_per_pack = draft_info_dict['cards_per_pack']
+    pick_index = 0
+    last_drafter = None
+
+    for drafter, pack, picked in picks:
+        if drafter != last_drafter:
+            pick_index = 0
+            last_drafter = drafter
+        yield LoggedPick(log=log_name, drafter=drafter, phase=pick_index // cards_per_pack,
+                         pick=pick_index % cards_per_pack, pack=pack, picked=picked)
+        pick_index += 1
+
+
+@contextlib.contextmanager
+def _open_binary(log_file):
+    if isinstance(log_file, str):
+        with open(log_file, 'rb') as f:
+            yield f
+    else:
+        yield log_file
+
+
+def _read_struct(f, fmt):
+    size = struct.calcsize(fmt)
+    data = f.read(size)
+    if len(data) != size:
+        raise ValueError('Truncated binary draft log')
+    return struct.unpack(fmt, data)
+
+
+def _read_binary_header(f):
+    if f.read(len(BINARY_LOG_MAGIC)) != BINARY_LOG_MAGIC:
+        raise ValueError('Not a binary draft log')
+
+    version, num_drafters, num_phases, cards_per_pack, num_names = _read_struct(f, '<BHHHI')
+    if version != BINARY_LOG_VERSION:
+        raise ValueError('Unsupported binary draft log version: {}'.format(version))
+
+    card_names = []
+    for _ in range(0, num_names):
+        length, = _read_struct(f, '<H')
+        card_names.append(f.read(length).decode('utf-8'))
+
+    draft_info_dict = {'num_drafters': num_drafters, 'num_phases': num_phases, 'cards_per_pack': cards_per_pack}
+    return draft_info_dict, card_names
+
+
+def _iter_binary_picks(f, card_names):
+    num_drafters, = _read_struct(f, '<H')
+    for drafter in range(0, num_drafters):
+        num_picks, = _read_struct(f, '<H')
+        for _ in range(0, num_picks):
+            pack_size, = _read_struct(f, '<H')
+            ids = _read_struct(f, '<{}H'.format(pack_size + 1))
+            yield drafter, [card_names[i] for i in ids[:-1]], card_names[ids[-1]]
+
+
+def _drafters_from_picks(draft_info_dict, picks_by_drafter, card_list):
+    draft_info = DraftInfo(card_list=card_list, **draft_info_dict)
 
     if card_list:
         cards_by_name = {c.name: c for c in card_list}
 
     drafters = []
 
-    for drafter_picks in log_obj['full_draft']:
+    for picks in picks_by_drafter:
         drafter = Drafter(picker=None, draft_info=draft_info)
         drafters.append(drafter)
 
-        for pick in drafter_picks['picks']:
-            drafter.cards_owned.append(pick['pick'])
-            drafter.pack_history.append(pick['pack'])
+        for pack, pick in picks:
+            drafter.cards_owned.append(pick)
+            drafter.pack_history.append(pack)
 
         if card_list:
             drafter.cards_owned = [cards_by_name[n] for n in drafter.cards_owned]
@@ -69,17 +316,32 @@ def log_to_html(log_file):
 
 
 def drafters_to_html(drafters, headers=True):
-    html = default_style()
+    html = io.StringIO()
+    write_drafters_html(drafters, html, headers=headers)
+    return html.getvalue()
 
-    i = 0
-    for drafter in drafters:
+
+def write_drafters_html(drafters, f, headers=True):
+    """Writes an HTML visualization of every drafter's picks to a file, one pack at a time.
+
+    Args:
+        drafters (List[Drafter]): Drafters whose pack history and picks to display. Pack history and picks can
+            contain either Cards (e.g. straight from a draft) or card names (e.g. loaded from a log).
+        f: Text file-like object to write to.
+        headers (bool): Whether to write a header before each drafter's picks.
+    """
+    f.write(default_style())
+
+    for i, drafter in enumerate(drafters):
         if headers:
-            html += 'Drafter {}\n'.format(i)
+            f.write('Drafter {}\n'.format(i))
         for pack, pick in zip(drafter.pack_history, drafter.cards_owned):
-            html += '<div class="pack">\n{}</div>\n'.format(card_names_to_html(pack, highlighted=pick))
+            f.write('<div class="pack">\n{}</div>\n'.format(
+                card_names_to_html([_card_name(c) for c in pack], highlighted=_card_name(pick))))
+
+        f.write('Drafter {} final pool\n'.format(i))
+        f.write('<div class>\n{}</div>\n'.format(card_names_to_html([_card_name(c) for c in drafter.cards_owned])))
 
-        html += 'Drafter {} final pool\n'.format(i)
-        html += '<div class>\n{}</div>\n'.format(card_names_to_html(drafter.cards_owned))
-        i += 1
 
-    return html
+def _card_name(card):
+    return card if isinstance(card, str) else card.name
@@ -0,0 +1,91 @@
+"""Latency and memory benchmarks for pickers, replaying the pick states of recorded drafts."""
+
+from collections import namedtuple
+import random
+import time
+import tracemalloc
+
+import numpy as np
+
+from mtg_draft_ai import draftlog, replay
+
+
+PickBenchmark = namedtuple('PickBenchmark', ['num_picks', 'total_seconds', 'picks_per_second', 'mean_ms', 'p50_ms',
+                                             'p95_ms', 'p99_ms', 'max_ms', 'peak_memory_bytes'])
+
+
+def load_corpus(path, card_list, pattern=draftlog.LOG_FILE_PATTERN):
+    """Loads every pick state from a draft log, or from every log in a directory.
+
+    Args:
+        path (str): Path to a log file or a directory of log files, e.g. exported by the website's
+            export_replay_corpus command.
+        card_list (List[Card]): Every card in the cube.
+        pattern (str): Glob pattern that log file names in a directory must match.
+
+    Returns:
+        List[replay.ReplayPick]: Every pick in the corpus, in a fixed order.
+    """
+    return [pick for log_path in draftlog.corpus_log_files(path, pattern)
+            for pick in replay.log_replay_picks(log_path, card_list)]
+
+
+def benchmark_picker(picker, picks, repeat=1, measure_memory=True, seed=0):
+    """Times every pick a picker makes from the recorded pick states.
+
+    Args:
+        picker (Picker): The picker to benchmark.
+        picks (List[replay.ReplayPick]): Pick states to replay. Only the pack, cards owned and draft info are used.
+        repeat (int): Number of times to replay every pick. Latencies are over every repetition.
+        measure_memory (bool): Whether to replay the picks once more with tracemalloc to measure peak memory. This
+            is a separate pass, since tracing allocations slows picks down.
+        seed (int): Random seed, for pickers which break ties randomly.
+
+    Returns:
+        PickBenchmark: Throughput, latency percentiles in milliseconds and peak traced memory in bytes (None if not
+            measured).
+    """
+    random.seed(seed)
+    latencies = []
+    for _ in range(0, repeat):
+        for pick in picks:
+            # Pickers may modify their arguments, so they get copies, which aren't timed
+            pack, cards_owned = list(pick.pack), list(pick.cards_owned)
+            start = time.perf_counter()
+            picker.pick(pack, cards_owned, pick.draft_info)
+            latencies.append(time.perf_counter() - start)
+
+    peak_memory = None
+    if measure_memory:
+        tracemalloc.start()
+        try:
+            for pick in picks:
+                picker.pick(list(pick.pack), list(pick.cards_owned), pick.draft_info)
+            _, peak_memory = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    latencies_ms = np.array(latencies) * 1000
+    total_seconds = float(np.sum(latencies))
+    p50, p95, p99 = np.percentile(latencies_ms, [50, 95, 99]) if len(latencies) > 0 else (np.nan,) * 3
+    return PickBenchmark(num_picks=len(latencies), total_seconds=total_seconds,
+                         picks_per_second=len(latencies) / total_seconds if total_seconds > 0 else np.nan,
+                         mean_ms=float(np.mean(latencies_ms)) if len(latencies) > 0 else np.nan,
+                         p50_ms=float(p50), p95_ms=float(p95), p99_ms=float(p99),
+                         max_ms=float(np.max(latencies_ms)) if len(latencies) > 0 else np.nan,
+                         peak_memory_bytes=peak_memory)
+
+
+def relative_changes(result, baseline):
+    """Returns the relative change of each numeric metric from a baseline result, e.g. 0.1 for 10% higher.
+
+    Args:
+        result (Dict[str, object]): Benchmark result, e.g. a PickBenchmark as a dict, or loaded from JSON.
+        baseline (Dict[str, object]): Earlier result to compare against.
+
+    Returns:
+        Dict[str, float]: Relative change of each metric that is a nonzero number in both results.
+    """
+    return {key: result[key] / baseline[key] - 1 for key in PickBenchmark._fields
+            if isinstance(result.get(key), (int, float)) and isinstance(baseline.get(key), (int, float))
+            and baseline[key] != 0}
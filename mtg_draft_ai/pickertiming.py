@@ -0,0 +1,109 @@
+"""Per-component timings of TwoColorComboRatingsPicker picks, to find which component rater makes slow picks slow."""
+
+from collections import namedtuple
+
+import numpy as np
+
+
+# Stage recorded for the whole of every pick's ratings, including work outside the component raters
+TOTAL = ('(all components)', 'total')
+
+TimingSummary = namedtuple('TimingSummary', ['component', 'stage', 'num_picks', 'calls_per_pick', 'total_seconds',
+                                             'mean_ms', 'p50_ms', 'p95_ms', 'max_ms'])
+
+
+class PickTiming:
+    """Wall time and number of calls of each component stage during a single pick."""
+
+    def __init__(self):
+        self.seconds = {}
+        self.calls = {}
+
+    def add(self, component, stage, seconds):
+        key = (component, stage)
+        self.seconds[key] = self.seconds.get(key, 0) + seconds
+        self.calls[key] = self.calls.get(key, 0) + 1
+
+
+class ComponentTimings:
+    """Per-pick wall times and call counts of each component rater's rate and normalize stages, over many picks.
+
+    Enable on a picker with TwoColorComboRatingsPicker.enable_timing, or on every picker a factory creates with
+    Factory.enable_timing. Timings are only collected in the process making the picks; combine timings from several
+    processes with merge, e.g. after sending them back with to_dict.
+    """
+
+    def __init__(self):
+        # Seconds and number of calls in each pick, by (component name, 'rate' / 'normalize' / 'total')
+        self.seconds = {}
+        self.calls = {}
+        self.num_picks = 0
+
+    def record_pick(self, pick_timing):
+        """Adds the timings of one pick. Stages not called during the pick count as 0 calls taking 0 seconds."""
+        for key in set(self.seconds) | set(pick_timing.seconds):
+            self.seconds.setdefault(key, [0.0] * self.num_picks).append(pick_timing.seconds.get(key, 0.0))
+            self.calls.setdefault(key, [0] * self.num_picks).append(pick_timing.calls.get(key, 0))
+        self.num_picks += 1
+
+    def merge(self, other):
+        """Adds every pick recorded by another ComponentTimings."""
+        for key in set(self.seconds) | set(other.seconds):
+            self.seconds.setdefault(key, [0.0] * self.num_picks).extend(
+                other.seconds.get(key, [0.0] * other.num_picks))
+            self.calls.setdefault(key, [0] * self.num_picks).extend(other.calls.get(key, [0] * other.num_picks))
+        self.num_picks += other.num_picks
+
+    def histogram(self, component, stage, bins=10):
+        """Histogram of the milliseconds spent in one component stage per pick.
+
+        Args:
+            component (str): Component rater name, or TOTAL[0].
+            stage (str): 'rate', 'normalize' or 'total'.
+            bins (object): Number of bins, or bin edges in milliseconds, as for numpy.histogram.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Number of picks in each bin, and the bin edges in milliseconds.
+        """
+        return np.histogram(np.array(self.seconds.get((component, stage), [])) * 1000, bins=bins)
+
+    def summary(self):
+        """Returns a TimingSummary for every component stage, slowest first, with latencies per pick."""
+        summaries = []
+        for (component, stage), seconds in self.seconds.items():
+            ms = np.array(seconds) * 1000
+            p50, p95 = np.percentile(ms, [50, 95])
+            summaries.append(TimingSummary(component=component, stage=stage, num_picks=len(seconds),
+                                           calls_per_pick=float(np.mean(self.calls[(component, stage)])),
+                                           total_seconds=float(np.sum(seconds)), mean_ms=float(np.mean(ms)),
+                                           p50_ms=float(p50), p95_ms=float(p95), max_ms=float(np.max(ms))))
+        return sorted(summaries, key=lambda s: s.total_seconds, reverse=True)
+
+    def format_summary(self):
+        """Returns the summary as a table, with each stage's share of the total time of all picks."""
+        summaries = self.summary()
+        total = sum(s.total_seconds for s in summaries if (s.component, s.stage) == TOTAL)
+        lines = ['{:<28} {:<10} {:>7} {:>10} {:>9} {:>9} {:>9} {:>9} {:>7}'.format(
+            'component', 'stage', 'share', 'calls/pick', 'mean ms', 'p50 ms', 'p95 ms', 'max ms', 'picks')]
+        for s in summaries:
+            lines.append('{:<28} {:<10} {:>7.1%} {:>10.1f} {:>9.3f} {:>9.3f} {:>9.3f} {:>9.3f} {:>7}'.format(
+                s.component, s.stage, s.total_seconds / total if total > 0 else 0, s.calls_per_pick, s.mean_ms,
+                s.p50_ms, s.p95_ms, s.max_ms, s.num_picks))
+        return '\n'.join(lines)
+
+    def to_dict(self):
+        """Returns the timings as a JSON-serializable dict, which from_dict reads back."""
+        return {'num_picks': self.num_picks,
+                'stages': [{'component': component, 'stage': stage, 'seconds': seconds,
+                            'calls': self.calls[(component, stage)]}
+                           for (component, stage), seconds in self.seconds.items()]}
+
+    @classmethod
+    def from_dict(cls, data):
+        timings = cls()
+        timings.num_picks = data['num_picks']
+        for stage in data['stages']:
+            key = (stage['component'], stage['stage'])
+            timings.seconds[key] = list(stage['seconds'])
+            timings.calls[key] = list(stage['calls'])
+        return timings
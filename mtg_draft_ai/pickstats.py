@@ -0,0 +1,160 @@
+"""Pick order statistics (e.g. average draft position) for cards, aggregated over many drafts."""
+
+from collections import Counter
+import multiprocessing
+import os
+
+import numpy as np
+
+from mtg_draft_ai import draftlog
+
+
+class PickOrderIndex:
+    """Per-card pick position histograms and passed-over counts, which can be updated incrementally.
+
+    Every source of picks (a draft log, a website draft, etc.) is recorded by key, so re-indexing a corpus only
+    reads the sources which haven't been indexed yet.
+    """
+
+    def __init__(self, card_names=None, taken=None, passed=None, sources=None):
+        """
+        Args:
+            card_names (List[str]): Names of indexed cards. A card's row in taken and passed is its index here.
+            taken (numpy.ndarray): 2D array of the number of times each card was taken at each pick of a pack.
+            passed (numpy.ndarray): 1D array of the number of times each card was in a pack and another card was taken.
+            sources (Set[str]): Keys of the sources already indexed.
+        """
+        self.card_names = card_names or []
+        self.taken = taken if taken is not None else np.zeros((0, 0), dtype=np.int64)
+        self.passed = passed if passed is not None else np.zeros(0, dtype=np.int64)
+        self.sources = sources or set()
+
+        self._ids = {name: i for i, name in enumerate(self.card_names)}
+
+    @staticmethod
+    def load(path):
+        """Loads an index saved with save, or returns an empty index if the file doesn't exist."""
+        if not os.path.exists(path):
+            return PickOrderIndex()
+
+        with np.load(path) as data:
+            return PickOrderIndex(card_names=[str(n) for n in data['card_names']], taken=data['taken'],
+                                  passed=data['passed'], sources={str(s) for s in data['sources']})
+
+    def save(self, path):
+        """Saves the index as a compressed numpy array file, replacing the file atomically."""
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            np.savez_compressed(f, card_names=np.array(self.card_names, dtype=str), taken=self.taken,
+                                passed=self.passed, sources=np.array(sorted(self.sources), dtype=str))
+        os.replace(tmp_path, path)
+
+    def add_source(self, key, picks):
+        """Indexes the picks from a single source, unless a source with the same key was already indexed.
+
+        Args:
+            key (str): Unique key for the source, e.g. a log file path.
+            picks: Iterable of (pick, pack, picked) tuples, where pick is the 0-indexed pick number within the pack,
+                pack is the list of card names in the pack, and picked is the name of the card taken from it.
+
+        Returns:
+            bool: True if the source was indexed, or False if it was already in the index.
+        """
+        if key in self.sources:
+            return False
+
+        taken, passed = _count_picks(picks)
+        self._merge(key, taken, passed)
+        return True
+
+    def add_logs(self, path, pattern=draftlog.LOG_FILE_PATTERN, processes=None):
+        """Indexes every draft log in a directory (or a single log) that isn't indexed yet.
+
+        Logs are identified by path, size and modification time, so unchanged logs aren't read, and a log which was
+        overwritten since it was indexed is indexed again, as a new draft. The picks from its earlier contents stay in
+        the index.
+
+        Args:
+            path (str): Path to a log file or a directory of log files.
+            pattern (str): Glob pattern that log file names in a directory must match.
+            processes (int): Optional - number of worker processes to read logs with.
+
+        Returns:
+            int: Number of logs newly indexed.
+        """
+        logs = [(p, draftlog.log_source_key(p)) for p in draftlog.corpus_log_files(path, pattern)]
+        new_logs = [(p, key) for p, key in logs if key not in self.sources]
+        for key, taken, passed in _map(_count_log_picks, new_logs, processes):
+            self._merge(key, taken, passed)
+        return len(new_logs)
+
+    def times_taken(self, card_name):
+        return int(self.taken[self._ids[card_name]].sum()) if card_name in self._ids else 0
+
+    def times_passed(self, card_name):
+        return int(self.passed[self._ids[card_name]]) if card_name in self._ids else 0
+
+    def average_pick(self, card_name):
+        """Returns the average 0-indexed pick number the card was taken at, or None if it was never taken."""
+        times_taken = self.times_taken(card_name)
+        if times_taken == 0:
+            return None
+        histogram = self.taken[self._ids[card_name]]
+        return float((histogram * np.arange(len(histogram))).sum() / times_taken)
+
+    def rankings(self):
+        """Returns (card name, average pick, times taken, times passed) for each card taken at least once,
+        sorted from earliest to latest average pick."""
+        times_taken = self.taken.sum(axis=1)
+        positions = np.arange(self.taken.shape[1])
+        average_picks = (self.taken * positions).sum(axis=1) / np.maximum(times_taken, 1)
+
+        rows = [(name, float(average_picks[i]), int(times_taken[i]), int(self.passed[i]))
+                for i, name in enumerate(self.card_names) if times_taken[i] > 0]
+        return sorted(rows, key=lambda row: row[1])
+
+    def _merge(self, key, taken, passed):
+        for name in [name for name, _ in taken] + list(passed):
+            if name not in self._ids:
+                self._ids[name] = len(self.card_names)
+                self.card_names.append(name)
+
+        max_pick = max([pick for _, pick in taken], default=-1)
+        num_rows = len(self.card_names)
+        num_columns = max(self.taken.shape[1], max_pick + 1)
+        if self.taken.shape != (num_rows, num_columns):
+            resized = np.zeros((num_rows, num_columns), dtype=np.int64)
+            resized[:self.taken.shape[0], :self.taken.shape[1]] = self.taken
+            self.taken = resized
+            self.passed = np.concatenate([self.passed, np.zeros(num_rows - len(self.passed), dtype=np.int64)])
+
+        for (name, pick), count in taken.items():
+            self.taken[self._ids[name], pick] += count
+        for name, count in passed.items():
+            self.passed[self._ids[name]] += count
+
+        self.sources.add(key)
+
+
+def _count_picks(picks):
+    taken = Counter()
+    passed = Counter()
+    for pick, pack, picked in picks:
+        taken[(picked, pick)] += 1
+        passed.update(name for name in pack if name != picked)
+    return taken, passed
+
+
+def _count_log_picks(log):
+    # Module-level so it can be sent to worker processes
+    log_path, key = log
+    taken, passed = _count_picks((p.pick, p.pack, p.picked) for p in draftlog.iter_picks(log_path))
+    return key, taken, passed
+
+
+def _map(fn, items, processes):
+    if processes is None:
+        return map(fn, items)
+
+    with multiprocessing.Pool(processes) as pool:
+        return pool.map(fn, items)
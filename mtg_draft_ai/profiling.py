@@ -0,0 +1,107 @@
+"""Helpers for profiling scripts by stage: wall time per stage, and sampled call stacks grouped by stage."""
+
+import collections
+import contextlib
+import os
+import sys
+import threading
+import time
+
+
+# Stage of samples taken outside of any stage
+NO_STAGE = '(no stage)'
+
+
+class StageTimer:
+    """Accumulates the wall time spent in named stages, e.g. the draft and deckbuild of every trial."""
+
+    def __init__(self):
+        self.seconds = {}
+        self.calls = {}
+        # Innermost stage currently running, read by StackSampler from another thread
+        self.current = None
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        """Context manager which adds the time taken by its body to a stage. Stages may be nested."""
+        previous = self.current
+        self.current = name
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.seconds[name] = self.seconds.get(name, 0) + time.perf_counter() - start
+            self.calls[name] = self.calls.get(name, 0) + 1
+            self.current = previous
+
+    def format_report(self):
+        """Returns a table of the total and mean time of every stage, with its share of the time of all stages."""
+        total = sum(self.seconds.values())
+        lines = ['{:<16} {:>10} {:>7} {:>7} {:>10}'.format('stage', 'total s', 'share', 'calls', 'mean ms')]
+        for name, seconds in sorted(self.seconds.items(), key=lambda item: item[1], reverse=True):
+            lines.append('{:<16} {:>10.3f} {:>7.1%} {:>7} {:>10.3f}'.format(
+                name, seconds, seconds / total if total > 0 else 0, self.calls[name],
+                seconds / self.calls[name] * 1000))
+        return '\n'.join(lines)
+
+
+class StackSampler:
+    """Samples the call stack of a thread at a fixed interval from a background thread.
+
+    Samples are counted as collapsed stacks, the input format of flamegraph tools such as flamegraph.pl and
+    speedscope: one line per distinct stack, with frames from outermost to innermost separated by semicolons, then a
+    space and the number of samples. With a StageTimer, every stack starts with the stage it was sampled in.
+    """
+
+    def __init__(self, interval=0.005, stage_timer=None, thread_id=None):
+        """
+        Args:
+            interval (float): Seconds between samples.
+            stage_timer (StageTimer): Optional - timer whose current stage is added to the root of every stack.
+            thread_id (int): Identifier of the thread to sample. Defaults to the thread calling start.
+        """
+        self.interval = interval
+        self.stage_timer = stage_timer
+        self.thread_id = thread_id
+        self.counts = collections.Counter()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self.thread_id is None:
+            self.thread_id = threading.get_ident()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='StackSampler', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def write_collapsed(self, path):
+        with open(path, 'w') as f:
+            for stack, count in sorted(self.counts.items()):
+                f.write('{} {}\n'.format(stack, count))
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self.counts[self._collapse(frame)] += 1
+
+    def _collapse(self, frame):
+        frames = []
+        while frame is not None:
+            code = frame.f_code
+            frames.append('{} ({}:{})'.format(code.co_name, os.path.basename(code.co_filename), code.co_firstlineno))
+            frame = frame.f_back
+        if self.stage_timer is not None:
+            frames.append(self.stage_timer.current or NO_STAGE)
+        return ';'.join(reversed(frames))
@@ -0,0 +1,236 @@
+"""Counterfactual replay of recorded picks: how often would a picker with different weights have made the same picks?
+
+A TwoColorComboRatingsPicker's normalized rating components don't depend on its weights, so they're computed once per
+pick and cached. Ratings for any number of weight configurations are then a weighted sum of the same component
+matrix, computed for every pick and configuration at once with matrix multiplies.
+"""
+
+from collections import namedtuple
+import copy
+import os
+
+import numpy as np
+
+from mtg_draft_ai import draftlog
+from mtg_draft_ai.api import Card
+from mtg_draft_ai.brains import ConstantWeight, LinearProgressWeight, TwoColorComboRatingsPicker
+
+
+ReplayPick = namedtuple('ReplayPick', ['pack', 'cards_owned', 'picked', 'draft_info'])
+
+
+def log_replay_picks(log_file, card_list):
+    """Reconstructs every pick in a draft log, with the cards each drafter owned at the time.
+
+    Args:
+        log_file: Path or file-like object to load the log from, in either the TOML or binary format.
+        card_list (List[Card]): Every card in the cube, for converting card names into Cards. Cards which aren't
+            in it, e.g. from an older version of the cube, only have a name.
+
+    Returns:
+        List[ReplayPick]: Every pick, ordered by drafter, then by phase and pick.
+    """
+    cards_by_name = {c.name: c for c in card_list}
+
+    def card(name):
+        return cards_by_name[name] if name in cards_by_name else Card(name=name)
+
+    picks = []
+    for drafter in draftlog.load_drafters_from_log(log_file):
+        # Drafters loaded without a card list share a DraftInfo without one
+        draft_info = copy.copy(drafter.draft_info)
+        draft_info.card_list = card_list
+        owned = [card(name) for name in drafter.cards_owned]
+        for i, pack in enumerate(drafter.pack_history):
+            picks.append(ReplayPick(pack=[card(name) for name in pack], cards_owned=owned[:i], picked=owned[i],
+                                    draft_info=draft_info))
+    return picks
+
+
+class ComponentCorpus:
+    """Normalized rating components for every candidate x color combo of every recorded pick, which can be updated
+    incrementally.
+
+    Like pickstats.PickOrderIndex, every source of picks (a draft log, a website draft, etc.) is recorded by key, so
+    re-reading a corpus only computes components for sources which haven't been added yet.
+    """
+
+    def __init__(self, component_names, fingerprint='', components=None, picked=None, offsets=None, progress=None,
+                 fallback_agrees=None, sources=None):
+        """
+        Args:
+            component_names (List[str]): Names of the picker's component raters, in order. Column i of components
+                is the component of component_names[i].
+            fingerprint (str): Identifies everything else the components depend on, e.g. the picker and cube version.
+            components (numpy.ndarray): 2D array with a row of normalized components for each rated candidate x color
+                combo, grouped by pick.
+            picked (numpy.ndarray): 1D bool array of whether each row's candidate is the card that was picked.
+            offsets (numpy.ndarray): Index of the first row of each pick, plus the total number of rows at the end.
+            progress (numpy.ndarray): Fraction of the draft's picks already made at each pick.
+            fallback_agrees (numpy.ndarray): For each pick, whether the picked card is the first in the pack, which
+                is what the picker takes if it has no on-color candidates.
+            sources (Set[str]): Keys of the sources already added.
+        """
+        self.component_names = list(component_names)
+        self.fingerprint = fingerprint
+        self.components = components if components is not None else np.zeros((0, len(self.component_names)))
+        self.picked = picked if picked is not None else np.zeros(0, dtype=bool)
+        self.offsets = offsets if offsets is not None else np.zeros(1, dtype=np.int64)
+        self.progress = progress if progress is not None else np.zeros(0)
+        self.fallback_agrees = fallback_agrees if fallback_agrees is not None else np.zeros(0, dtype=bool)
+        self.sources = sources or set()
+
+    @staticmethod
+    def load(path, component_names, fingerprint=''):
+        """Loads a corpus saved with save, or returns an empty corpus if the file doesn't exist or was computed for
+        different components or a different fingerprint."""
+        if os.path.exists(path):
+            with np.load(path) as data:
+                if [str(n) for n in data['component_names']] == list(component_names) and \
+                        str(data['fingerprint']) == fingerprint:
+                    return ComponentCorpus(component_names, fingerprint, components=data['components'],
+                                           picked=data['picked'], offsets=data['offsets'], progress=data['progress'],
+                                           fallback_agrees=data['fallback_agrees'],
+                                           sources={str(s) for s in data['sources']})
+        return ComponentCorpus(component_names, fingerprint)
+
+    def save(self, path):
+        """Saves the corpus as a compressed numpy array file, replacing the file atomically."""
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            np.savez_compressed(f, component_names=np.array(self.component_names, dtype=str),
+                                fingerprint=np.array(self.fingerprint), components=self.components,
+                                picked=self.picked, offsets=self.offsets, progress=self.progress,
+                                fallback_agrees=self.fallback_agrees,
+                                sources=np.array(sorted(self.sources), dtype=str))
+        os.replace(tmp_path, path)
+
+    @property
+    def num_picks(self):
+        return len(self.progress)
+
+    def add_source(self, key, picks, picker):
+        """Computes and adds the components of every pick from a single source, unless a source with the same key was
+        already added.
+
+        Args:
+            key (str): Unique key for the source, e.g. a log file path.
+            picks (Iterable[ReplayPick]): The picks.
+            picker (TwoColorComboRatingsPicker): Picker to compute components with. Its weights are ignored.
+
+        Returns:
+            bool: True if the source was added, or False if it was already in the corpus.
+        """
+        if key in self.sources:
+            return False
+
+        rows, picked, counts, progress, fallback_agrees = [], [], [], [], []
+        for pick in picks:
+            rated_cards = picker.normalized_rating_components(pick.pack, pick.cards_owned, pick.draft_info)
+            rows += [[rc.components[name] for name in self.component_names] for rc in rated_cards]
+            picked += [rc.card == pick.picked for rc in rated_cards]
+            counts.append(len(rated_cards))
+            progress.append(len(pick.cards_owned) / (pick.draft_info.num_phases * pick.draft_info.cards_per_pack))
+            fallback_agrees.append(pick.pack[0] == pick.picked)
+
+        if rows:
+            self.components = np.concatenate([self.components, np.array(rows, dtype=float)])
+        self.picked = np.concatenate([self.picked, np.array(picked, dtype=bool)])
+        self.offsets = np.concatenate([self.offsets, self.offsets[-1] + np.cumsum(counts, dtype=np.int64)])
+        self.progress = np.concatenate([self.progress, progress])
+        self.fallback_agrees = np.concatenate([self.fallback_agrees, np.array(fallback_agrees, dtype=bool)])
+        self.sources.add(key)
+        return True
+
+    def add_logs(self, path, card_list, picker, pattern=draftlog.LOG_FILE_PATTERN):
+        """Adds every draft log in a directory (or a single log) that isn't in the corpus yet.
+
+        Logs are identified by path, size and modification time, so unchanged logs aren't read, and a log which was
+        overwritten since it was added is added again, as a new draft.
+
+        Args:
+            path (str): Path to a log file or a directory of log files.
+            card_list (List[Card]): Every card in the cube.
+            picker (TwoColorComboRatingsPicker): Picker to compute components with.
+            pattern (str): Glob pattern that log file names in a directory must match.
+
+        Returns:
+            int: Number of logs newly added.
+        """
+        logs = [(p, draftlog.log_source_key(p)) for p in draftlog.corpus_log_files(path, pattern)]
+        new_logs = [(p, key) for p, key in logs if key not in self.sources]
+        for log_path, key in new_logs:
+            self.add_source(key, log_replay_picks(log_path, card_list), picker)
+        return len(new_logs)
+
+    def agreement(self, weights_list, max_elements=2 ** 24):
+        """Computes how often a picker with each set of weights would make the recorded pick.
+
+        When several candidates tie for the best rating, the picker takes a random one, so a pick counts as the
+        fraction of the tied ratings which belong to the recorded pick.
+
+        Args:
+            weights_list (List[Dict[str, object]]): Weights to evaluate, each a LinearProgressWeight or
+                ConstantWeight by component name.
+            max_elements (int): Maximum size of the ratings matrix (rows x configurations) to compute at once.
+                Configurations are evaluated in chunks to stay under it.
+
+        Returns:
+            numpy.ndarray: Expected fraction of recorded picks the picker would agree with, for each set of weights.
+        """
+        starts, ends = weight_matrices(self.component_names, weights_list)
+        if self.num_picks == 0:
+            return np.full(len(weights_list), np.nan)
+
+        counts = np.diff(self.offsets)
+        nonempty = counts > 0
+        row_pick = np.repeat(np.arange(self.num_picks), counts)
+        row_progress = self.progress[row_pick][:, None]
+        # Position of each row's pick among the picks with at least one row, for the per-pick reductions
+        row_group = np.repeat(np.arange(nonempty.sum()), counts[nonempty])
+        group_starts = self.offsets[:-1][nonempty]
+
+        chunk_size = max(1, max_elements // max(1, len(self.components)))
+        agreement = np.zeros(len(weights_list))
+        for chunk in range(0, len(weights_list), chunk_size):
+            chunk_starts, chunk_ends = starts[chunk:chunk + chunk_size], ends[chunk:chunk + chunk_size]
+            slopes = chunk_ends - chunk_starts
+
+            # Weighted average of the components, with each weight linear in draft progress
+            numerators = self.components @ chunk_starts.T + row_progress * (self.components @ slopes.T)
+            denominators = chunk_starts.sum(axis=1) + row_progress * slopes.sum(axis=1)
+            ratings = np.round(numerators / denominators, TwoColorComboRatingsPicker.ROUND_NUM_DIGITS)
+
+            if len(group_starts) > 0:
+                best = np.maximum.reduceat(ratings, group_starts, axis=0)
+                is_best = ratings == best[row_group]
+                num_best = np.add.reduceat(is_best, group_starts, axis=0)
+                num_best_picked = np.add.reduceat(is_best & self.picked[:, None], group_starts, axis=0)
+                agreement[chunk:chunk + chunk_size] = (num_best_picked / num_best).sum(axis=0)
+
+        agreement += self.fallback_agrees[~nonempty].sum()
+        return agreement / self.num_picks
+
+
+def weight_matrices(component_names, weights_list):
+    """Converts weights into matrices of each component's weight at the start and end of the draft.
+
+    Args:
+        component_names (List[str]): Names of the components, in column order.
+        weights_list (List[Dict[str, object]]): Each a LinearProgressWeight or ConstantWeight by component name.
+
+    Returns:
+        Tuple[numpy.ndarray, numpy.ndarray]: Start and end weights, with a row for each set of weights.
+    """
+    starts = np.zeros((len(weights_list), len(component_names)))
+    ends = np.zeros((len(weights_list), len(component_names)))
+    for i, weights in enumerate(weights_list):
+        for j, name in enumerate(component_names):
+            weight = weights[name]
+            if isinstance(weight, LinearProgressWeight):
+                starts[i, j], ends[i, j] = weight.start, weight.end
+            elif isinstance(weight, ConstantWeight):
+                starts[i, j], ends[i, j] = weight.weight, weight.weight
+            else:
+                raise ValueError('Can\'t replay weight {} of component {}'.format(weight, name))
+    return starts, ends
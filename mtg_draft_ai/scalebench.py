@@ -0,0 +1,118 @@
+"""Helpers for benchmarks which measure how runtime and memory grow with problem size."""
+
+from collections import namedtuple
+import csv
+import math
+import time
+import tracemalloc
+
+
+Measurement = namedtuple('Measurement', ['path', 'size', 'seconds', 'peak_memory_bytes'])
+
+
+def measure(fn, measure_memory=True, repeat=3, warmup=1):
+    """Runs fn and measures its runtime, then optionally runs it again with tracemalloc to measure its peak memory.
+    Memory is measured separately since tracing allocations slows code down.
+
+    The runtime is the fastest of several runs after some untimed warm-up runs, so that one-off costs (e.g. filling
+    caches) and noise from other processes don't skew the scaling exponents fitted to it.
+
+    Args:
+        fn (function): Function taking no arguments.
+        measure_memory (bool): Whether to measure peak memory.
+        repeat (int): Number of timed runs. With 0, only memory is measured and the runtime is None.
+        warmup (int): Number of untimed runs before the timed runs.
+
+    Returns:
+        Tuple[float, int]: Fastest runtime in seconds, and peak traced memory in bytes (None if not measured).
+    """
+    for _ in range(0, warmup):
+        fn()
+
+    seconds = None
+    for _ in range(0, repeat):
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        seconds = elapsed if seconds is None else min(seconds, elapsed)
+
+    peak_memory = None
+    if measure_memory:
+        tracemalloc.start()
+        try:
+            fn()
+            _, peak_memory = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    return seconds, peak_memory
+
+
+def scaling_exponent(sizes, values):
+    """Fits values = c * size^k by least squares on a log-log scale and returns k, e.g. about 1 for linear growth and
+    2 for quadratic growth. Returns None with fewer than two usable points."""
+    points = [(math.log(s), math.log(v)) for s, v in zip(sizes, values) if s and v and s > 0 and v > 0]
+    if len(set(x for x, _ in points)) < 2:
+        return None
+
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / sum((x - mean_x) ** 2 for x, _ in points)
+
+
+def superlinear_paths(measurements, threshold=1.2):
+    """Finds the measured paths whose runtime or memory grows faster than linearly with size.
+
+    Args:
+        measurements (List[Measurement]): Measurements of one or more paths at several sizes.
+        threshold (float): Scaling exponent above which growth counts as super-linear. Slightly above 1, since
+            small sizes are dominated by constant overhead.
+
+    Returns:
+        List[Tuple[str, str, float]]: (path, 'seconds' or 'peak_memory_bytes', exponent) for each super-linear
+            metric.
+    """
+    flagged = []
+    for path in dict.fromkeys(m.path for m in measurements):
+        path_measurements = [m for m in measurements if m.path == path]
+        for metric in ['seconds', 'peak_memory_bytes']:
+            exponent = scaling_exponent([m.size for m in path_measurements],
+                                        [getattr(m, metric) for m in path_measurements])
+            if exponent is not None and exponent > threshold:
+                flagged.append((path, metric, exponent))
+    return flagged
+
+
+def write_csv(measurements, path):
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(Measurement._fields)
+        writer.writerows(measurements)
+
+
+def plot(measurements, path, size_label='Size'):
+    """Plots runtime and peak memory against size for every measured path, on log-log axes. Requires matplotlib,
+    which isn't a dependency of this package."""
+    try:
+        import matplotlib
+        matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+    except ImportError:
+        raise ImportError('Plotting requires matplotlib, install it with: pip install matplotlib')
+
+    figure, (time_axes, memory_axes) = plt.subplots(1, 2, figsize=(12, 5))
+    for name in dict.fromkeys(m.path for m in measurements):
+        path_measurements = [m for m in measurements if m.path == name]
+        sizes = [m.size for m in path_measurements]
+        time_axes.plot(sizes, [m.seconds for m in path_measurements], marker='o', label=name)
+        memory_axes.plot(sizes, [(m.peak_memory_bytes or 0) / 2 ** 20 for m in path_measurements], marker='o',
+                         label=name)
+
+    for axes, label in [(time_axes, 'Runtime (s)'), (memory_axes, 'Peak traced memory (MiB)')]:
+        axes.set_xscale('log')
+        axes.set_yscale('log')
+        axes.set_xlabel(size_label)
+        axes.set_ylabel(label)
+        axes.legend()
+    figure.tight_layout()
+    figure.savefig(path)
+    plt.close(figure)
@@ -42,11 +42,12 @@ def create_graph(cards, remove_isolated=True, freeze=True):
 
 
 def _cards_by_themes(cards):
+    # Dicts rather than sets keep the cards in their given order, so edges don't depend on PYTHONHASHSEED
     bp_graphs = {}
 
     for card in cards:
         for theme, role in card.tags:
-            bp_graphs.setdefault(theme, {}).setdefault(role, set()).add(card)
+            bp_graphs.setdefault(theme, {}).setdefault(role, {})[card] = None
 
     return bp_graphs
 
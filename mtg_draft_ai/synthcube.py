@@ -0,0 +1,115 @@
+"""Generates synthetic cubes of any size, in the same TOML schema as the real cube data read by read_cube_toml."""
+
+import random
+
+import toml
+
+from mtg_draft_ai.api import Card
+
+
+COLORS = 'WUBRG'
+
+# Fraction of nonland cards with 0, 1, 2 and 3 theme tags, roughly as in the tagged real cubes
+DEFAULT_THEMES_PER_CARD = [0.2, 0.45, 0.3, 0.05]
+
+
+def generate_cube(num_cards, num_themes=10, enabler_ratio=0.75, themes_per_card=None, color_weights=None,
+                  multicolor_fraction=0.15, colorless_fraction=0.08, land_fraction=0.08, fixer_fraction=0.6,
+                  seed=0):
+    """Generates the card data and fixer data of a synthetic cube.
+
+    Args:
+        num_cards (int): Number of cards in the cube.
+        num_themes (int): Number of synergy themes, e.g. 'Theme 3', each with Enabler and Payoff tags.
+        enabler_ratio (float): Fraction of theme tags which are Enabler tags, the rest are Payoff tags.
+        themes_per_card (List[float]): Probability of a nonland card having 0, 1, 2, ... theme tags.
+            Defaults to DEFAULT_THEMES_PER_CARD.
+        color_weights (Dict[str, float]): Relative frequency of each color among colored cards. Defaults to equal.
+        multicolor_fraction (float): Fraction of colored nonland cards which are two colors.
+        colorless_fraction (float): Fraction of nonland cards which are colorless artifacts.
+        land_fraction (float): Fraction of cards which are lands.
+        fixer_fraction (float): Fraction of lands which fix for colors, and are listed in the fixer data.
+            Colorless artifacts also fix with half this probability, like mana rocks.
+        seed (int): Random seed.
+
+    Returns:
+        Tuple[Dict[str, dict], Dict[str, str]]: Card data by card name, as in a card data TOML file, and fixer color
+            identity by card name, as in a fixer data TOML file.
+    """
+    rng = random.Random(seed)
+    themes_per_card = themes_per_card or DEFAULT_THEMES_PER_CARD
+    color_weights = color_weights or {c: 1 for c in COLORS}
+    colors = list(color_weights.keys())
+    weights = list(color_weights.values())
+    themes = ['Theme {}'.format(i) for i in range(0, num_themes)]
+
+    cards = {}
+    fixers = {}
+    for i in range(0, num_cards):
+        name = 'Synthetic Card {:05d}'.format(i)
+
+        if rng.random() < land_fraction:
+            cards[name] = {'mana_cost': [], 'color_identity': 'C', 'types': ['land'], 'tags': []}
+            if rng.random() < fixer_fraction:
+                fixers[name] = _fixer_colors(rng, colors, weights)
+            continue
+
+        tags = ['{} - {}'.format(theme, 'Enabler' if rng.random() < enabler_ratio else 'Payoff')
+                for theme in rng.sample(themes, min(num_themes, _choose_index(rng, themes_per_card)))]
+        tags.append('Tier {}'.format(rng.choice([1, 2, 2, 3, 3, 3, 4])))
+
+        mana_value = rng.choice([1, 2, 2, 3, 3, 3, 4, 4, 5, 6])
+        if rng.random() < colorless_fraction:
+            cards[name] = {'mana_cost': [str(mana_value)], 'color_identity': 'C', 'types': ['artifact'],
+                           'tags': tags}
+            if rng.random() < fixer_fraction / 2:
+                fixers[name] = _fixer_colors(rng, colors, weights)
+            continue
+
+        num_colors = 2 if rng.random() < multicolor_fraction else 1
+        card_colors = _distinct_colors(rng, colors, weights, num_colors)
+        colored_symbols = [card_colors[j % num_colors] for j in range(0, min(mana_value, num_colors + 1))]
+        generic = mana_value - len(colored_symbols)
+        cards[name] = {'mana_cost': ([str(generic)] if generic > 0 else []) + colored_symbols,
+                       'color_identity': ''.join(sorted(card_colors)),
+                       'types': [rng.choice(['creature', 'creature', 'instant', 'sorcery', 'enchantment'])],
+                       'tags': tags}
+
+    return cards, fixers
+
+
+def write_cube_toml(cards, fixers, card_data_file, fixer_data_file):
+    """Writes the output of generate_cube to card data and fixer data TOML files, which read_cube_toml can read."""
+    with open(card_data_file, 'w') as f:
+        toml.dump(cards, f)
+    with open(fixer_data_file, 'w') as f:
+        toml.dump(fixers, f)
+
+
+def cube_list(cards, fixers):
+    """Creates the Cards of a cube from the output of generate_cube, the same as read_cube_toml would from the
+    files written by write_cube_toml."""
+    cube = [Card.from_raw_data(name, properties) for name, properties in cards.items()]
+    for card in cube:
+        card.fixer_color_id = fixers.get(card.name)
+    return cube
+
+
+def _choose_index(rng, probabilities):
+    return rng.choices(range(0, len(probabilities)), weights=probabilities)[0]
+
+
+def _distinct_colors(rng, colors, weights, num_colors):
+    chosen = []
+    while len(chosen) < min(num_colors, len(colors)):
+        color = rng.choices(colors, weights=weights)[0]
+        if color not in chosen:
+            chosen.append(color)
+    return chosen
+
+
+def _fixer_colors(rng, colors, weights):
+    # Mostly two-color fixers, with the occasional fixer for every color
+    if rng.random() < 0.1:
+        return ''.join(sorted(colors))
+    return ''.join(sorted(_distinct_colors(rng, colors, weights, 2)))
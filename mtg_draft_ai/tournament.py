@@ -0,0 +1,157 @@
+"""Tournaments between pickers, which draft at mixed tables over identical seeded pack sets.
+
+Every pack set is drafted once per rotation. Pickers alternate around the table, and each rotation moves every picker
+one seat along, so over all rotations every picker drafts from every seat with the same packs. Comparing pickers over
+the same pack sets and seats removes most of the variance between random packs.
+"""
+
+from collections import namedtuple
+import functools
+import multiprocessing
+import random
+import statistics
+
+from mtg_draft_ai import deckbuild, deckscore, trialstats
+from mtg_draft_ai.api import DraftInfo, Drafter
+from mtg_draft_ai.brains import PICKERS
+from mtg_draft_ai.controller import DraftController, create_packs
+
+
+SeatResult = namedtuple('SeatResult', ['pack_set', 'rotation', 'seat', 'picker', 'num_edges', 'avg_power'])
+
+PickerSummary = namedtuple('PickerSummary', ['picker', 'edges', 'power', 'edges_difference', 'power_difference'])
+
+
+def seat_pickers(pickers, num_drafters, rotation):
+    """Returns the picker at each seat of a table for one rotation.
+
+    Args:
+        pickers (List[str]): Names of the pickers in the tournament.
+        num_drafters (int): Number of seats at the table.
+        rotation (int): Index of the rotation, from 0 to len(pickers) - 1.
+
+    Returns:
+        List[str]: Picker names, by seat.
+    """
+    return [pickers[(seat + rotation) % len(pickers)] for seat in range(0, num_drafters)]
+
+
+def run_tournament(card_list, pickers, num_pack_sets, seed=0, num_drafters=8, num_phases=3, cards_per_pack=15,
+                   executor=None):
+    """Drafts every pack set once per rotation of the pickers around the table, and builds and scores every deck.
+
+    Args:
+        card_list (List[Card]): Every card in the cube.
+        pickers (List[str]): Names of pickers from brains.PICKERS, without duplicates.
+        num_pack_sets (int): Number of pack sets to draft.
+        seed (int): Random seed. Pack set i is the same for every rotation, and for every tournament with the
+            same seed and card list.
+        num_drafters (int): Number of seats at the table.
+        num_phases (int): Number of packs per drafter.
+        cards_per_pack (int): Number of cards in each pack.
+        executor (multiprocessing.pool.Pool): Optional - process pool to run drafts on, which must have been
+            created with init_worker as its initializer, e.g. by create_executor. Drafts run serially in this
+            process if not provided.
+
+    Returns:
+        List[SeatResult]: The result at every seat of every draft.
+    """
+    if len(set(pickers)) != len(pickers):
+        raise ValueError('Pickers must be distinct: {}'.format(pickers))
+    unknown = [p for p in pickers if p not in PICKERS]
+    if unknown:
+        raise ValueError('Unknown pickers: {}'.format(unknown))
+
+    draft_fn = functools.partial(_run_draft, pickers=pickers, seed=seed, num_drafters=num_drafters,
+                                 num_phases=num_phases, cards_per_pack=cards_per_pack)
+    jobs = [(pack_set, rotation) for pack_set in range(0, num_pack_sets) for rotation in range(0, len(pickers))]
+
+    if executor is None:
+        init_worker(card_list, pickers)
+        results = map(draft_fn, jobs)
+    else:
+        results = executor.map(draft_fn, jobs)
+    return [seat_result for draft_results in results for seat_result in draft_results]
+
+
+def summarize(seat_results, pickers, confidence=0.95):
+    """Computes confidence intervals for each picker's mean deck metrics, and for the paired difference between each
+    picker and the first (baseline) picker.
+
+    Each pack set is one observation: a picker's mean over every seat it drafted from that pack set. Since every
+    picker drafts from every seat of every pack set, the differences are paired.
+
+    Args:
+        seat_results (List[SeatResult]): Results from run_tournament.
+        pickers (List[str]): Names of the pickers, the first of which is the baseline.
+        confidence (float): Confidence level of the intervals.
+
+    Returns:
+        List[PickerSummary]: A summary for each picker, in the same order as pickers. The baseline's differences
+            are None.
+    """
+    per_pack_set = {}
+    for result in seat_results:
+        per_pack_set.setdefault((result.picker, result.pack_set), []).append(result)
+    pack_sets = sorted({result.pack_set for result in seat_results})
+
+    def observations(picker, field):
+        return [statistics.mean(getattr(r, field) for r in per_pack_set[(picker, pack_set)])
+                for pack_set in pack_sets]
+
+    baseline = pickers[0]
+    summaries = []
+    for picker in pickers:
+        edges, power = observations(picker, 'num_edges'), observations(picker, 'avg_power')
+        edges_difference, power_difference = None, None
+        if picker != baseline:
+            edges_difference = trialstats.paired_confidence_interval(
+                edges, observations(baseline, 'num_edges'), confidence)
+            power_difference = trialstats.paired_confidence_interval(
+                power, observations(baseline, 'avg_power'), confidence)
+        summaries.append(PickerSummary(picker=picker,
+                                       edges=trialstats.confidence_interval(edges, confidence),
+                                       power=trialstats.confidence_interval(power, confidence),
+                                       edges_difference=edges_difference,
+                                       power_difference=power_difference))
+    return summaries
+
+
+def create_executor(card_list, pickers, max_workers=None):
+    """Creates a process pool for run_tournament, whose workers each create the pickers' factories once."""
+    # A multiprocessing pool rather than a ProcessPoolExecutor, whose initializer needs Python 3.7
+    return multiprocessing.Pool(processes=max_workers, initializer=init_worker, initargs=(card_list, pickers))
+
+
+# Per-process state, set by init_worker. Picker factories can be slow to create, so they're reused for every draft.
+_worker_state = {}
+
+
+def init_worker(card_list, pickers):
+    _worker_state['card_list'] = card_list
+    _worker_state['factories'] = {picker: PICKERS[picker].factory(card_list) for picker in pickers}
+    _worker_state['scorer'] = deckscore.DeckScorer(card_list)
+
+
+def _run_draft(job, pickers, seed, num_drafters, num_phases, cards_per_pack):
+    pack_set, rotation = job
+    card_list = _worker_state['card_list']
+    factories = _worker_state['factories']
+    scorer = _worker_state['scorer']
+
+    draft_info = DraftInfo(card_list=card_list, num_drafters=num_drafters, num_phases=num_phases,
+                           cards_per_pack=cards_per_pack)
+    # Seeding by pack set gives every rotation the same packs, and the same random choices during the draft
+    random.seed('{}-{}'.format(seed, pack_set))
+    packs = create_packs(draft_info)
+
+    seats = seat_pickers(pickers, num_drafters, rotation)
+    drafters = [Drafter(factories[picker].create(), draft_info) for picker in seats]
+    DraftController(draft_info=draft_info, drafters=drafters, packs=packs, debug=False).run_draft()
+
+    decks = [deckbuild.best_two_color_synergy_build(d.cards_owned, prune=True) for d in drafters]
+    scores = scorer.score([scorer.card_ids(deck) for deck in decks])
+
+    return [SeatResult(pack_set=pack_set, rotation=rotation, seat=seat, picker=picker, num_edges=int(num_edges),
+                       avg_power=float(power))
+            for seat, (picker, num_edges, power) in enumerate(zip(seats, scores.num_edges, scores.avg_power))]
@@ -0,0 +1,92 @@
+"""Single-file archive of the artifacts of many trials (draft logs, HTML and debug output), as an alternative to
+writing several small files per trial."""
+
+import os
+import sqlite3
+import threading
+import zlib
+
+
+def file_name(trial, artifact):
+    """Returns the file name trials.py gives an artifact outside of an archive, e.g. draft_3.html for draft.html."""
+    stem, extension = os.path.splitext(artifact)
+    return '{}_{}{}'.format(stem, trial, extension)
+
+
+class TrialArchive:
+    """Compressed artifacts of every trial, indexed by trial name and artifact name in a sqlite database.
+
+    Several processes can write to the same archive at once, each with its own TrialArchive; writes are serialized by
+    sqlite's locking. Safe to share between threads, but not between processes.
+    """
+
+    def __init__(self, path, timeout=60):
+        """
+        Args:
+            path (str): Path of the archive. Created if it doesn't exist.
+            timeout (float): Seconds to wait for other processes' writes to finish before giving up.
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, timeout=timeout, check_same_thread=False)
+        # Write-ahead logging lets readers carry on while another process writes
+        self._db.execute('PRAGMA journal_mode=WAL')
+        with self._db:
+            self._db.execute('CREATE TABLE IF NOT EXISTS artifacts (trial TEXT, name TEXT, data BLOB, '
+                             'PRIMARY KEY (trial, name))')
+
+    def put(self, trial, artifacts):
+        """Adds every artifact of a trial at once, replacing any with the same names.
+
+        Args:
+            trial (str): Name of the trial.
+            artifacts (Dict[str, object]): Contents of each artifact by name, e.g. 'draft.html', as str or bytes.
+                Strings are stored as UTF-8.
+        """
+        rows = [(str(trial), name, zlib.compress(data.encode('utf-8') if isinstance(data, str) else data))
+                for name, data in artifacts.items()]
+        with self._lock:
+            with self._db:
+                self._db.executemany('INSERT OR REPLACE INTO artifacts VALUES (?, ?, ?)', rows)
+
+    def get(self, trial, name):
+        """Returns the contents of an artifact as bytes, or None if it isn't in the archive."""
+        with self._lock:
+            row = self._db.execute('SELECT data FROM artifacts WHERE trial = ? AND name = ?',
+                                   (str(trial), name)).fetchone()
+        return zlib.decompress(row[0]) if row is not None else None
+
+    def get_text(self, trial, name):
+        """Returns the contents of a text artifact, or None if it isn't in the archive."""
+        data = self.get(trial, name)
+        return data.decode('utf-8') if data is not None else None
+
+    def trials(self):
+        """Returns the name of every trial in the archive, sorted."""
+        with self._lock:
+            return [row[0] for row in self._db.execute('SELECT DISTINCT trial FROM artifacts ORDER BY trial')]
+
+    def names(self, trial):
+        """Returns the name of every artifact of a trial, sorted."""
+        with self._lock:
+            return [row[0] for row in self._db.execute('SELECT name FROM artifacts WHERE trial = ? ORDER BY name',
+                                                       (str(trial),))]
+
+    def extract(self, trial, output_dir):
+        """Writes every artifact of a trial to the files trials.py would have written without an archive.
+
+        Returns:
+            List[str]: Paths of the written files.
+        """
+        paths = []
+        for name in self.names(trial):
+            path = os.path.join(output_dir, file_name(trial, name))
+            with open(path, 'wb') as f:
+                f.write(self.get(trial, name))
+            paths.append(path)
+        return paths
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
@@ -0,0 +1,80 @@
+"""Manifest of completed trials, so that interrupted or extended runs of trials.py only run the trials they're
+missing."""
+
+import hashlib
+import json
+import sqlite3
+import threading
+
+
+def picker_config_hash(picker):
+    """Returns a hex digest of a picker's class and, for pickers with component raters, every component's weight.
+
+    Args:
+        picker (Picker): A picker, e.g. created by the factory trials are run with.
+    """
+    components = [(cr.name(), type(cr.weight).__name__, sorted(vars(cr.weight).items()))
+                  for cr in getattr(picker, 'component_raters', [])]
+    config = json.dumps([type(picker).__name__, components])
+    return hashlib.sha256(config.encode('utf-8')).hexdigest()
+
+
+class TrialManifest:
+    """Results of completed trials in a sqlite database, keyed by what determines them: the picker configuration,
+    the cube, the draft settings and the trial's seed.
+
+    Each result is saved as soon as it's added, so a run which is interrupted loses at most the trials in progress.
+    Safe to share between threads.
+    """
+
+    def __init__(self, path):
+        """
+        Args:
+            path (str): Path of the sqlite database. Created if it doesn't exist.
+        """
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        with self._db:
+            self._db.execute('CREATE TABLE IF NOT EXISTS trials (picker_config TEXT, cube_version TEXT, '
+                             'settings TEXT, seed TEXT, name TEXT, result TEXT, '
+                             'PRIMARY KEY (picker_config, cube_version, settings, seed))')
+
+    def get(self, picker_config, cube_version, settings, seed):
+        """Returns the result of a completed trial, as it was added, or None if the trial hasn't been completed.
+
+        Args:
+            picker_config (str): Hash of the picker configuration, e.g. from picker_config_hash.
+            cube_version (str): Version of the cube, e.g. from deckcache.cube_version.
+            settings (str): Anything else the result depends on, e.g. the number of drafters.
+            seed (str): The trial's random seed.
+        """
+        with self._lock:
+            row = self._db.execute('SELECT result FROM trials WHERE picker_config = ? AND cube_version = ? '
+                                   'AND settings = ? AND seed = ?',
+                                   (picker_config, cube_version, settings, seed)).fetchone()
+        return json.loads(row[0]) if row is not None else None
+
+    def put(self, picker_config, cube_version, settings, seed, result, name=''):
+        """Records a completed trial.
+
+        Args:
+            picker_config (str): Hash of the picker configuration, e.g. from picker_config_hash.
+            cube_version (str): Version of the cube, e.g. from deckcache.cube_version.
+            settings (str): Anything else the result depends on, e.g. the number of drafters.
+            seed (str): The trial's random seed.
+            result (object): JSON-serializable result of the trial.
+            name (str): Optional - name the trial's artifacts were written under.
+        """
+        with self._lock:
+            with self._db:
+                self._db.execute('INSERT OR REPLACE INTO trials VALUES (?, ?, ?, ?, ?, ?)',
+                                 (picker_config, cube_version, settings, seed, str(name), json.dumps(result)))
+
+    def num_trials(self):
+        with self._lock:
+            return self._db.execute('SELECT COUNT(*) FROM trials').fetchone()[0]
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
@@ -0,0 +1,49 @@
+"""Confidence intervals for metrics from simulated drafts, for deciding when enough drafts have been run."""
+
+from collections import namedtuple
+import math
+import statistics
+
+import scipy.stats
+
+
+ConfidenceInterval = namedtuple('ConfidenceInterval', ['mean', 'half_width', 'n'])
+
+
+def confidence_interval(values, confidence=0.95):
+    """Computes a Student's t confidence interval for the mean of independent observations.
+
+    Args:
+        values (List[float]): The observations, e.g. one mean per simulated draft.
+        confidence (float): Confidence level of the interval.
+
+    Returns:
+        ConfidenceInterval: The sample mean, the interval's half width (infinite with fewer than 2 observations)
+            and the number of observations.
+    """
+    n = len(values)
+    mean = statistics.mean(values) if values else math.nan
+    if n < 2:
+        return ConfidenceInterval(mean=mean, half_width=math.inf, n=n)
+
+    t = scipy.stats.t.ppf((1 + confidence) / 2, n - 1)
+    return ConfidenceInterval(mean=mean, half_width=t * statistics.stdev(values) / math.sqrt(n), n=n)
+
+
+def paired_confidence_interval(values, baseline_values, confidence=0.95):
+    """Computes a confidence interval for the mean difference between paired observations, e.g. metrics from the
+    same packs drafted by two different pickers. Pairing removes the variance the two have in common, so the interval
+    is usually much narrower than for the difference of two independent means."""
+    if len(values) != len(baseline_values):
+        raise ValueError('Paired observations must have the same length: {} != {}'.format(
+            len(values), len(baseline_values)))
+    return confidence_interval([v - b for v, b in zip(values, baseline_values)], confidence)
+
+
+def narrower_than(interval, width):
+    """Returns whether the full width of the interval is less than the given width."""
+    return 2 * interval.half_width < width
+
+
+def format_interval(interval, digits=3):
+    return '{:.{d}f} ± {:.{d}f} (n={})'.format(interval.mean, interval.half_width, interval.n, d=digits)
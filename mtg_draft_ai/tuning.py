@@ -0,0 +1,326 @@
+"""Searching for better SynergyPowerFixingPicker weights with simulated drafts.
+
+A configuration is a dict of parameter name -> value, where parameters are '<component>.start' and '<component>.end'
+for components with a LinearProgressWeight, and '<component>.weight' for ones with a ConstantWeight, e.g.
+{'power_delta.start': 2, 'power_delta.end': 1, 'land_fixer.weight': 5, ...}.
+
+Draft i of every configuration is drafted from the same seeded packs, so configurations are compared on the same
+drafts, and each configuration's results for each draft are cached so they're never run twice.
+"""
+
+from collections import namedtuple
+import functools
+import itertools
+import json
+import multiprocessing
+import random
+import sqlite3
+import statistics
+import threading
+
+import toml
+
+from mtg_draft_ai import deckbuild, deckcache, deckscore
+from mtg_draft_ai.api import DraftInfo, Drafter
+from mtg_draft_ai.brains import ConstantWeight, LinearProgressWeight, SynergyPowerFixingPicker, all_common_neighbors
+from mtg_draft_ai.controller import DraftController, create_packs
+
+
+DraftScore = namedtuple('DraftScore', ['num_edges', 'avg_power'])
+
+Evaluation = namedtuple('Evaluation', ['config', 'num_drafts', 'edges', 'power'])
+
+METRICS = ['edges', 'power']
+
+# Values around SynergyPowerFixingPicker's hand-tuned defaults
+DEFAULT_SEARCH_SPACE = {
+    'cards_owned_power.start': [0.5, 1, 2],
+    'cards_owned_power.end': [1, 2, 3],
+    'power_delta.start': [1, 2, 3],
+    'power_delta.end': [0.5, 1, 2],
+    'cards_owned_syn_edges.start': [0.5, 1, 2],
+    'cards_owned_syn_edges.end': [1, 2, 3],
+    'syn_edges_delta.start': [0.5, 1, 2],
+    'syn_edges_delta.end': [1, 2, 3],
+    'common_neighbors_weighted.start': [1, 2, 3],
+    'common_neighbors_weighted.end': [0.5, 1, 2],
+    'land_fixer.weight': [3, 5, 7],
+}
+
+
+def default_config():
+    """Returns the configuration of SynergyPowerFixingPicker's default weights."""
+    config = {}
+    for component, weight in SynergyPowerFixingPicker.DEFAULT_WEIGHTS.items():
+        if isinstance(weight, LinearProgressWeight):
+            config['{}.start'.format(component)] = weight.start
+            config['{}.end'.format(component)] = weight.end
+        else:
+            config['{}.weight'.format(component)] = weight.weight
+    return config
+
+
+def weights_for(config):
+    """Converts a configuration into weights for SynergyPowerFixingPicker.
+
+    Args:
+        config (Dict[str, float]): The configuration. Parameters not included keep their default value.
+
+    Returns:
+        Dict[str, object]: LinearProgressWeight or ConstantWeight, by component name.
+    """
+    unknown = set(config) - set(default_config())
+    if unknown:
+        raise ValueError('Unknown weight parameters: {}'.format(sorted(unknown)))
+
+    params = {**default_config(), **config}
+    weights = {}
+    for component in SynergyPowerFixingPicker.DEFAULT_WEIGHTS:
+        if '{}.weight'.format(component) in params:
+            weights[component] = ConstantWeight(params['{}.weight'.format(component)])
+        else:
+            weights[component] = LinearProgressWeight(start=params['{}.start'.format(component)],
+                                                      end=params['{}.end'.format(component)])
+    return weights
+
+
+def load_search_space(path):
+    """Loads a search space from a TOML file with a table per component, mapping 'start' and 'end' (or 'weight' for
+    constant weights) to lists of candidate values.
+
+    Returns:
+        Dict[str, List[float]]: Candidate values by parameter name, e.g. for sample_configs.
+    """
+    with open(path, 'r') as f:
+        search_space = toml.load(f)
+    return {'{}.{}'.format(component, param): values
+            for component, params in search_space.items() for param, values in params.items()}
+
+
+def sample_configs(search_space, num_configs, rng=random):
+    """Samples distinct configurations from a search space.
+
+    Args:
+        search_space (Dict[str, List[float]]): Candidate values of each parameter to search over. Other parameters
+            keep their default value.
+        num_configs (int): Maximum number of configurations. If the search space has at most this many, every one of
+            them is returned, i.e. a grid search.
+        rng (random.Random): Source of randomness.
+
+    Returns:
+        List[Dict[str, float]]: Full configurations, with every parameter.
+    """
+    params = sorted(search_space)
+    num_combinations = 1
+    for param in params:
+        num_combinations *= len(search_space[param])
+
+    if num_combinations <= num_configs:
+        combinations = list(itertools.product(*[search_space[p] for p in params]))
+    else:
+        combinations = set()
+        while len(combinations) < num_configs:
+            combinations.add(tuple(rng.choice(search_space[p]) for p in params))
+        combinations = sorted(combinations)
+
+    return [{**default_config(), **dict(zip(params, values))} for values in combinations]
+
+
+def config_key(config):
+    return json.dumps(config, sort_keys=True)
+
+
+def changed_params(config):
+    """Returns the parameters of a configuration which differ from the defaults, or 'no changes' if there are none,
+    for printing."""
+    default = default_config()
+    changed = {param: value for param, value in config.items() if value != default[param]}
+    return changed or 'no changes'
+
+
+class ResultCache:
+    """Draft results for each configuration and draft index, in memory and in an optional sqlite database.
+
+    Results depend on the cube and draft settings (seed and table size) too, so those are part of the key. Safe to
+    share between threads.
+    """
+
+    def __init__(self, path=None):
+        """
+        Args:
+            path (str): Optional - path of the sqlite database to persist results in. Created if it doesn't exist.
+        """
+        self._results = {}
+        self._lock = threading.Lock()
+        self._db = None
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            with self._db:
+                self._db.execute('CREATE TABLE IF NOT EXISTS results (cube_version TEXT, settings TEXT, config TEXT, '
+                                 'draft INTEGER, num_edges REAL, avg_power REAL, '
+                                 'PRIMARY KEY (cube_version, settings, config, draft))')
+
+    def get(self, cube_version, settings, config, draft):
+        """Returns the DraftScore for the draft, or None if it isn't cached."""
+        key = (cube_version, settings, config_key(config), draft)
+        with self._lock:
+            if key not in self._results and self._db is not None:
+                row = self._db.execute('SELECT num_edges, avg_power FROM results '
+                                       'WHERE cube_version = ? AND settings = ? AND config = ? AND draft = ?',
+                                       key).fetchone()
+                if row is not None:
+                    self._results[key] = DraftScore(num_edges=row[0], avg_power=row[1])
+            return self._results.get(key)
+
+    def put(self, cube_version, settings, config, draft, score):
+        key = (cube_version, settings, config_key(config), draft)
+        with self._lock:
+            self._results[key] = score
+            if self._db is not None:
+                with self._db:
+                    self._db.execute('INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)',
+                                     key + (score.num_edges, score.avg_power))
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+
+class WeightTuner:
+    """Evaluates configurations with simulated drafts, where every drafter uses the configuration's weights."""
+
+    def __init__(self, card_list, seed=0, cache=None, executor=None, num_drafters=8, num_phases=3,
+                 cards_per_pack=15):
+        """
+        Args:
+            card_list (List[Card]): Every card in the cube.
+            seed (int): Random seed. Draft i is the same for every configuration with the same seed.
+            cache (ResultCache): Optional - cache of draft results. An in-memory cache is used if not provided.
+            executor (multiprocessing.pool.Pool): Optional - process pool to run drafts on, which must have been
+                created with init_worker as its initializer, e.g. by create_executor. Drafts run serially in this
+                process if not provided.
+            num_drafters (int): Number of drafters in each draft.
+            num_phases (int): Number of packs per drafter.
+            cards_per_pack (int): Number of cards in each pack.
+        """
+        self.card_list = card_list
+        self.seed = seed
+        self.cache = cache or ResultCache()
+        self.executor = executor
+
+        self._cube_version = deckcache.cube_version(card_list)
+        self._settings = '{}/{}x{}x{}'.format(seed, num_drafters, num_phases, cards_per_pack)
+        self._draft_fn = functools.partial(_run_draft, seed=seed, num_drafters=num_drafters, num_phases=num_phases,
+                                           cards_per_pack=cards_per_pack)
+
+    def evaluate(self, configs, num_drafts):
+        """Scores each configuration over drafts 0 to num_drafts - 1, only running drafts which aren't cached.
+
+        Args:
+            configs (List[Dict[str, float]]): Configurations to evaluate.
+            num_drafts (int): Number of drafts to evaluate each configuration with.
+
+        Returns:
+            List[Evaluation]: Mean # of edges and mean avg deck power over each configuration's drafts, in the same
+                order as configs.
+        """
+        jobs = [(config, draft) for config in configs for draft in range(0, num_drafts)
+                if self.cache.get(self._cube_version, self._settings, config, draft) is None]
+
+        if self.executor is None:
+            if jobs:
+                init_worker(self.card_list)
+            results = map(self._draft_fn, jobs)
+        else:
+            results = self.executor.map(self._draft_fn, jobs)
+        for (config, draft), score in zip(jobs, results):
+            self.cache.put(self._cube_version, self._settings, config, draft, score)
+
+        evaluations = []
+        for config in configs:
+            scores = [self.cache.get(self._cube_version, self._settings, config, draft)
+                      for draft in range(0, num_drafts)]
+            evaluations.append(Evaluation(config=config, num_drafts=num_drafts,
+                                          edges=statistics.mean(s.num_edges for s in scores),
+                                          power=statistics.mean(s.avg_power for s in scores)))
+        return evaluations
+
+    def successive_halving(self, configs, min_drafts, max_drafts, metric='edges', eta=3, callback=None):
+        """Evaluates every configuration with a few drafts, then only the best 1/eta of them with eta times as many
+        drafts, and so on until max_drafts, so bad configurations are abandoned early. With min_drafts equal to
+        max_drafts, this is plain random (or grid) search.
+
+        Args:
+            configs (List[Dict[str, float]]): Configurations to evaluate.
+            min_drafts (int): Number of drafts to evaluate every configuration with.
+            max_drafts (int): Maximum number of drafts to evaluate a configuration with.
+            metric (str): Metric to maximize, one of METRICS.
+            eta (int): Factor by which the number of configurations shrinks, and the number of drafts grows, in each
+                round. At least 2.
+            callback (function): Optional - called with the number of drafts and the sorted evaluations after each
+                round.
+
+        Returns:
+            List[Evaluation]: Evaluations from the final round, best first.
+        """
+        if metric not in METRICS:
+            raise ValueError('Unknown metric {}, expected one of {}'.format(metric, METRICS))
+        if eta < 2:
+            raise ValueError('eta must be at least 2, but got {}'.format(eta))
+
+        num_drafts = min(min_drafts, max_drafts)
+        while True:
+            evaluations = sorted(self.evaluate(configs, num_drafts), key=lambda e: getattr(e, metric), reverse=True)
+            if callback:
+                callback(num_drafts, evaluations)
+            if num_drafts >= max_drafts or len(evaluations) <= 1:
+                return evaluations
+
+            configs = [e.config for e in evaluations[:max(1, len(evaluations) // eta)]]
+            num_drafts = min(num_drafts * eta, max_drafts)
+
+
+def create_executor(card_list, max_workers=None):
+    """Creates a process pool for WeightTuner, whose workers each compute the cube's common neighbors once."""
+    # A multiprocessing pool rather than a ProcessPoolExecutor, whose initializer needs Python 3.7
+    return multiprocessing.Pool(processes=max_workers, initializer=init_worker, initargs=(card_list,))
+
+
+# Per-process state, set by init_worker, since common neighbors are slow to compute
+_worker_state = {}
+
+
+def init_worker(card_list):
+    if _worker_state.get('card_list') is card_list:
+        return
+    _worker_state['card_list'] = card_list
+    _worker_state['common_neighbors'] = all_common_neighbors(card_list)
+    _worker_state['scorer'] = deckscore.DeckScorer(card_list)
+
+
+def _run_draft(job, seed, num_drafters, num_phases, cards_per_pack):
+    config, draft = job
+    weights = weights_for(config)
+    draft_info = DraftInfo(card_list=_worker_state['card_list'], num_drafters=num_drafters, num_phases=num_phases,
+                           cards_per_pack=cards_per_pack)
+
+    # Seeding by draft index gives every configuration the same packs
+    random.seed('{}-{}'.format(seed, draft))
+    packs = create_packs(draft_info)
+    drafters = [Drafter(SynergyPowerFixingPicker(_worker_state['common_neighbors'], weights=weights), draft_info)
+                for _ in range(0, draft_info.num_drafters)]
+    DraftController(draft_info=draft_info, drafters=drafters, packs=packs, debug=False).run_draft()
+
+    # Pools which can't be built count as decks with no edges and no power, since they're a sign of bad weights
+    scorer = _worker_state['scorer']
+    deck_ids = []
+    for drafter in drafters:
+        try:
+            deck_ids.append(scorer.card_ids(deckbuild.best_two_color_synergy_build(drafter.cards_owned, prune=True)))
+        except deckbuild.DeckbuildError:
+            pass
+    scores = scorer.score(deck_ids)
+
+    return DraftScore(num_edges=float(scores.num_edges.sum()) / draft_info.num_drafters,
+                      avg_power=float(scores.avg_power.sum()) / draft_info.num_drafters)
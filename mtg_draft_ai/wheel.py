@@ -0,0 +1,111 @@
+"""Estimates which cards in a pack will come back around the table ("wheel")."""
+
+import math
+import random
+
+from mtg_draft_ai.brains import TwoColorComboRatingsPicker
+
+
+# Temperature used to add noise to picks made on behalf of human drafters, whose picks we can only
+# approximate with the bot's ratings. Ratings are in [0, 1], so 0.1 makes a card rated 0.1 lower ~2.7x less likely.
+HUMAN_TEMPERATURE = 0.1
+
+
+class SeatModel:
+    """Models the picks a drafter further along the table would make from the pack."""
+
+    def __init__(self, picker, cards_owned, draft_info, temperature=None):
+        """
+        Args:
+            picker (Picker): Picker used to model this drafter's picks.
+            cards_owned (List[Card]): Cards the drafter already owns.
+            draft_info (DraftInfo): Information about the draft configuration.
+            temperature (float): If None, the drafter always takes the highest rated card. Otherwise picks are sampled
+                with probability proportional to exp(rating / temperature).
+        """
+        self.picker = picker
+        self.cards_owned = cards_owned
+        self.draft_info = draft_info
+        self.temperature = temperature
+
+        self._full_pack_ratings = None
+
+    def pick(self, pack, rng):
+        """Picks a card out of pack, which must be a subset of the last pack passed to prepare.
+
+        Args:
+            pack (List[Card]): Cards remaining in the pack.
+            rng (random.Random): Source of randomness for noisy picks.
+
+        Returns:
+            Card: The modeled pick.
+        """
+        if not isinstance(self.picker, TwoColorComboRatingsPicker):
+            return self.picker.pick(pack=pack.copy(), cards_owned=self.cards_owned.copy(), draft_info=self.draft_info)
+
+        # Raw components don't depend on the other cards in the pack, only normalization does. Renormalizing for every
+        # subset of the pack the simulations reach is too slow to do on a page load, so the ratings for the full pack
+        # are reused for every subset, which only changes the order of cards when the best card for a component is gone.
+        remaining = set(pack)
+        ratings = [(card, rating) for card, rating in self._full_pack_ratings if card in remaining]
+        if not ratings:
+            return pack[0]
+        if self.temperature is None:
+            return ratings[0][0]
+
+        best_rating = ratings[0][1]
+        weights = [math.exp((rating - best_rating) / self.temperature) for _, rating in ratings]
+        return rng.choices([card for card, _ in ratings], weights=weights)[0]
+
+    def prepare(self, pack):
+        """Rates every card in the full pack once, before any simulated picks are made from it."""
+        if isinstance(self.picker, TwoColorComboRatingsPicker):
+            rated = self.picker.ratings(pack, self.cards_owned, self.draft_info)
+
+            # Keep only the best color combo's rating for each card, in order from best to worst
+            best_by_card = {}
+            for rated_card in rated:
+                best_by_card.setdefault(rated_card.card, rated_card.rating)
+            self._full_pack_ratings = list(best_by_card.items())
+
+
+def wheel_probabilities(pack, downstream_seats, num_simulations=200, rng=None):
+    """Estimates the probability that each card in the pack comes back to the current drafter.
+
+    Runs a batch of Monte Carlo simulations of the current drafter's pick followed by the picks of every other seat
+    the pack will be passed to. Each card's probability is conditioned on the current drafter not taking it.
+
+    Args:
+        pack (List[Card]): The pack the current drafter is picking from.
+        downstream_seats (List[SeatModel]): Models for the drafters who see the pack next, in passing order.
+        num_simulations (int): Number of simulated passes around the table.
+        rng (random.Random): Optional - source of randomness, for reproducible estimates.
+
+    Returns:
+        Dict[Card, float]: Estimated wheel probability for each card in the pack.
+    """
+    rng = rng or random.Random()
+
+    # The pack only comes back if there are cards left after every drafter at the table takes one.
+    if len(pack) <= len(downstream_seats) + 1:
+        return {card: 0.0 for card in pack}
+
+    for seat in downstream_seats:
+        seat.prepare(pack)
+
+    wheeled_counts = {card: 0 for card in pack}
+    not_picked_counts = {card: 0 for card in pack}
+    for _ in range(0, num_simulations):
+        remaining = pack.copy()
+        remaining.remove(rng.choice(pack))
+        for card in remaining:
+            not_picked_counts[card] += 1
+
+        for seat in downstream_seats:
+            remaining.remove(seat.pick(remaining, rng))
+
+        for card in remaining:
+            wheeled_counts[card] += 1
+
+    return {card: wheeled_counts[card] / not_picked_counts[card] if not_picked_counts[card] else 0.0
+            for card in pack}
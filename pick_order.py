@@ -0,0 +1,26 @@
+import argparse
+
+from mtg_draft_ai.pickstats import PickOrderIndex
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Updates a pick order index from draft logs and prints card rankings.')
+    parser.add_argument('logs', type=str, help='Draft log file, or directory of draft logs (e.g. trials output)')
+    parser.add_argument('-i', '--index-file', type=str, help='Index file to update', default='output/pick_order.npz')
+    parser.add_argument('-p', '--processes', type=int, help='Number of processes to read logs with', default=None)
+    parser.add_argument('--top', type=int, help='Number of cards to print', default=50)
+
+    args = parser.parse_args()
+
+    index = PickOrderIndex.load(args.index_file)
+    num_new_logs = index.add_logs(args.logs, processes=args.processes)
+    index.save(args.index_file)
+    print('Indexed {} new logs; {} sources indexed in total'.format(num_new_logs, len(index.sources)))
+
+    for name, average_pick, times_taken, times_passed in index.rankings()[:args.top]:
+        print('{}: average pick {:.2f}, taken {} times, passed {} times'.format(
+            name, average_pick + 1, times_taken, times_passed))
+
+
+if __name__ == '__main__':
+    main()
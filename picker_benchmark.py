@@ -0,0 +1,73 @@
+import argparse
+import json
+import platform
+import sys
+import time
+
+from mtg_draft_ai import pickbench
+from mtg_draft_ai.api import read_cube_toml
+from mtg_draft_ai.brains import PICKERS
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Replays recorded pick states through a picker and reports throughput, latency and memory.')
+    parser.add_argument('corpus', type=str,
+                        help='Path to a draft log, or a directory of draft logs, e.g. from the website\'s '
+                             'export_replay_corpus command')
+    parser.add_argument('--picker', choices=sorted(PICKERS.keys()), default='SynergyPowerFixingPicker',
+                        help='Picker to benchmark')
+    parser.add_argument('--card-data', type=str, help='Card data TOML file', default='cube_81183_tag_data.toml')
+    parser.add_argument('--fixer-data', type=str, help='Fixer data TOML file', default='cube_81183_fixer_data.toml')
+    parser.add_argument('--limit', type=int, default=None, help='Only replay the first N picks of the corpus')
+    parser.add_argument('--repeat', type=int, default=1, help='Number of times to replay every pick')
+    parser.add_argument('--no-memory', action='store_true', help='Skip the peak memory measurement pass')
+    parser.add_argument('--json', type=str, default=None,
+                        help='File to write the results to as JSON, or - for stdout')
+    parser.add_argument('--baseline', type=str, default=None,
+                        help='JSON results from an earlier run to compare against')
+
+    args = parser.parse_args()
+
+    cube_list = read_cube_toml(args.card_data, args.fixer_data)
+    picks = pickbench.load_corpus(args.corpus, cube_list)[:args.limit]
+
+    start = time.perf_counter()
+    picker = PICKERS[args.picker].factory(cube_list).create()
+    setup_seconds = time.perf_counter() - start
+
+    benchmark = pickbench.benchmark_picker(picker, picks, repeat=args.repeat, measure_memory=not args.no_memory)
+    result = {
+        'picker': args.picker,
+        'corpus': args.corpus,
+        'repeat': args.repeat,
+        'setup_seconds': setup_seconds,
+        **benchmark._asdict(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+    }
+
+    # Keep stdout machine-readable when the JSON goes there
+    out = sys.stderr if args.json == '-' else sys.stdout
+    print('{}: {} picks, {:.1f} picks/s, latency p50 {:.2f}ms, p95 {:.2f}ms, p99 {:.2f}ms, max {:.2f}ms'.format(
+        args.picker, benchmark.num_picks, benchmark.picks_per_second, benchmark.p50_ms, benchmark.p95_ms,
+        benchmark.p99_ms, benchmark.max_ms), file=out)
+    if benchmark.peak_memory_bytes is not None:
+        print('Peak traced memory: {:.2f} MiB'.format(benchmark.peak_memory_bytes / 2 ** 20), file=out)
+
+    if args.baseline:
+        with open(args.baseline, 'r') as f:
+            baseline = json.load(f)
+        for metric, change in pickbench.relative_changes(result, baseline).items():
+            print('{}: {:+.1%} vs baseline'.format(metric, change), file=out)
+
+    if args.json == '-':
+        json.dump(result, sys.stdout, indent=2)
+        print()
+    elif args.json:
+        with open(args.json, 'w') as f:
+            json.dump(result, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
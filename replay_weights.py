@@ -0,0 +1,59 @@
+import argparse
+import random
+import time
+
+from mtg_draft_ai import deckcache, replay, tuning
+from mtg_draft_ai.api import read_cube_toml
+from mtg_draft_ai.brains import SynergyPowerFixingPicker
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Scores many SynergyPowerFixingPicker weight configurations by how often they would make the '
+                    'same picks as recorded in draft logs.')
+    parser.add_argument('logs', type=str, help='Path to a draft log, or a directory of draft logs')
+    parser.add_argument('-n', '--num-configs', type=int, default=500,
+                        help='Number of configurations to sample. The whole grid is used if it\'s smaller')
+    parser.add_argument('--search-space', type=str, default=None,
+                        help='TOML file with a table per component, mapping "start" and "end" (or "weight" for '
+                             'constant weights) to lists of candidate values')
+    parser.add_argument('--card-data', type=str, help='Card data TOML file', default='cube_81183_tag_data.toml')
+    parser.add_argument('--fixer-data', type=str, help='Fixer data TOML file', default='cube_81183_fixer_data.toml')
+    parser.add_argument('--corpus', type=str, default='output/replay_components.npz',
+                        help='File to cache the rating components of every logged pick in')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed for sampling configurations')
+    parser.add_argument('--top', type=int, default=10, help='Number of configurations to print')
+
+    args = parser.parse_args()
+
+    cube_list = read_cube_toml(args.card_data, args.fixer_data)
+    picker = SynergyPowerFixingPicker.factory(cube_list).create()
+    component_names = [cr.name() for cr in picker.component_raters]
+    fingerprint = 'SynergyPowerFixingPicker:{}'.format(deckcache.cube_version(cube_list))
+
+    start = time.perf_counter()
+    corpus = replay.ComponentCorpus.load(args.corpus, component_names, fingerprint)
+    num_added = corpus.add_logs(args.logs, cube_list, picker)
+    corpus.save(args.corpus)
+    print('Computed components for {} new logs in {:.1f}s; {} picks in total'.format(
+        num_added, time.perf_counter() - start, corpus.num_picks))
+
+    search_space = tuning.load_search_space(args.search_space) if args.search_space else tuning.DEFAULT_SEARCH_SPACE
+    configs = tuning.sample_configs(search_space, args.num_configs, random.Random(args.seed))
+    if tuning.default_config() not in configs:
+        configs.append(tuning.default_config())
+
+    start = time.perf_counter()
+    agreement = corpus.agreement([tuning.weights_for(c) for c in configs])
+    print('Scored {} configurations in {:.2f}s'.format(len(configs), time.perf_counter() - start))
+
+    ranked = sorted(zip(agreement, configs), key=lambda pair: pair[0], reverse=True)
+    for rank, (config_agreement, config) in enumerate(ranked):
+        is_default = config == tuning.default_config()
+        if rank < args.top or is_default:
+            print('{}. agreement {:.2%}{}: {}'.format(rank + 1, config_agreement, ' (default)' if is_default else '',
+                                                      tuning.changed_params(config)))
+
+
+if __name__ == '__main__':
+    main()
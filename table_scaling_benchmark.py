@@ -0,0 +1,176 @@
+import argparse
+import csv
+import itertools
+import random
+import time
+
+from mtg_draft_ai import deckbuild, scalebench, synthcube
+from mtg_draft_ai.api import DraftInfo, Drafter, Picker, read_cube_toml
+from mtg_draft_ai.brains import PICKERS
+from mtg_draft_ai.controller import DraftController
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Measures controller, picker and deckbuild throughput and memory over a matrix of table sizes '
+                    'and pack sizes, and flags anything which grows faster than the number of cards drafted.')
+    parser.add_argument('--drafters', type=int, nargs='+', default=[6, 8, 12, 16], help='Numbers of drafters')
+    parser.add_argument('--phases', type=int, nargs='+', default=[3], help='Numbers of packs per drafter')
+    parser.add_argument('--pack-sizes', type=int, nargs='+', default=[15, 20], help='Numbers of cards per pack')
+    parser.add_argument('--picker', choices=sorted(PICKERS.keys()), default='SynergyPowerFixingPicker',
+                        help='Picker to measure')
+    parser.add_argument('--card-data', type=str, default=None,
+                        help='Card data TOML file. Defaults to a synthetic cube big enough for the largest draft')
+    parser.add_argument('--fixer-data', type=str, default=None, help='Fixer data TOML file')
+    parser.add_argument('--no-memory', action='store_true', help='Skip the peak memory measurements')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='Number of timed runs of each stage, after a warm-up run. The fastest is reported')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed for the cube and packs')
+    parser.add_argument('--csv', type=str, default='output/table_scaling.csv', help='CSV file to write results to')
+
+    args = parser.parse_args()
+
+    configs = list(itertools.product(args.drafters, args.phases, args.pack_sizes))
+    if args.card_data:
+        cube_list = read_cube_toml(args.card_data, args.fixer_data)
+    else:
+        cards, fixers = synthcube.generate_cube(max(d * p * c for d, p, c in configs), seed=args.seed)
+        cube_list = synthcube.cube_list(cards, fixers)
+
+    start = time.perf_counter()
+    picker_factory = PICKERS[args.picker].factory(cube_list)
+    print('Created {} factory for {} cards in {:.1f}s'.format(args.picker, len(cube_list),
+                                                             time.perf_counter() - start))
+
+    rows = []
+    measurements = []
+    for num_drafters, num_phases, cards_per_pack in configs:
+        draft_info = DraftInfo(card_list=cube_list, num_drafters=num_drafters, num_phases=num_phases,
+                               cards_per_pack=cards_per_pack)
+        total_picks = draft_info.num_cards_in_draft()
+        measure_memory = not args.no_memory
+
+        # Controller overhead alone, with pickers that do no work
+        seconds, peak_memory = scalebench.measure(
+            lambda: _run_draft(draft_info, lambda: _FirstCardPicker(), args.seed), measure_memory, args.repeat)
+        rows.append(_row('controller', draft_info, seconds, total_picks, peak_memory))
+
+        # The picker's own time only, from the fastest time of every pick, and the whole draft's peak memory
+        drafters, pick_times = _time_picks(draft_info, picker_factory, args.seed, args.repeat)
+        peak_memory = None
+        if measure_memory:
+            _, peak_memory = scalebench.measure(lambda: _run_draft(draft_info, picker_factory.create, args.seed),
+                                                repeat=0, warmup=0)
+        rows.append(_row('picker', draft_info, sum(s for _, s in pick_times), total_picks, peak_memory))
+
+        seconds, peak_memory = scalebench.measure(lambda: _build_pools(drafters), measure_memory, args.repeat)
+        rows.append(_row('deckbuild', draft_info, seconds, num_drafters, peak_memory))
+
+        # How the picker's time per pick grows with the number of cards already picked
+        pool_size_exponent = scalebench.scaling_exponent(*_mean_by_pool_size(pick_times))
+        for row in rows[-3:]:
+            row['pick_time_vs_pool_size_exponent'] = pool_size_exponent
+            measurements.append(scalebench.Measurement(path=row['stage'], size=total_picks, seconds=row['seconds'],
+                                                       peak_memory_bytes=row['peak_memory_bytes']))
+
+        print('{} drafters x {} packs x {} cards: {}; pick time ~ pool size^{:.2f}'.format(
+            num_drafters, num_phases, cards_per_pack,
+            ', '.join('{} {:.1f}/s{}'.format(row['stage'], row['per_second'], _format_memory(row))
+                      for row in rows[-3:]),
+            pool_size_exponent or 0))
+
+    for stage, metric, exponent in scalebench.superlinear_paths(measurements):
+        print('WARNING: {} {} grows super-linearly with the number of cards drafted (~cards^{:.2f})'.format(
+            stage, metric, exponent))
+    exponents = [row['pick_time_vs_pool_size_exponent'] for row in rows if row['stage'] == 'picker']
+    if any(e is not None and e > 1.2 for e in exponents):
+        print('WARNING: {} time per pick grows super-linearly with pool size (~pool size^{:.2f})'.format(
+            args.picker, max(e for e in exponents if e is not None)))
+
+    with open(args.csv, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
+        writer.writeheader()
+        writer.writerows(rows)
+    print('Results written to {}'.format(args.csv))
+
+
+class _FirstCardPicker(Picker):
+
+    def pick(self, pack, cards_owned, draft_info):
+        return pack[0]
+
+
+class _TimedPicker(Picker):
+    """Records the pool size and time taken for every pick of the wrapped picker."""
+
+    def __init__(self, picker):
+        self.picker = picker
+        self.pick_times = []
+
+    def pick(self, pack, cards_owned, draft_info):
+        start = time.perf_counter()
+        picked = self.picker.pick(pack, cards_owned, draft_info)
+        self.pick_times.append((len(cards_owned), time.perf_counter() - start))
+        return picked
+
+
+def _run_draft(draft_info, create_picker, seed):
+    random.seed(seed)
+    drafters = [Drafter(create_picker(), draft_info) for _ in range(0, draft_info.num_drafters)]
+    DraftController.create(draft_info, drafters, debug=False).run_draft()
+    return drafters
+
+
+def _time_picks(draft_info, picker_factory, seed, repeat):
+    """Runs the draft with timed pickers once to warm up, then repeat more times.
+
+    Returns:
+        Tuple[List[Drafter], List[Tuple[int, float]]]: The drafters of the last run, and the pool size and fastest
+            time of every pick. Every run makes the same picks, since the packs are dealt from the same seed.
+    """
+    runs = []
+    for _ in range(0, repeat + 1):
+        drafters = _run_draft(draft_info, lambda: _TimedPicker(picker_factory.create()), seed)
+        runs.append([t for d in drafters for t in d.picker.pick_times])
+    pick_times = [(picks[0][0], min(seconds for _, seconds in picks)) for picks in zip(*runs[1:])]
+    return drafters, pick_times
+
+
+def _build_pools(drafters):
+    for drafter in drafters:
+        try:
+            deckbuild.best_two_color_synergy_build(drafter.cards_owned, prune=True)
+        except deckbuild.DeckbuildError:
+            pass
+
+
+def _mean_by_pool_size(pick_times):
+    """Returns pool sizes and the mean time of picks made with each, skipping the first pick's empty pool."""
+    times_by_pool_size = {}
+    for pool_size, seconds in pick_times:
+        if pool_size > 0:
+            times_by_pool_size.setdefault(pool_size, []).append(seconds)
+    pool_sizes = sorted(times_by_pool_size)
+    return pool_sizes, [sum(times_by_pool_size[s]) / len(times_by_pool_size[s]) for s in pool_sizes]
+
+
+def _row(stage, draft_info, seconds, num_items, peak_memory):
+    return {
+        'stage': stage,
+        'num_drafters': draft_info.num_drafters,
+        'num_phases': draft_info.num_phases,
+        'cards_per_pack': draft_info.cards_per_pack,
+        'cards_drafted': draft_info.num_cards_in_draft(),
+        'seconds': seconds,
+        # Picks per second for the controller and picker, pools built per second for deckbuild
+        'per_second': num_items / seconds if seconds > 0 else float('nan'),
+        'peak_memory_bytes': peak_memory,
+    }
+
+
+def _format_memory(row):
+    return '' if row['peak_memory_bytes'] is None else ' ({:.1f} MiB)'.format(row['peak_memory_bytes'] / 2 ** 20)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,34 @@
+import os
+import networkx as nx
+import pytest
+from mtg_draft_ai import communities, synergy
+from mtg_draft_ai.controller import read_cube_toml
+from .. import TEST_DATA_DIR
+
+
+@pytest.fixture
+def synergy_graph():
+    cube_list = read_cube_toml(os.path.join(TEST_DATA_DIR, 'cube_81183_tag_data.toml'))
+    return synergy.create_graph(cube_list[:120], remove_isolated=False)
+
+
+@pytest.mark.parametrize('backend', communities.BACKENDS.keys())
+def test_backends_partition_graph(synergy_graph, backend):
+    result = communities.BACKENDS[backend](synergy_graph)
+
+    assert sum(len(c) for c in result) == len(synergy_graph)
+    assert set().union(*result) == set(synergy_graph.nodes)
+
+
+# Two 5-cliques joined by a single edge
+def test_louvain_communities():
+    graph = nx.complement(nx.complete_multipartite_graph(5, 5))
+    graph.add_edge(0, 5)
+
+    assert sorted(sorted(c) for c in communities.louvain_communities(graph)) == [[0, 1, 2, 3, 4], [5, 6, 7, 8, 9]]
+
+
+def test_louvain_communities_no_edges():
+    graph = nx.empty_graph(3)
+
+    assert communities.louvain_communities(graph) == [frozenset([0]), frozenset([1]), frozenset([2])]
@@ -1,7 +1,9 @@
+from concurrent.futures import ProcessPoolExecutor
 import os
 import pytest
 import mock
-from mtg_draft_ai import deckbuild, synergy
+import networkx as nx
+from mtg_draft_ai import communities, deckbuild, synergy
 from mtg_draft_ai.controller import read_cube_toml
 from .. import TEST_DATA_DIR
 
@@ -37,6 +39,14 @@ def test_deckbuild(pool):
     assert deck == ur_cards_in_deck
 
 
+@pytest.mark.parametrize('community_backend', communities.BACKENDS.keys())
+def test_deckbuild_community_backends(pool, community_backend):
+    deck = deckbuild.best_two_color_synergy_build(pool, community_backend=community_backend)
+
+    assert len(deck) == deckbuild._NONLANDS_IN_DECK_DEFAULT
+    assert all(synergy.castable(c, 'UR') for c in deck)
+
+
 # Verifies that deckbuild will succeed even if there aren't enough playables in any color combination, and that it will
 # do a build for the color combination with the most playables in that case.
 def test_deckbuild_short_on_playables(cards_by_name):
@@ -58,3 +68,189 @@ def test_deckbuild_each_color_pair_tried(pool):
     deckbuild.best_two_color_synergy_build(pool, build_fn=build_fn)
 
     assert build_fn.call_count == 40
+
+
+# Checks each swap the engine finds against the synergy graph of the build after making it.
+def test_swap_engine(pool):
+    graph = synergy.create_graph(pool, remove_isolated=False)
+    nonlands = [c for c in pool if 'land' not in c.types]
+    build, leftovers = nonlands[:deckbuild._NONLANDS_IN_DECK_DEFAULT], nonlands[deckbuild._NONLANDS_IN_DECK_DEFAULT:]
+    engine = deckbuild._SwapEngine(graph, list(build))
+
+    for _ in range(0, 3):
+        card_swap = engine.best_swap(leftovers)
+        edges_before = len(graph.subgraph(engine.build).edges)
+        engine.swap(card_swap.card_to_remove, card_swap.card_to_add)
+        leftovers.remove(card_swap.card_to_add)
+
+        assert len(graph.subgraph(engine.build).edges) - edges_before == card_swap.improvement
+
+
+def _brute_force_best_swap(engine, candidates_to_add, candidates_to_remove):
+    best = None
+    for card in [c for c in candidates_to_add if 'land' not in c.types]:
+        worst_card = max([c for c in candidates_to_remove if 'land' not in c.types],
+                         key=lambda c: engine.improvement(c, card))
+        improvement = engine.improvement(worst_card, card)
+        if best is None or improvement > best.improvement:
+            best = deckbuild._CardSwap(card_to_remove=worst_card, card_to_add=card, improvement=improvement)
+    return best
+
+
+# Checking only the build's lowest-degree cards finds the same swaps, ties included, as checking every pair.
+def test_swap_engine_matches_brute_force(pool):
+    graph = synergy.create_graph(pool, remove_isolated=False)
+    build, leftovers = pool[:deckbuild._NONLANDS_IN_DECK_DEFAULT], pool[deckbuild._NONLANDS_IN_DECK_DEFAULT:]
+    engine = deckbuild._SwapEngine(graph, list(build))
+
+    for i in range(0, 10):
+        restricted = engine.build[i % 3::3]
+        assert engine.best_swap(leftovers, restricted) == _brute_force_best_swap(engine, leftovers, restricted)
+
+        card_swap = engine.best_swap(leftovers)
+        assert card_swap == _brute_force_best_swap(engine, leftovers, engine.build)
+        engine.swap(card_swap.card_to_remove, card_swap.card_to_add)
+        leftovers.remove(card_swap.card_to_add)
+
+
+# Building color combinations in worker processes gives the same results as building them serially.
+def test_color_combination_builds_executor(pool):
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        parallel_results = deckbuild.color_combination_builds(pool, executor=executor)
+    serial_results = deckbuild.color_combination_builds(pool)
+
+    assert len(serial_results) == 40
+    assert [(r.main_colors, r.splash_colors, r.num_edges, r.error) for r in parallel_results] == \
+        [(r.main_colors, r.splash_colors, r.num_edges, r.error) for r in serial_results]
+    assert any(r.error for r in serial_results)
+
+
+# Pruning skips color combinations that can't beat the best build, without changing which build is best.
+def test_color_combination_builds_prune(pool):
+    exhaustive_results = deckbuild.color_combination_builds(pool)
+    pruned_results = deckbuild.color_combination_builds(pool, prune=True)
+
+    assert any(r.skipped for r in pruned_results)
+    assert not any(r.skipped for r in exhaustive_results)
+    for pruned, exhaustive in zip(pruned_results, exhaustive_results):
+        if not pruned.skipped:
+            assert pruned == exhaustive
+    assert deckbuild.best_two_color_synergy_build(pool, prune=True) == deckbuild.best_two_color_synergy_build(pool)
+
+
+# Pruning between batches of concurrent builds skips fewer combinations, but finds the same best build.
+def test_color_combination_builds_prune_batches(pool):
+    serial_results = deckbuild.color_combination_builds(pool, prune=True)
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        batched_results = deckbuild.color_combination_builds(pool, executor=executor, prune=True, batch_size=4)
+
+    def best_edges(results):
+        return max(r.num_edges for r in results if r.error is None and not r.skipped)
+    assert best_edges(batched_results) == best_edges(serial_results)
+    assert len([r for r in batched_results if r.skipped]) <= len([r for r in serial_results if r.skipped])
+
+
+# Every failed and skipped color combination is reported, with a summary of how many there were.
+@pytest.mark.parametrize('prune', [False, True])
+def test_format_build_results(pool, prune):
+    results = []
+    deckbuild.best_two_color_synergy_build(pool, prune=prune, on_results=results.extend)
+    num_failed = len([r for r in results if r.error is not None])
+    num_skipped = len([r for r in results if r.skipped])
+
+    lines = deckbuild.format_build_results(results).splitlines()
+
+    assert len(results) == 40
+    assert (num_skipped > 0) == prune
+    assert len([line for line in lines if line.startswith('Failed to build')]) == num_failed
+    assert len([line for line in lines if line.startswith('Skipped')]) == num_skipped
+    assert lines[-1] == 'Built {} of 40 color combos, {} failed, {} skipped'.format(
+        40 - num_failed - num_skipped, num_failed, num_skipped)
+
+
+# The bound is never below the number of edges in the deck actually built for a color combination.
+def test_edges_upper_bound(pool):
+    graph = synergy.create_graph(pool, remove_isolated=False)
+    for result in deckbuild.color_combination_builds(pool):
+        if result.error is None:
+            subgraph = graph.subgraph(deckbuild._relevant_cards(pool, result.main_colors, result.splash_colors))
+            assert deckbuild._edges_upper_bound(subgraph) >= result.num_edges
+
+
+# Unlike a subgraph view, whose order for small subgraphs depends on PYTHONHASHSEED, nodes keep the given order.
+def test_ordered_subgraph(pool):
+    graph = synergy.create_graph(pool, remove_isolated=False)
+    cards = list(reversed(deckbuild._relevant_cards(pool, 'UR', [])))
+
+    subgraph = deckbuild._ordered_subgraph(graph, cards)
+
+    assert list(subgraph.nodes) == cards
+    assert set(map(frozenset, subgraph.edges)) == set(map(frozenset, graph.subgraph(cards).edges))
+    assert nx.is_frozen(subgraph)
+
+
+# Incremental community scores match the edges added to a freshly built graph, per card in the community.
+def test_community_scorer(pool):
+    graph = synergy.create_graph(pool, remove_isolated=False)
+    communities = nx.algorithms.community.greedy_modularity_communities(graph)
+    build = list(communities[0])
+    scorer = deckbuild._CommunityScorer(graph, build)
+
+    build_graph = synergy.create_graph(build, remove_isolated=False)
+    for comm in communities[1:]:
+        graph_with_comm = synergy.create_graph(build + list(comm), remove_isolated=False)
+        edges_added = len(graph_with_comm.edges) - len(build_graph.edges)
+        assert scorer.score(comm) == edges_added / len(comm)
+
+
+def test_communities_cached(pool):
+    graph = synergy.create_graph(pool, remove_isolated=False)
+    communities = deckbuild._communities(graph)
+
+    with mock.patch('networkx.algorithms.community.greedy_modularity_communities') as greedy_modularity_communities:
+        # A different graph object with the same cards
+        assert deckbuild._communities(synergy.create_graph(pool, remove_isolated=False)) == communities
+        greedy_modularity_communities.assert_not_called()
+
+
+# Local search never does worse than the community-based build it starts from, and keeps decks the same size.
+def test_local_search_build(pool):
+    graph = synergy.create_graph(pool, remove_isolated=False)
+    on_color_subgraph = graph.subgraph(deckbuild._relevant_cards(pool, 'UR', ['G']))
+
+    communities_deck = deckbuild._communities_build(on_color_subgraph, 'UR', ['G'])
+    local_search_deck = deckbuild.local_search_build(on_color_subgraph, 'UR', ['G'], time_budget=60,
+                                                     max_iterations=50)
+
+    assert deckbuild._num_nonlands(local_search_deck) == deckbuild._NONLANDS_IN_DECK_DEFAULT
+    assert set(local_search_deck) <= set(on_color_subgraph.nodes)
+    assert len(graph.subgraph(local_search_deck).edges) >= len(graph.subgraph(communities_deck).edges)
+
+
+def test_local_search_build_no_time(pool):
+    graph = synergy.create_graph(pool, remove_isolated=False)
+    on_color_subgraph = graph.subgraph(deckbuild._relevant_cards(pool, 'UR', []))
+
+    local_search_deck = deckbuild.local_search_build(on_color_subgraph, 'UR', [], time_budget=0)
+    communities_deck = deckbuild._communities_build(on_color_subgraph, 'UR')
+
+    assert len(graph.subgraph(local_search_deck).edges) == len(graph.subgraph(communities_deck).edges)
+
+
+# _communities_build can add a land fixer twice, when it was in a community too. With no nonland leftovers to
+# search, the deduplicated build is returned, the same as after a search.
+def test_local_search_build_no_leftovers():
+    cube_list = read_cube_toml(os.path.join(TEST_DATA_DIR, 'cube_81183_tag_data.toml'),
+                               os.path.join(TEST_DATA_DIR, 'cube_81183_fixer_data.toml'))
+    on_color = deckbuild._relevant_cards(cube_list, 'WB', [])
+    nonlands = [c for c in on_color if 'land' not in c.types]
+    land_fixers = [c for c in on_color if 'land' in c.types and c.fixer_color_id]
+    # Untagged nonlands are singleton communities, like the lands, so some lands are added with the communities
+    pool = land_fixers + [c for c in nonlands if not c.tags][:8] + [c for c in nonlands if c.tags][:15]
+    graph = synergy.create_graph(pool, remove_isolated=False)
+
+    communities_deck = deckbuild._communities_build(graph, 'WB')
+    local_search_deck = deckbuild.local_search_build(graph, 'WB', [], time_budget=60)
+
+    assert len(communities_deck) > len(set(communities_deck))
+    assert local_search_deck == list(dict.fromkeys(communities_deck))
@@ -0,0 +1,104 @@
+import functools
+import os
+import mock
+import pytest
+from mtg_draft_ai import deckbuild, deckcache
+from mtg_draft_ai.api import Card, read_cube_toml
+from .. import TEST_DATA_DIR
+
+
+@pytest.fixture
+def cube_list():
+    return read_cube_toml(os.path.join(TEST_DATA_DIR, 'cube_81183_tag_data.toml'))
+
+
+def test_pool_fingerprint(cube_list):
+    pool = cube_list[:45]
+    version = deckcache.cube_version(cube_list)
+
+    assert deckcache.pool_fingerprint(pool, version) == deckcache.pool_fingerprint(list(reversed(pool)), version)
+    assert deckcache.pool_fingerprint(pool, version) != deckcache.pool_fingerprint(cube_list[1:46], version)
+    assert deckcache.pool_fingerprint(pool, version) != deckcache.pool_fingerprint(pool, version, options='x')
+
+
+def test_pool_fingerprint_changes_with_build_version(cube_list):
+    pool = cube_list[:45]
+    fingerprint = deckcache.pool_fingerprint(pool, 'v1')
+
+    with mock.patch.object(deckbuild, 'BUILD_VERSION', deckbuild.BUILD_VERSION + 1):
+        assert deckcache.pool_fingerprint(pool, 'v1') != fingerprint
+
+
+def test_deckbuild_options():
+    search = functools.partial(deckbuild.local_search_build, time_budget=0.5)
+    options = deckcache.deckbuild_options(
+        functools.partial(deckbuild.best_two_color_synergy_build, build_fn=search, prune=True))
+
+    # Executors, batch sizes and reporting callbacks don't change the deck
+    assert deckcache.deckbuild_options(functools.partial(
+        deckbuild.best_two_color_synergy_build, build_fn=search, prune=True, executor=mock.Mock(), batch_size=4,
+        on_results=print)) == options
+    assert deckcache.deckbuild_options(functools.partial(
+        deckbuild.best_two_color_synergy_build, build_fn=search, prune=False)) != options
+    assert deckcache.deckbuild_options(functools.partial(
+        deckbuild.best_two_color_synergy_build, prune=True,
+        build_fn=functools.partial(deckbuild.local_search_build, time_budget=1))) != options
+    assert 'local_search_build' in options
+
+
+def test_cube_version_changes_with_card_data(cube_list):
+    changed = [Card(name=c.name, color_id=c.color_id, types=c.types, mana_cost=c.mana_cost, tags=c.tags,
+                    power_tier=c.power_tier, fixer_color_id=c.fixer_color_id) for c in cube_list]
+    changed[0].tags = []
+
+    assert deckcache.cube_version(cube_list) == deckcache.cube_version(list(reversed(cube_list)))
+    assert deckcache.cube_version(cube_list) != deckcache.cube_version(changed)
+
+
+def test_build_cached_in_memory(cube_list):
+    pool = cube_list[:45]
+    deckbuild_fn = mock.Mock(return_value=pool[:23])
+    cache = deckcache.DeckbuildCache()
+
+    assert cache.build(pool, 'v1', deckbuild_fn) == pool[:23]
+    assert cache.build(list(reversed(pool)), 'v1', deckbuild_fn) == pool[:23]
+    assert deckbuild_fn.call_count == 1
+
+    cache.build(pool, 'v2', deckbuild_fn)
+    assert deckbuild_fn.call_count == 2
+
+
+def test_build_cached_on_disk(cube_list, tmp_path):
+    pool = cube_list[:45]
+    path = str(tmp_path / 'cache.sqlite3')
+    deckbuild_fn = mock.Mock(return_value=pool[:23])
+
+    cache = deckcache.DeckbuildCache(path)
+    cache.build(pool, 'v1', deckbuild_fn)
+    cache.close()
+
+    assert deckcache.DeckbuildCache(path).build(pool, 'v1', deckbuild_fn) == pool[:23]
+    assert deckbuild_fn.call_count == 1
+
+
+def test_lookup(cube_list):
+    pool = cube_list[:45]
+    cache = deckcache.DeckbuildCache()
+
+    assert cache.lookup(pool, 'v1', 'options') is None
+    cache.build(pool, 'v1', mock.Mock(return_value=pool[:23]), 'options')
+
+    assert cache.lookup(list(reversed(pool)), 'v1', 'options') == pool[:23]
+    assert cache.lookup(pool, 'v1', 'other options') is None
+
+
+def test_memory_tier_bounded():
+    cache = deckcache.DeckbuildCache(max_entries=2)
+    cache.put('a', ['A'])
+    cache.put('b', ['B'])
+    cache.get('a')
+    cache.put('c', ['C'])
+
+    assert cache.get('a') == ['A']
+    assert cache.get('b') is None
+    assert cache.get('c') == ['C']
@@ -0,0 +1,46 @@
+import os
+import statistics
+import pytest
+from mtg_draft_ai import deckscore, synergy
+from mtg_draft_ai.brains import power_rating
+from mtg_draft_ai.controller import read_cube_toml
+from .. import TEST_DATA_DIR
+
+
+@pytest.fixture
+def cube_list():
+    return read_cube_toml(os.path.join(TEST_DATA_DIR, 'cube_81183_tag_data.toml'),
+                          os.path.join(TEST_DATA_DIR, 'cube_81183_fixer_data.toml'))
+
+
+# Batched scores match the ones computed from each deck's own synergy graph.
+def test_score(cube_list):
+    decks = [cube_list[0:23], cube_list[100:130], cube_list[200:205] + cube_list[:3]]
+    scorer = deckscore.DeckScorer(cube_list)
+
+    scores = scorer.score([scorer.card_ids(d) for d in decks])
+
+    for deck, num_edges, avg_power, order in zip(decks, scores.num_edges, scores.avg_power, scores.centrality_orders):
+        deck_graph = synergy.create_graph(deck, remove_isolated=False)
+        centralities = dict(synergy.sorted_centralities(deck_graph))
+        sorted_deck = scorer.cards_for(order)
+
+        assert num_edges == len(deck_graph.edges)
+        assert avg_power == pytest.approx(statistics.mean(power_rating(c) for c in deck if 'land' not in c.types))
+        assert set(sorted_deck) == set(deck)
+        assert [centralities[c] for c in sorted_deck] == \
+            pytest.approx(sorted(centralities.values(), reverse=True), abs=1e-6)
+
+
+def test_card_ids_dedupes(cube_list):
+    scorer = deckscore.DeckScorer(cube_list)
+    deck = cube_list[:5] + cube_list[:2]
+
+    assert scorer.cards_for(scorer.card_ids(deck)) == cube_list[:5]
+
+
+def test_score_no_decks(cube_list):
+    scores = deckscore.DeckScorer(cube_list).score([])
+
+    assert len(scores.num_edges) == 0
+    assert scores.centrality_orders == []
@@ -1,6 +1,6 @@
 import os
 import pytest
-from io import StringIO
+from io import BytesIO, StringIO
 
 from mtg_draft_ai import draftlog
 from mtg_draft_ai.controller import DraftController, read_cube_toml
@@ -45,3 +45,83 @@ def test_log_to_html(controller):
     # It's difficult to actually validate the output html, so just a minimal assertion here
     html = draftlog.log_to_html(log_file)
     assert 'scryfall' in html
+
+
+def test_binary_log_full_draft(controller):
+    drafters = controller.drafters
+    controller.run_draft()
+
+    log_file = BytesIO(draftlog.dumps_binary_log(drafters, controller.draft_info))
+    loaded_drafters = draftlog.load_drafters_from_log(log_file, card_list=controller.draft_info.card_list)
+
+    for drafter, loaded in zip(drafters, loaded_drafters):
+        assert drafter.cards_owned == loaded.cards_owned
+        assert drafter.pack_history == loaded.pack_history
+    assert loaded_drafters[0].draft_info.num_drafters == controller.draft_info.num_drafters
+
+
+def test_binary_log_smaller_than_toml(controller):
+    controller.run_draft()
+
+    toml_log = draftlog.dumps_log(controller.drafters, controller.draft_info).encode('utf-8')
+    binary_log = draftlog.dumps_binary_log(controller.drafters, controller.draft_info)
+    assert len(binary_log) < len(toml_log) / 4
+
+
+@pytest.mark.parametrize('binary', [False, True])
+def test_iter_picks(controller, binary):
+    drafters = controller.drafters
+    controller.run_draft()
+
+    if binary:
+        log_file = BytesIO(draftlog.dumps_binary_log(drafters, controller.draft_info))
+    else:
+        log_file = StringIO(draftlog.dumps_log(drafters, controller.draft_info))
+    picks = list(draftlog.iter_picks(log_file))
+
+    draft_info = controller.draft_info
+    assert len(picks) == draft_info.num_drafters * draft_info.num_phases * draft_info.cards_per_pack
+    for logged in picks:
+        drafter = drafters[logged.drafter]
+        pick_index = logged.phase * draft_info.cards_per_pack + logged.pick
+        assert logged.picked == drafter.cards_owned[pick_index].name
+        assert logged.pack == [c.name for c in drafter.pack_history[pick_index]]
+
+
+def test_iter_corpus_picks(tmp_path, draft_info):
+    logs = []
+    for i, binary in enumerate([False, True]):
+        drafters = [Drafter(RandomPicker(), draft_info) for _ in range(0, 4)]
+        DraftController.create(draft_info=draft_info, drafters=drafters, debug=False).run_draft()
+        logs.append(_write_log(tmp_path, i, drafters, draft_info, binary))
+    (tmp_path / 'draft_0.html').write_text('not a log')
+
+    picks = list(draftlog.iter_corpus_picks(str(tmp_path)))
+
+    assert [p.log for p in picks] == [logs[0]] * 60 + [logs[1]] * 60
+    assert list(draftlog.map_logs(_count_picks, str(tmp_path), processes=2)) == [60, 60]
+
+
+def _write_log(directory, name, drafters, draft_info, binary):
+    path = os.path.join(str(directory), 'draft-log_{}.txt'.format(name))
+    if binary:
+        with open(path, 'wb') as f:
+            f.write(draftlog.dumps_binary_log(drafters, draft_info))
+    else:
+        with open(path, 'w') as f:
+            f.write(draftlog.dumps_log(drafters, draft_info))
+    return path
+
+
+def _count_picks(log_path):
+    return sum(1 for _ in draftlog.iter_picks(log_path))
+
+
+def test_write_drafters_html(controller):
+    controller.run_draft()
+
+    # Writing straight from the drafters (Card objects) matches rendering the logged card names
+    html = StringIO()
+    draftlog.write_drafters_html(controller.drafters, html)
+    log_file = StringIO(draftlog.dumps_log(controller.drafters, controller.draft_info))
+    assert html.getvalue() == draftlog.log_to_html(log_file)
@@ -0,0 +1,77 @@
+import random
+import pytest
+from mtg_draft_ai import draftlog, pickbench
+from mtg_draft_ai.api import Card, DraftInfo, Drafter, Picker
+from mtg_draft_ai.controller import DraftController
+
+
+class FirstCardPicker(Picker):
+
+    def __init__(self):
+        self.num_picks = 0
+
+    def pick(self, pack, cards_owned, draft_info):
+        self.num_picks += 1
+        return pack[0]
+
+
+@pytest.fixture
+def card_list():
+    return [Card(name='Card {}'.format(i)) for i in range(0, 30)]
+
+
+@pytest.fixture
+def log_dir(card_list, tmp_path):
+    random.seed(0)
+    draft_info = DraftInfo(card_list=card_list, num_drafters=2, num_phases=3, cards_per_pack=5)
+    drafters = [Drafter(FirstCardPicker(), draft_info) for _ in range(0, 2)]
+    DraftController.create(draft_info, drafters, debug=False).run_draft()
+
+    with open(str(tmp_path / 'draft-log_0.txt'), 'w') as f:
+        f.write(draftlog.dumps_log(drafters, draft_info))
+    with open(str(tmp_path / 'draft-log_1.bin'), 'wb') as f:
+        f.write(draftlog.dumps_binary_log(drafters, draft_info))
+    return str(tmp_path)
+
+
+def test_load_corpus(card_list, log_dir):
+    picks = pickbench.load_corpus(log_dir, card_list)
+
+    assert len(picks) == 60
+    assert picks[0].pack == picks[30].pack
+    assert len(picks[0].pack) == 5
+    assert picks[0].cards_owned == []
+    assert picks[4].cards_owned == [p.picked for p in picks[0:4]]
+    assert picks[0].draft_info.num_drafters == 2
+    assert picks[0].draft_info.card_list == card_list
+
+
+def test_benchmark_picker(card_list, log_dir):
+    picks = pickbench.load_corpus(log_dir, card_list)
+    picker = FirstCardPicker()
+
+    benchmark = pickbench.benchmark_picker(picker, picks, repeat=2)
+
+    # Picks are replayed twice for timing, then once more for memory
+    assert picker.num_picks == 180
+    assert benchmark.num_picks == 120
+    assert benchmark.picks_per_second > 0
+    assert benchmark.p50_ms <= benchmark.p95_ms <= benchmark.p99_ms <= benchmark.max_ms
+    assert benchmark.peak_memory_bytes >= 0
+
+
+def test_benchmark_picker_no_memory(card_list, log_dir):
+    picks = pickbench.load_corpus(log_dir, card_list)
+    picker = FirstCardPicker()
+
+    benchmark = pickbench.benchmark_picker(picker, picks, measure_memory=False)
+
+    assert picker.num_picks == 60
+    assert benchmark.peak_memory_bytes is None
+
+
+def test_relative_changes():
+    baseline = {'num_picks': 100, 'p50_ms': 2.0, 'peak_memory_bytes': None, 'picker': 'A'}
+    result = {'num_picks': 100, 'p50_ms': 3.0, 'peak_memory_bytes': 1000, 'picker': 'B'}
+
+    assert pickbench.relative_changes(result, baseline) == {'num_picks': 0, 'p50_ms': pytest.approx(0.5)}
@@ -0,0 +1,109 @@
+import json
+import mock
+import os
+import random
+import pytest
+from mtg_draft_ai.brains import SynergyPowerFixingPicker
+from mtg_draft_ai.api import *
+from mtg_draft_ai.pickertiming import ComponentTimings, PickTiming, TOTAL
+from .. import TEST_DATA_DIR
+
+
+CUBE_LIST = read_cube_toml(os.path.join(TEST_DATA_DIR, 'test_picker.toml'),
+                           os.path.join(TEST_DATA_DIR, 'fixer_data.toml'))
+CARDS_BY_NAME = {c.name: c for c in CUBE_LIST}
+
+
+@pytest.fixture
+def draft_info():
+    return mock.Mock(name='draft_info', num_phases=3, cards_per_pack=15)
+
+
+@pytest.fixture
+def factory():
+    return SynergyPowerFixingPicker.factory(CUBE_LIST)
+
+
+def _pick_timing(stages):
+    pick_timing = PickTiming()
+    for component, stage, seconds in stages:
+        pick_timing.add(component, stage, seconds)
+    return pick_timing
+
+
+def test_record_pick_fills_missing_stages_with_zeros():
+    timings = ComponentTimings()
+    timings.record_pick(_pick_timing([('a', 'rate', 0.001), ('a', 'rate', 0.002)]))
+    timings.record_pick(_pick_timing([('b', 'normalize', 0.004)]))
+
+    assert timings.num_picks == 2
+    assert timings.seconds[('a', 'rate')] == pytest.approx([0.003, 0])
+    assert timings.calls[('a', 'rate')] == [2, 0]
+    assert timings.seconds[('b', 'normalize')] == [0, 0.004]
+    assert timings.calls[('b', 'normalize')] == [0, 1]
+
+
+def test_merge_and_round_trip():
+    timings = ComponentTimings()
+    timings.record_pick(_pick_timing([('a', 'rate', 0.001)]))
+    other = ComponentTimings()
+    other.record_pick(_pick_timing([('b', 'rate', 0.002)]))
+    other.record_pick(_pick_timing([('a', 'rate', 0.003)]))
+
+    timings.merge(ComponentTimings.from_dict(json.loads(json.dumps(other.to_dict()))))
+
+    assert timings.num_picks == 3
+    assert timings.seconds[('a', 'rate')] == [0.001, 0, 0.003]
+    assert timings.seconds[('b', 'rate')] == [0, 0.002, 0]
+    assert timings.calls[('b', 'rate')] == [0, 1, 0]
+
+
+def test_summary_and_histogram():
+    timings = ComponentTimings()
+    for seconds in [0.001, 0.002, 0.003]:
+        timings.record_pick(_pick_timing([('a', 'rate', seconds), ('a', 'rate', seconds), ('b', 'rate', 0.0005)]))
+
+    summaries = timings.summary()
+    assert [(s.component, s.stage) for s in summaries] == [('a', 'rate'), ('b', 'rate')]
+    assert summaries[0].calls_per_pick == 2
+    assert summaries[0].total_seconds == pytest.approx(0.012)
+    assert summaries[0].mean_ms == pytest.approx(4)
+    assert summaries[0].max_ms == pytest.approx(6)
+
+    counts, edges = timings.histogram('a', 'rate', bins=[0, 3, 7])
+    assert list(counts) == [1, 2]
+    assert list(timings.histogram('missing', 'rate', bins=2)[0]) == [0, 0]
+
+
+def test_timed_picker_makes_same_picks(draft_info, factory):
+    owned_cards = [CARDS_BY_NAME[name] for name in ['Abzan Battle Priest', "Ajani's Pridemate"]]
+    pack = [CARDS_BY_NAME[name] for name in ['Ayli, Eternal Pilgrim', 'Tuskguard Captain', 'Swift Justice']]
+
+    random.seed(0)
+    untimed = factory.create().ratings(pack, owned_cards, draft_info)
+    picker = factory.create()
+    timings = picker.enable_timing()
+    random.seed(0)
+    timed = picker.ratings(pack, owned_cards, draft_info)
+
+    assert [(r.card, r.color_combo, r.rating) for r in timed] == [(r.card, r.color_combo, r.rating) for r in untimed]
+    assert timings.num_picks == 1
+    component_names = [cr.name() for cr in picker.component_raters]
+    assert {component for component, _ in timings.seconds} == set(component_names) | {TOTAL[0]}
+    # Every component rates and normalizes each on-color candidate x color combo once
+    for name in component_names:
+        assert timings.calls[(name, 'rate')] == [len(timed)]
+        assert timings.calls[(name, 'normalize')] == [len(timed)]
+    assert timings.calls[TOTAL] == [1]
+
+
+def test_factory_timings_shared_by_created_pickers(draft_info, factory):
+    assert factory.create().timings is None
+
+    timings = factory.enable_timing()
+    pack = [CARDS_BY_NAME['Ayli, Eternal Pilgrim'], CARDS_BY_NAME['Tuskguard Captain']]
+    for _ in range(0, 2):
+        factory.create().pick(pack, [], draft_info)
+
+    assert factory.timings is timings
+    assert timings.num_picks == 2
@@ -0,0 +1,95 @@
+import os
+import mock
+import toml
+
+from mtg_draft_ai import draftlog
+from mtg_draft_ai.pickstats import PickOrderIndex
+
+
+PICKS = [
+    (0, ['A', 'B', 'C'], 'A'),
+    (1, ['B', 'C'], 'C'),
+    (2, ['B'], 'B'),
+]
+
+
+def test_add_source():
+    index = PickOrderIndex()
+    assert index.add_source('draft-1', PICKS)
+
+    assert index.average_pick('A') == 0
+    assert index.average_pick('B') == 2
+    assert index.times_taken('C') == 1
+    assert index.times_passed('A') == 0
+    assert index.times_passed('B') == 2
+    assert index.times_passed('C') == 1
+    assert index.average_pick('D') is None
+
+
+def test_add_source_skips_indexed_sources():
+    index = PickOrderIndex()
+    index.add_source('draft-1', PICKS)
+
+    assert not index.add_source('draft-1', PICKS)
+    assert index.times_taken('A') == 1
+
+    index.add_source('draft-2', [(1, ['A', 'D'], 'A')])
+    assert index.average_pick('A') == 0.5
+    assert index.times_passed('D') == 1
+    assert [row[0] for row in index.rankings()] == ['A', 'C', 'B']
+
+
+def test_save_and_load(tmp_path):
+    path = os.path.join(str(tmp_path), 'index.npz')
+    index = PickOrderIndex.load(path)
+    index.add_source('draft-1', PICKS)
+    index.save(path)
+
+    loaded = PickOrderIndex.load(path)
+    assert loaded.rankings() == index.rankings()
+    assert loaded.sources == {'draft-1'}
+
+
+def _write_log(path, picks):
+    log = {'draft_info': {'num_drafters': 1, 'num_phases': 1, 'cards_per_pack': 3},
+           'full_draft': [{'drafter': 0, 'picks': [{'pack': pack, 'pick': picked} for _, pack, picked in picks]}]}
+    with open(path, 'w') as f:
+        toml.dump(log, f)
+
+
+def test_add_logs(tmp_path):
+    _write_log(os.path.join(str(tmp_path), 'draft-log_0.txt'), PICKS)
+
+    index = PickOrderIndex()
+    assert index.add_logs(str(tmp_path)) == 1
+    assert index.add_logs(str(tmp_path)) == 0
+    assert index.average_pick('C') == 1
+    assert index.times_passed('B') == 2
+
+
+def test_add_logs_unchanged_logs_not_read(tmp_path):
+    for i in range(0, 3):
+        _write_log(os.path.join(str(tmp_path), 'draft-log_{}.txt'.format(i)), PICKS)
+    index = PickOrderIndex()
+    index.add_logs(str(tmp_path))
+
+    with mock.patch.object(draftlog, 'iter_picks') as iter_picks, mock.patch('builtins.open') as mock_open:
+        assert index.add_logs(str(tmp_path)) == 0
+        iter_picks.assert_not_called()
+        mock_open.assert_not_called()
+
+
+def test_add_logs_overwritten_log(tmp_path):
+    log_path = os.path.join(str(tmp_path), 'draft-log_0.txt')
+    _write_log(log_path, PICKS)
+    index = PickOrderIndex()
+    index.add_logs(log_path)
+
+    # Another run writes a different draft to the same file
+    _write_log(log_path, [(0, ['D', 'A', 'B', 'E'], 'D'), (1, ['A', 'B'], 'A'), (2, ['B'], 'B')])
+
+    assert index.add_logs(log_path) == 1
+    assert index.add_logs(log_path) == 0
+    assert index.times_taken('D') == 1
+    assert index.average_pick('A') == 0.5
+    assert len(index.sources) == 2
@@ -0,0 +1,55 @@
+import time
+import pytest
+from mtg_draft_ai import profiling
+
+
+def _busy(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def test_stage_timer_accumulates_nested_stages():
+    timer = profiling.StageTimer()
+    with timer.stage('outer'):
+        assert timer.current == 'outer'
+        with timer.stage('inner'):
+            assert timer.current == 'inner'
+            _busy(0.01)
+        assert timer.current == 'outer'
+    with timer.stage('inner'):
+        pass
+
+    assert timer.current is None
+    assert timer.calls == {'outer': 1, 'inner': 2}
+    assert timer.seconds['outer'] >= timer.seconds['inner'] >= 0.01
+    assert timer.format_report().splitlines()[1].startswith('outer')
+
+
+def test_stage_timer_records_stage_on_error():
+    timer = profiling.StageTimer()
+    with pytest.raises(ValueError):
+        with timer.stage('failing'):
+            raise ValueError()
+
+    assert timer.calls == {'failing': 1}
+    assert timer.current is None
+
+
+def test_stack_sampler_groups_stacks_by_stage(tmpdir):
+    timer = profiling.StageTimer()
+    with profiling.StackSampler(interval=0.001, stage_timer=timer) as sampler:
+        with timer.stage('busy'):
+            _busy(0.2)
+
+    assert sum(sampler.counts.values()) > 0
+    busy_stacks = [stack for stack in sampler.counts if stack.startswith('busy;')]
+    assert len(busy_stacks) > 0
+    assert all('_busy (test_profiling.py:' in stack for stack in busy_stacks)
+    assert all(stack.split(';')[0] in ['busy', profiling.NO_STAGE] for stack in sampler.counts)
+
+    path = str(tmpdir.join('stacks.txt'))
+    sampler.write_collapsed(path)
+    with open(path) as f:
+        lines = f.read().splitlines()
+    assert sum(int(line.rsplit(' ', 1)[1]) for line in lines) == sum(sampler.counts.values())
@@ -0,0 +1,126 @@
+import mock
+import os
+import random
+import numpy as np
+import pytest
+from mtg_draft_ai import draftlog, replay, tuning
+from mtg_draft_ai.api import DraftInfo, Drafter
+from mtg_draft_ai.brains import ConstantWeight, LinearProgressWeight, SynergyPowerFixingPicker, all_common_neighbors
+from mtg_draft_ai.controller import DraftController, read_cube_toml
+from .. import TEST_DATA_DIR
+
+
+@pytest.fixture(scope='module')
+def cube_list():
+    return read_cube_toml(os.path.join(TEST_DATA_DIR, 'cube_81183_tag_data.toml'),
+                          os.path.join(TEST_DATA_DIR, 'cube_81183_fixer_data.toml'))
+
+
+@pytest.fixture(scope='module')
+def common_neighbors(cube_list):
+    return all_common_neighbors(cube_list)
+
+
+@pytest.fixture(scope='module')
+def log_file(cube_list, common_neighbors, tmp_path_factory):
+    random.seed(0)
+    draft_info = DraftInfo(card_list=cube_list, num_drafters=2, num_phases=3, cards_per_pack=15)
+    drafters = [Drafter(SynergyPowerFixingPicker(common_neighbors), draft_info) for _ in range(0, 2)]
+    DraftController.create(draft_info, drafters, debug=False).run_draft()
+
+    path = str(tmp_path_factory.mktemp('logs') / 'draft-log_0.txt')
+    with open(path, 'w') as f:
+        f.write(draftlog.dumps_log(drafters, draft_info))
+    return path
+
+
+def test_log_replay_picks(cube_list, log_file):
+    picks = replay.log_replay_picks(log_file, cube_list)
+
+    assert len(picks) == 90
+    assert picks[0].cards_owned == []
+    assert picks[1].cards_owned == [picks[0].picked]
+    assert all(p.picked in p.pack for p in picks)
+
+
+# Agreement from the component matrix is the same as from replaying every pick through a picker with the weights.
+def test_agreement(cube_list, common_neighbors, log_file):
+    picker = SynergyPowerFixingPicker(common_neighbors)
+    corpus = replay.ComponentCorpus([cr.name() for cr in picker.component_raters])
+    picks = replay.log_replay_picks(log_file, cube_list)
+    corpus.add_source('log', picks, picker)
+
+    weights_list = [SynergyPowerFixingPicker.DEFAULT_WEIGHTS,
+                    tuning.weights_for({'power_delta.start': 5, 'land_fixer.weight': 1}),
+                    tuning.weights_for({'cards_owned_syn_edges.end': 0.5, 'common_neighbors_weighted.start': 4})]
+
+    agreement = corpus.agreement(weights_list, max_elements=len(corpus.components))
+
+    for weights, config_agreement in zip(weights_list, agreement):
+        assert config_agreement == pytest.approx(_replay_agreement(picks, SynergyPowerFixingPicker(
+            common_neighbors, weights=weights)))
+    # The log's picks were made with the default weights
+    assert agreement[0] > 0.9
+
+
+def test_add_source_once(cube_list, common_neighbors, log_file):
+    picker = SynergyPowerFixingPicker(common_neighbors)
+    corpus = replay.ComponentCorpus([cr.name() for cr in picker.component_raters])
+
+    assert corpus.add_logs(log_file, cube_list, picker) == 1
+    with mock.patch.object(replay, 'log_replay_picks') as log_replay_picks:
+        assert corpus.add_logs(log_file, cube_list, picker) == 0
+        log_replay_picks.assert_not_called()
+    assert corpus.num_picks == 90
+
+
+def test_save_load(tmp_path):
+    path = str(tmp_path / 'corpus.npz')
+    corpus = replay.ComponentCorpus(['a', 'b'], fingerprint='v1', components=np.array([[0.5, 1], [1, 0]]),
+                                    picked=np.array([False, True]), offsets=np.array([0, 2, 2]),
+                                    progress=np.array([0, 0.5]), fallback_agrees=np.array([False, True]),
+                                    sources={'log:1'})
+    corpus.save(path)
+
+    loaded = replay.ComponentCorpus.load(path, ['a', 'b'], fingerprint='v1')
+    assert loaded.sources == {'log:1'}
+    assert loaded.num_picks == 2
+    np.testing.assert_array_equal(loaded.components, corpus.components)
+    np.testing.assert_array_equal(loaded.offsets, corpus.offsets)
+
+    # Components computed for another cube or picker aren't reused
+    assert replay.ComponentCorpus.load(path, ['a', 'b'], fingerprint='v2').num_picks == 0
+    assert replay.ComponentCorpus.load(path, ['a', 'c'], fingerprint='v1').num_picks == 0
+
+
+def test_agreement_ties():
+    # One pick with 3 rows: the picked card ties with another card for the best rating with equal weights
+    corpus = replay.ComponentCorpus(['a', 'b'], components=np.array([[1, 0], [0, 1], [0, 0]]),
+                                    picked=np.array([True, False, False]), offsets=np.array([0, 3]),
+                                    progress=np.array([0.0]), fallback_agrees=np.array([False]))
+
+    agreement = corpus.agreement([{'a': ConstantWeight(1), 'b': ConstantWeight(1)},
+                                  {'a': ConstantWeight(2), 'b': ConstantWeight(1)},
+                                  {'a': LinearProgressWeight(start=0, end=1), 'b': ConstantWeight(1)}])
+
+    np.testing.assert_allclose(agreement, [0.5, 1, 0])
+
+
+def test_weight_matrices():
+    starts, ends = replay.weight_matrices(['a', 'b'], [{'a': LinearProgressWeight(start=1, end=2),
+                                                        'b': ConstantWeight(5)}])
+
+    np.testing.assert_array_equal(starts, [[1, 5]])
+    np.testing.assert_array_equal(ends, [[2, 5]])
+
+
+def _replay_agreement(picks, picker):
+    total = 0
+    for pick in picks:
+        ratings = picker.ratings(pick.pack, pick.cards_owned, pick.draft_info)
+        if not ratings:
+            total += pick.pack[0] == pick.picked
+            continue
+        best = [r for r in ratings if r.rating == ratings[0].rating]
+        total += sum(r.card == pick.picked for r in best) / len(best)
+    return total / len(picks)
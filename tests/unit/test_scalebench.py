@@ -0,0 +1,62 @@
+import pytest
+import time
+from mtg_draft_ai import scalebench
+
+
+def test_scaling_exponent():
+    sizes = [10, 100, 1000]
+
+    assert scalebench.scaling_exponent(sizes, [3 * s for s in sizes]) == pytest.approx(1)
+    assert scalebench.scaling_exponent(sizes, [s ** 2 for s in sizes]) == pytest.approx(2)
+    assert scalebench.scaling_exponent([10], [5]) is None
+    assert scalebench.scaling_exponent(sizes, [None, None, 4]) is None
+
+
+def test_superlinear_paths():
+    measurements = [scalebench.Measurement(path=path, size=size, seconds=seconds(size), peak_memory_bytes=None)
+                    for path, seconds in [('linear', lambda s: s / 1000), ('quadratic', lambda s: s ** 2 / 1000)]
+                    for size in [100, 200, 400]]
+
+    flagged = scalebench.superlinear_paths(measurements)
+
+    assert [(path, metric) for path, metric, _ in flagged] == [('quadratic', 'seconds')]
+    assert flagged[0][2] == pytest.approx(2)
+
+
+def test_measure():
+    calls = []
+
+    seconds, peak_memory = scalebench.measure(lambda: calls.append([0] * 10000))
+
+    # One warm-up run, three timed runs and one run tracing memory
+    assert len(calls) == 5
+    assert seconds >= 0
+    assert peak_memory >= 10000
+
+
+def test_measure_no_memory():
+    calls = []
+
+    _, peak_memory = scalebench.measure(lambda: calls.append(1), measure_memory=False, repeat=1, warmup=0)
+
+    assert calls == [1]
+    assert peak_memory is None
+
+
+def test_measure_fastest_run():
+    # The warm-up and the first timed run are slow
+    durations = iter([0.2, 0.2, 0, 0])
+
+    seconds, _ = scalebench.measure(lambda: time.sleep(next(durations)), measure_memory=False)
+
+    assert seconds < 0.1
+
+
+def test_measure_memory_only():
+    calls = []
+
+    seconds, peak_memory = scalebench.measure(lambda: calls.append([0] * 10000), repeat=0, warmup=0)
+
+    assert len(calls) == 1
+    assert seconds is None
+    assert peak_memory >= 10000
@@ -0,0 +1,45 @@
+import pytest
+from mtg_draft_ai import synergy, synthcube
+from mtg_draft_ai.api import read_cube_toml
+
+
+def test_generate_cube(tmp_path):
+    cards, fixers = synthcube.generate_cube(500, num_themes=5, seed=1)
+    card_data_file, fixer_data_file = str(tmp_path / 'tag_data.toml'), str(tmp_path / 'fixer_data.toml')
+    synthcube.write_cube_toml(cards, fixers, card_data_file, fixer_data_file)
+
+    cube_list = read_cube_toml(card_data_file, fixer_data_file)
+
+    assert len(cube_list) == 500
+    assert {theme for c in cube_list for theme, _ in c.tags} == {'Theme {}'.format(i) for i in range(0, 5)}
+    assert any('land' in c.types for c in cube_list)
+    assert any(c.fixer_color_id for c in cube_list)
+    assert all(c.color_id == 'C' or set(c.color_id) <= set(synthcube.COLORS) for c in cube_list)
+    assert len(synergy.create_graph(cube_list).edges) > 0
+
+
+def test_cube_list(tmp_path):
+    cards, fixers = synthcube.generate_cube(200, seed=2)
+    card_data_file, fixer_data_file = str(tmp_path / 'tag_data.toml'), str(tmp_path / 'fixer_data.toml')
+    synthcube.write_cube_toml(cards, fixers, card_data_file, fixer_data_file)
+
+    cube_list = synthcube.cube_list(cards, fixers)
+
+    assert [vars(c) for c in cube_list] == [vars(c) for c in read_cube_toml(card_data_file, fixer_data_file)]
+
+
+def test_generate_cube_seeded():
+    assert synthcube.generate_cube(100, seed=3) == synthcube.generate_cube(100, seed=3)
+    assert synthcube.generate_cube(100, seed=3) != synthcube.generate_cube(100, seed=4)
+
+
+def test_generate_cube_options():
+    cards, fixers = synthcube.generate_cube(1000, enabler_ratio=1, themes_per_card=[0, 1], land_fraction=0,
+                                            color_weights={'R': 1}, multicolor_fraction=0, colorless_fraction=0)
+
+    assert fixers == {}
+    assert all(card['color_identity'] == 'R' for card in cards.values())
+    for card in cards.values():
+        theme_tags = [t for t in card['tags'] if not t.startswith('Tier')]
+        assert len(theme_tags) == 1
+        assert theme_tags[0].endswith('Enabler')
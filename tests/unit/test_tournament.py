@@ -0,0 +1,66 @@
+import os
+import pytest
+from mtg_draft_ai import tournament
+from mtg_draft_ai.controller import read_cube_toml
+from .. import TEST_DATA_DIR
+
+
+@pytest.fixture
+def cube_list():
+    return read_cube_toml(os.path.join(TEST_DATA_DIR, 'cube_81183_tag_data.toml'),
+                          os.path.join(TEST_DATA_DIR, 'cube_81183_fixer_data.toml'))
+
+
+def test_seat_pickers():
+    pickers = ['A', 'B', 'C']
+
+    assert tournament.seat_pickers(pickers, 4, 0) == ['A', 'B', 'C', 'A']
+    assert tournament.seat_pickers(pickers, 4, 1) == ['B', 'C', 'A', 'B']
+
+    # Over all rotations, every picker sits at every seat
+    for seat in range(0, 4):
+        assert {tournament.seat_pickers(pickers, 4, r)[seat] for r in range(0, 3)} == set(pickers)
+
+
+def test_run_tournament(cube_list):
+    pickers = ['PowerFixingPicker', 'SynergyPowerFixingPicker']
+
+    results = tournament.run_tournament(cube_list, pickers, num_pack_sets=1, num_drafters=2)
+
+    assert len(results) == 4
+    assert {(r.rotation, r.seat, r.picker) for r in results} == {
+        (0, 0, pickers[0]), (0, 1, pickers[1]), (1, 0, pickers[1]), (1, 1, pickers[0])}
+    assert all(r.num_edges > 0 for r in results)
+
+
+def test_run_tournament_executor(cube_list):
+    pickers = ['PowerFixingPicker', 'SynergyPowerFixingPicker']
+
+    with tournament.create_executor(cube_list, pickers, max_workers=2) as executor:
+        results = tournament.run_tournament(cube_list, pickers, num_pack_sets=1, num_drafters=2, executor=executor)
+
+    # Drafts are seeded by pack set, so they come out the same in worker processes
+    assert results == tournament.run_tournament(cube_list, pickers, num_pack_sets=1, num_drafters=2)
+
+
+def test_run_tournament_duplicate_pickers(cube_list):
+    with pytest.raises(ValueError):
+        tournament.run_tournament(cube_list, ['PowerFixingPicker', 'PowerFixingPicker'], num_pack_sets=1)
+
+
+def test_summarize():
+    results = []
+    for pack_set, (a_edges, b_edges) in enumerate([(10, 12), (20, 23), (30, 31)]):
+        results += [tournament.SeatResult(pack_set=pack_set, rotation=0, seat=0, picker='A', num_edges=a_edges,
+                                          avg_power=0.5),
+                    tournament.SeatResult(pack_set=pack_set, rotation=0, seat=1, picker='B', num_edges=b_edges,
+                                          avg_power=0.5)]
+
+    baseline, other = tournament.summarize(results, ['A', 'B'])
+
+    assert baseline.edges.mean == pytest.approx(20)
+    assert baseline.edges_difference is None
+    assert other.edges_difference.mean == pytest.approx(2)
+    # Differences are paired by pack set, so the large variance between pack sets cancels out
+    assert other.edges_difference.half_width < other.edges.half_width
+    assert other.power_difference.mean == pytest.approx(0)
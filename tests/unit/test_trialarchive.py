@@ -0,0 +1,66 @@
+import concurrent.futures
+import os
+import pytest
+from mtg_draft_ai.trialarchive import TrialArchive, file_name
+
+
+@pytest.fixture
+def archive_path(tmpdir):
+    return str(tmpdir.join('trials.db'))
+
+
+def _write_trials(archive_path, trials):
+    archive = TrialArchive(archive_path)
+    for trial in trials:
+        archive.put(trial, {'draft.html': '<p>{}</p>'.format(trial), 'draft-log.bin': bytes([trial % 256] * 100)})
+    archive.close()
+
+
+def test_file_name():
+    assert file_name(3, 'draft.html') == 'draft_3.html'
+    assert file_name('3-PowerFixingPicker', 'draft-log.bin') == 'draft-log_3-PowerFixingPicker.bin'
+
+
+def test_put_and_get(archive_path):
+    archive = TrialArchive(archive_path)
+    archive.put(0, {'draft.html': '<p>café</p>', 'draft-log.bin': b'\x00\x01'})
+    archive.put('1', {'build.html': 'build'})
+
+    assert archive.get(0, 'draft-log.bin') == b'\x00\x01'
+    assert archive.get_text('0', 'draft.html') == '<p>café</p>'
+    assert archive.get(0, 'build.html') is None
+    assert archive.get_text(2, 'draft.html') is None
+    assert archive.trials() == ['0', '1']
+    assert archive.names(0) == ['draft-log.bin', 'draft.html']
+
+    archive.put(0, {'draft.html': 'replaced'})
+    assert archive.get_text(0, 'draft.html') == 'replaced'
+    archive.close()
+
+    reopened = TrialArchive(archive_path)
+    assert reopened.get_text(1, 'build.html') == 'build'
+    reopened.close()
+
+
+def test_extract(archive_path, tmpdir):
+    archive = TrialArchive(archive_path)
+    archive.put(5, {'draft.html': 'draft', 'draft-log.txt': 'log'})
+
+    paths = archive.extract(5, str(tmpdir))
+
+    assert sorted(os.path.basename(p) for p in paths) == ['draft-log_5.txt', 'draft_5.html']
+    with open(str(tmpdir.join('draft_5.html'))) as f:
+        assert f.read() == 'draft'
+    archive.close()
+
+
+def test_parallel_writers(archive_path):
+    with concurrent.futures.ProcessPoolExecutor(max_workers=2) as executor:
+        list(executor.map(_write_trials, [archive_path] * 4, [range(i, 40, 4) for i in range(0, 4)]))
+
+    archive = TrialArchive(archive_path)
+    assert sorted(int(t) for t in archive.trials()) == list(range(0, 40))
+    for trial in [0, 17, 39]:
+        assert archive.get_text(trial, 'draft.html') == '<p>{}</p>'.format(trial)
+        assert archive.get(trial, 'draft-log.bin') == bytes([trial] * 100)
+    archive.close()
@@ -0,0 +1,45 @@
+import pytest
+from mtg_draft_ai.brains import LinearProgressWeight, PowerFixingPicker, RandomPicker, SynergyPowerFixingPicker
+from mtg_draft_ai.trialmanifest import TrialManifest, picker_config_hash
+
+
+@pytest.fixture
+def manifest(tmpdir):
+    manifest = TrialManifest(str(tmpdir.join('results.db')))
+    yield manifest
+    manifest.close()
+
+
+def test_picker_config_hash_depends_on_class_and_weights():
+    default = picker_config_hash(SynergyPowerFixingPicker(common_neighbors={}))
+
+    assert picker_config_hash(SynergyPowerFixingPicker(common_neighbors={})) == default
+    assert picker_config_hash(SynergyPowerFixingPicker(
+        common_neighbors={}, weights={'power_delta': LinearProgressWeight(start=2, end=1)})) == default
+    assert picker_config_hash(SynergyPowerFixingPicker(
+        common_neighbors={}, weights={'power_delta': LinearProgressWeight(start=2, end=1.5)})) != default
+    assert picker_config_hash(PowerFixingPicker()) != default
+    assert picker_config_hash(RandomPicker()) == picker_config_hash(RandomPicker())
+
+
+def test_put_and_get(manifest):
+    key = ('picker', 'cube', 'settings', '7-0')
+    assert manifest.get(*key) is None
+
+    manifest.put(*key, result=[[30, 0.5], [25, 0.4]], name=0)
+
+    assert manifest.get(*key) == [[30, 0.5], [25, 0.4]]
+    assert manifest.get('picker', 'cube', 'settings', '7-1') is None
+    assert manifest.get('other picker', 'cube', 'settings', '7-0') is None
+    assert manifest.num_trials() == 1
+
+
+def test_results_persist(tmpdir):
+    path = str(tmpdir.join('results.db'))
+    manifest = TrialManifest(path)
+    manifest.put('picker', 'cube', 'settings', '7-0', result=[[30, 0.5]])
+    manifest.close()
+
+    reopened = TrialManifest(path)
+    assert reopened.get('picker', 'cube', 'settings', '7-0') == [[30, 0.5]]
+    reopened.close()
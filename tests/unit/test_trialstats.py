@@ -0,0 +1,53 @@
+import math
+
+import pytest
+
+from mtg_draft_ai import trialstats
+
+
+def test_confidence_interval():
+    interval = trialstats.confidence_interval([1, 2, 3, 4, 5])
+
+    assert interval.mean == 3
+    assert interval.n == 5
+    # t(0.975, 4) * stdev / sqrt(n) = 2.776 * 1.581 / 2.236
+    assert interval.half_width == pytest.approx(1.963, abs=1e-3)
+
+
+def test_confidence_interval_narrows_with_confidence():
+    values = [3, 1, 4, 1, 5, 9, 2, 6]
+
+    assert trialstats.confidence_interval(values, confidence=0.9).half_width < \
+        trialstats.confidence_interval(values, confidence=0.99).half_width
+
+
+def test_confidence_interval_one_value():
+    interval = trialstats.confidence_interval([7])
+
+    assert interval.mean == 7
+    assert math.isinf(interval.half_width)
+    assert not trialstats.narrower_than(interval, 1000)
+
+
+def test_paired_confidence_interval():
+    baseline = [10, 20, 30, 40]
+    values = [11, 21.5, 30.5, 41]
+
+    interval = trialstats.paired_confidence_interval(values, baseline)
+
+    assert interval.mean == pytest.approx(1)
+    # Pairing removes the large variance shared between the two
+    assert interval.half_width < 1
+    assert trialstats.narrower_than(interval, 2)
+
+
+def test_paired_confidence_interval_different_lengths():
+    with pytest.raises(ValueError):
+        trialstats.paired_confidence_interval([1, 2, 3], [1, 2])
+
+
+def test_narrower_than():
+    interval = trialstats.ConfidenceInterval(mean=5, half_width=0.5, n=10)
+
+    assert trialstats.narrower_than(interval, 1.5)
+    assert not trialstats.narrower_than(interval, 1)
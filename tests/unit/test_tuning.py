@@ -0,0 +1,135 @@
+import os
+import random
+import pytest
+from mtg_draft_ai import tuning
+from mtg_draft_ai.brains import ConstantWeight, LinearProgressWeight, SynergyPowerFixingPicker
+from mtg_draft_ai.controller import read_cube_toml
+from .. import TEST_DATA_DIR
+
+
+@pytest.fixture
+def cube_list():
+    return read_cube_toml(os.path.join(TEST_DATA_DIR, 'cube_81183_tag_data.toml'),
+                          os.path.join(TEST_DATA_DIR, 'cube_81183_fixer_data.toml'))
+
+
+def test_default_config():
+    config = tuning.default_config()
+
+    assert config['power_delta.start'] == 2
+    assert config['power_delta.end'] == 1
+    assert config['land_fixer.weight'] == 5
+    assert len(config) == 11
+
+
+def test_weights_for():
+    weights = tuning.weights_for({'power_delta.end': 3, 'land_fixer.weight': 4})
+
+    assert set(weights) == set(SynergyPowerFixingPicker.DEFAULT_WEIGHTS)
+    assert isinstance(weights['power_delta'], LinearProgressWeight)
+    assert (weights['power_delta'].start, weights['power_delta'].end) == (2, 3)
+    assert isinstance(weights['land_fixer'], ConstantWeight)
+    assert weights['land_fixer'].weight == 4
+
+
+def test_weights_for_unknown_param():
+    with pytest.raises(ValueError):
+        tuning.weights_for({'power_delta.middle': 3})
+
+
+def test_picker_weights():
+    picker = SynergyPowerFixingPicker(common_neighbors={}, weights={'land_fixer': ConstantWeight(7)})
+    weights = {cr.name(): cr.weight for cr in picker.component_raters}
+
+    assert weights['land_fixer'].weight == 7
+    assert weights['power_delta'] is SynergyPowerFixingPicker.DEFAULT_WEIGHTS['power_delta']
+
+
+def test_sample_configs_grid():
+    configs = tuning.sample_configs({'power_delta.start': [1, 2], 'land_fixer.weight': [3, 5, 7]}, 10)
+
+    assert len(configs) == 6
+    assert {(c['power_delta.start'], c['land_fixer.weight']) for c in configs} == {
+        (1, 3), (1, 5), (1, 7), (2, 3), (2, 5), (2, 7)}
+    assert all(c['power_delta.end'] == 1 for c in configs)
+
+
+def test_sample_configs_random():
+    search_space = {'power_delta.start': [1, 2, 3], 'power_delta.end': [1, 2, 3], 'land_fixer.weight': [3, 5, 7]}
+
+    configs = tuning.sample_configs(search_space, 5, random.Random(0))
+
+    assert len(configs) == 5
+    assert len({tuning.config_key(c) for c in configs}) == 5
+    assert configs == tuning.sample_configs(search_space, 5, random.Random(0))
+
+
+def test_result_cache(tmp_path):
+    path = str(tmp_path / 'results.sqlite3')
+    config = tuning.default_config()
+
+    cache = tuning.ResultCache(path)
+    cache.put('cube', '0/8x3x15', config, 2, tuning.DraftScore(num_edges=40.5, avg_power=0.5))
+    cache.close()
+
+    cache = tuning.ResultCache(path)
+    assert cache.get('cube', '0/8x3x15', config, 2) == tuning.DraftScore(num_edges=40.5, avg_power=0.5)
+    assert cache.get('cube', '1/8x3x15', config, 2) is None
+    assert cache.get('cube', '0/8x3x15', config, 3) is None
+    cache.close()
+
+
+def test_evaluate(cube_list):
+    configs = [tuning.default_config(), {**tuning.default_config(), 'land_fixer.weight': 1}]
+    tuner = tuning.WeightTuner(cube_list, num_drafters=2)
+
+    evaluations = tuner.evaluate(configs, 1)
+
+    assert [e.config for e in evaluations] == configs
+    assert all(e.num_drafts == 1 and e.edges > 0 for e in evaluations)
+    # Cached results are reused
+    assert tuner.evaluate(configs, 1) == evaluations
+
+
+def test_evaluate_executor(cube_list):
+    configs = [tuning.default_config(), {**tuning.default_config(), 'land_fixer.weight': 1}]
+
+    with tuning.create_executor(cube_list, max_workers=2) as executor:
+        evaluations = tuning.WeightTuner(cube_list, num_drafters=2, executor=executor).evaluate(configs, 1)
+
+    assert evaluations == tuning.WeightTuner(cube_list, num_drafters=2).evaluate(configs, 1)
+
+
+class FakeTuner(tuning.WeightTuner):
+    """Scores each configuration by its land_fixer weight, recording how many drafts each one was evaluated with."""
+
+    def __init__(self):
+        self.num_drafts = {}
+
+    def evaluate(self, configs, num_drafts):
+        for config in configs:
+            self.num_drafts[config['land_fixer.weight']] = num_drafts
+        return [tuning.Evaluation(config=c, num_drafts=num_drafts, edges=c['land_fixer.weight'], power=0)
+                for c in configs]
+
+
+def test_successive_halving():
+    configs = [{'land_fixer.weight': w} for w in range(0, 9)]
+    tuner = FakeTuner()
+
+    evaluations = tuner.successive_halving(configs, min_drafts=1, max_drafts=9, eta=3)
+
+    assert [e.config['land_fixer.weight'] for e in evaluations] == [8]
+    assert evaluations[0].num_drafts == 9
+    # The worst configurations were abandoned after the first round
+    assert tuner.num_drafts == {0: 1, 1: 1, 2: 1, 3: 1, 4: 1, 5: 1, 6: 3, 7: 3, 8: 9}
+
+
+def test_successive_halving_random_search():
+    configs = [{'land_fixer.weight': w} for w in range(0, 9)]
+    tuner = FakeTuner()
+
+    evaluations = tuner.successive_halving(configs, min_drafts=4, max_drafts=4)
+
+    assert len(evaluations) == 9
+    assert set(tuner.num_drafts.values()) == {4}
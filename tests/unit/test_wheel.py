@@ -0,0 +1,57 @@
+import os
+import random
+import mock
+from mtg_draft_ai import wheel
+from mtg_draft_ai.brains import SynergyPowerFixingPicker
+from mtg_draft_ai.api import *
+from .. import TEST_DATA_DIR
+
+
+# Cards:
+# Abzan Battle Priest, Ajani's Pridemate, Lightning Helix, "Ayli, Eternal Pilgrim",
+# Tuskguard Captain, Swift Justice
+CUBE_LIST_PATH = os.path.join(TEST_DATA_DIR, 'test_picker.toml')
+FIXER_DATA_PATH = os.path.join(TEST_DATA_DIR, 'fixer_data.toml')
+
+CUBE_LIST = read_cube_toml(CUBE_LIST_PATH, FIXER_DATA_PATH)
+CARDS_BY_NAME = {c.name: c for c in CUBE_LIST}
+DRAFT_INFO = mock.Mock(name='draft_info', num_phases=3, cards_per_pack=15)
+
+
+def test_pack_too_small_to_wheel():
+    pack = _cards(['Abzan Battle Priest', "Ajani's Pridemate"])
+    seats = [wheel.SeatModel(_picker(), [], DRAFT_INFO)]
+
+    assert wheel.wheel_probabilities(pack, seats) == {card: 0.0 for card in pack}
+
+
+def test_greedy_seats():
+    pack = _cards(['Abzan Battle Priest', "Ajani's Pridemate", 'Ayli, Eternal Pilgrim', 'Tuskguard Captain'])
+    owned = _cards(['Lightning Helix'])
+    seats = [wheel.SeatModel(_picker(), owned, DRAFT_INFO), wheel.SeatModel(_picker(), owned, DRAFT_INFO)]
+
+    probabilities = wheel.wheel_probabilities(pack, seats, num_simulations=100, rng=random.Random(0))
+
+    # Both downstream seats rate Abzan Battle Priest and Ajani's Pridemate highest, and Tuskguard Captain lowest
+    assert probabilities[CARDS_BY_NAME['Abzan Battle Priest']] == 0.0
+    assert probabilities[CARDS_BY_NAME["Ajani's Pridemate"]] == 0.0
+    assert probabilities[CARDS_BY_NAME['Tuskguard Captain']] == 1.0
+    assert 0.0 < probabilities[CARDS_BY_NAME['Ayli, Eternal Pilgrim']] < 1.0
+
+
+def test_noisy_seats():
+    pack = _cards(['Abzan Battle Priest', "Ajani's Pridemate", 'Ayli, Eternal Pilgrim', 'Tuskguard Captain'])
+    seats = [wheel.SeatModel(_picker(), [], DRAFT_INFO, temperature=wheel.HUMAN_TEMPERATURE)]
+
+    probabilities = wheel.wheel_probabilities(pack, seats, num_simulations=100, rng=random.Random(0))
+
+    assert set(probabilities.keys()) == set(pack)
+    assert all(0.0 <= p <= 1.0 for p in probabilities.values())
+
+
+def _picker():
+    return SynergyPowerFixingPicker.factory(CUBE_LIST).create()
+
+
+def _cards(card_names):
+    return [CARDS_BY_NAME[n] for n in card_names]
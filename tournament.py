@@ -0,0 +1,47 @@
+import argparse
+import time
+
+from mtg_draft_ai import tournament, trialstats
+from mtg_draft_ai.api import read_cube_toml
+from mtg_draft_ai.brains import PICKERS
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Compares pickers drafting at mixed tables over the same seeded pack sets, rotating seats.')
+    parser.add_argument('n', type=int, help='Number of pack sets to draft, each once per picker')
+    parser.add_argument('--pickers', nargs='+', choices=sorted(PICKERS.keys()),
+                        default=['PowerFixingPicker', 'SynergyPowerFixingPicker'],
+                        help='Pickers to compare, the first is the baseline')
+    parser.add_argument('--card-data', type=str, help='Card data TOML file', default='cube_81183_tag_data.toml')
+    parser.add_argument('--fixer-data', type=str, help='Fixer data TOML file', default='cube_81183_fixer_data.toml')
+    parser.add_argument('--seed', type=int, help='Random seed for generating the pack sets', default=0)
+    parser.add_argument('--processes', type=int, default=None,
+                        help='Number of processes to run drafts on, defaults to the number of CPUs. 1 runs serially')
+    parser.add_argument('--confidence', type=float, default=0.95, help='Confidence level of the intervals')
+
+    args = parser.parse_args()
+
+    cube_list = read_cube_toml(args.card_data, args.fixer_data)
+
+    start = time.perf_counter()
+    if args.processes == 1:
+        seat_results = tournament.run_tournament(cube_list, args.pickers, args.n, seed=args.seed)
+    else:
+        with tournament.create_executor(cube_list, args.pickers, max_workers=args.processes) as executor:
+            seat_results = tournament.run_tournament(cube_list, args.pickers, args.n, seed=args.seed,
+                                                     executor=executor)
+    print('Ran {} drafts in {:.1f}s'.format(args.n * len(args.pickers), time.perf_counter() - start))
+
+    print('{:.0%} confidence intervals, over {} pack sets:'.format(args.confidence, args.n))
+    for summary in tournament.summarize(seat_results, args.pickers, args.confidence):
+        print('{}: edges {}, power {}'.format(summary.picker, trialstats.format_interval(summary.edges),
+                                              trialstats.format_interval(summary.power)))
+        if summary.edges_difference is not None:
+            print('    vs {}: edges {}, power {}'.format(
+                args.pickers[0], trialstats.format_interval(summary.edges_difference),
+                trialstats.format_interval(summary.power_difference)))
+
+
+if __name__ == '__main__':
+    main()
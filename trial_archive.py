@@ -0,0 +1,38 @@
+import argparse
+import sys
+
+from mtg_draft_ai.trialarchive import TrialArchive
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Lists, prints or extracts trial artifacts from a trials.py archive.')
+    parser.add_argument('archive', type=str, help='Archive written by trials.py --archive')
+    parser.add_argument('trial', type=str, nargs='?', default=None,
+                        help='Trial to read. Lists every trial if not provided')
+    parser.add_argument('artifact', type=str, nargs='?', default=None,
+                        help='Artifact to print, e.g. draft.html. Lists the trial\'s artifacts if not provided')
+    parser.add_argument('-x', '--extract', type=str, default=None, metavar='DIR',
+                        help='Write every artifact of the trial to files in this directory instead')
+
+    args = parser.parse_args()
+
+    archive = TrialArchive(args.archive)
+    if args.trial is None:
+        for trial in archive.trials():
+            print(trial)
+    elif args.extract:
+        for path in archive.extract(args.trial, args.extract):
+            print('Extracted {}'.format(path))
+    elif args.artifact is None:
+        for name in archive.names(args.trial):
+            print(name)
+    else:
+        data = archive.get(args.trial, args.artifact)
+        if data is None:
+            sys.exit('No artifact {} for trial {} in {}'.format(args.artifact, args.trial, args.archive))
+        sys.stdout.buffer.write(data)
+    archive.close()
+
+
+if __name__ == '__main__':
+    main()
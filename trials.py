@@ -1,56 +1,241 @@
 import argparse
 from collections import namedtuple
 import contextlib
+import cProfile
+import functools
+import io
+import json
 import os
+import pstats
+import random
 import statistics
 
 from mtg_draft_ai.controller import *
 from mtg_draft_ai.api import *
 from mtg_draft_ai.brains import *
-from mtg_draft_ai import draftlog, deckbuild, display
+from mtg_draft_ai import (draftlog, deckbuild, deckcache, deckscore, display, profiling, trialarchive, trialmanifest,
+                          trialstats)
 
 
 def main():
     parser = argparse.ArgumentParser(description='Run N full drafts + deckbuilds for each, with all logs saved.')
-    parser.add_argument('n', type=int, help='Number of drafts to run')
+    parser.add_argument('n', type=int,
+                        help='Number of drafts to run, or the maximum number if a confidence interval width is given')
     parser.add_argument('--card-data', type=str, help='Card data TOML file', default='cube_81183_tag_data.toml')
     parser.add_argument('--fixer-data', type=str, help='Fixer data TOML file', default='cube_81183_fixer_data.toml')
     parser.add_argument('-d', '--dir', type=str, help='Output directory for files', default='output')
+    parser.add_argument('--log-format', choices=['toml', 'binary'], help='Format for draft logs', default='toml')
+    parser.add_argument('--archive', type=str, default=None,
+                        help='Optional archive file to add every trial\'s logs and HTML to, instead of writing '
+                             'separate files to the output directory. Read it with trial_archive.py')
+    parser.add_argument('--results', type=str, default=None,
+                        help='Optional sqlite file to record the result of every completed trial in. Trials already '
+                             'in it are skipped, so interrupted or extended runs only run the trials they\'re missing. '
+                             'Requires --seed')
+    parser.add_argument('--deckbuild-cache', type=str, default=None,
+                        help='Optional sqlite file to cache built decks in, so identical pools are only built once')
+    parser.add_argument('--picker', choices=sorted(PICKERS.keys()), default='SynergyPowerFixingPicker',
+                        help='Picker used by every drafter')
+    parser.add_argument('--compare-to', choices=sorted(PICKERS.keys()), default=None,
+                        help='Also run each draft with this picker on the same packs, and report the difference')
+    parser.add_argument('--seed', type=int, default=None,
+                        help='Random seed, so the same drafts can be run again. Random if not provided')
+    parser.add_argument('--edges-ci-width', type=float, default=None,
+                        help='Stop once the confidence interval for mean # of edges is narrower than this')
+    parser.add_argument('--power-ci-width', type=float, default=None,
+                        help='Stop once the confidence interval for mean avg deck power is narrower than this')
+    parser.add_argument('--confidence', type=float, default=0.95, help='Confidence level of the intervals')
+    parser.add_argument('--component-timings', action='store_true',
+                        help='Time every component rater of each picker, and write the timings of every pick to the '
+                             'output directory')
+    parser.add_argument('--profile', action='store_true',
+                        help='Profile the trials, and write the time taken by each stage of the trials, the hottest '
+                             'functions and sampled call stacks for flamegraphs to the output directory')
+    parser.add_argument('--profile-top', type=int, default=40,
+                        help='Number of functions to list in the hot function report')
 
     args = parser.parse_args()
+    if args.results and args.seed is None:
+        parser.error('--results requires --seed, since trials are identified by their seed')
 
     cube_list = read_cube_toml(args.card_data, args.fixer_data)
     draft_info = DraftInfo(card_list=cube_list, num_drafters=8, num_phases=3, cards_per_pack=15)
-    drafter_factory = SynergyPowerFixingPicker.factory(cube_list)
-
-    deck_metrics = []
+    scorer = deckscore.DeckScorer(cube_list)
+
+    deckbuild_fn = functools.partial(deckbuild.best_two_color_synergy_build, prune=True,
+                                     on_results=_print_build_results)
+    deckbuild_options = deckcache.deckbuild_options(deckbuild_fn)
+    if args.deckbuild_cache:
+        cache = deckcache.DeckbuildCache(args.deckbuild_cache)
+        deckbuild_fn = functools.partial(cache.build, version=deckcache.cube_version(cube_list),
+                                         deckbuild_fn=deckbuild_fn, options=deckbuild_options)
+
+    pickers = [args.picker] + ([args.compare_to] if args.compare_to else [])
+    drafter_factories = {picker: PICKERS[picker].factory(cube_list) for picker in pickers}
+
+    # Completed trials are identified by the picker configuration, cube, draft settings and seed
+    manifest = trialmanifest.TrialManifest(args.results) if args.results else None
+    picker_configs = {picker: trialmanifest.picker_config_hash(factory.create())
+                      for picker, factory in drafter_factories.items()}
+    cube_version = deckcache.cube_version(cube_list)
+    settings = json.dumps({'num_drafters': draft_info.num_drafters, 'num_phases': draft_info.num_phases,
+                           'cards_per_pack': draft_info.cards_per_pack, 'deckbuild': deckbuild_options,
+                           'deckbuild_version': deckbuild.BUILD_VERSION}, sort_keys=True)
+
+    if args.component_timings:
+        for factory in drafter_factories.values():
+            factory.enable_timing()
+    target_widths = {metric: width for metric, width in [('edges', args.edges_ci_width),
+                                                           ('power', args.power_ci_width)] if width is not None}
+
+    archive = trialarchive.TrialArchive(args.archive) if args.archive else None
+
+    seed = args.seed if args.seed is not None else random.randrange(2 ** 32)
+    print('Seed: {}'.format(seed))
+
+    stage_timer = profiling.StageTimer()
+    if args.profile:
+        profiler = cProfile.Profile()
+        sampler = profiling.StackSampler(stage_timer=stage_timer)
+        sampler.start()
+        profiler.enable()
+
+    # Metrics for every deck from each draft, per picker
+    draft_metrics = {picker: [] for picker in pickers}
+    num_completed_before = 0
     for i in range(0, args.n):
-        deck_metrics += run_trial(name=i, output_dir=args.dir, draft_info=draft_info, drafter_factory=drafter_factory,
-                                  deckbuild_fn=deckbuild.best_two_color_synergy_build)
-
-    edge_counts = [dm.num_edges for dm in deck_metrics]
-    avg_power_values = [dm.avg_power for dm in deck_metrics]
-
-    print('Mean # of edges: {}'.format(statistics.mean(edge_counts)))
-    print('Median # of edges: {}'.format(statistics.median(edge_counts)))
-    print('Mean avg deck power: {}'.format(statistics.mean(avg_power_values)))
-    print('Median avg deck power: {}'.format(statistics.median(avg_power_values)))
+        for picker in pickers:
+            trial_seed = '{}-{}'.format(seed, i)
+            trial_key = (picker_configs[picker], cube_version, settings, trial_seed)
+            completed = manifest.get(*trial_key) if manifest else None
+            if completed is not None:
+                draft_metrics[picker].append([DeckMetrics(*dm) for dm in completed])
+                num_completed_before += 1
+                continue
+
+            # Reseeding before each picker's run gives every picker the same packs for the same draft
+            random.seed(trial_seed)
+            name = i if len(pickers) == 1 else '{}-{}'.format(i, picker)
+            metrics = run_trial(name=name, output_dir=args.dir, draft_info=draft_info,
+                                drafter_factory=drafter_factories[picker], deckbuild_fn=deckbuild_fn,
+                                log_format=args.log_format, scorer=scorer, stage_timer=stage_timer, archive=archive)
+            draft_metrics[picker].append(metrics)
+            if manifest:
+                manifest.put(*trial_key, result=[list(dm) for dm in metrics], name=name)
+
+        if target_widths:
+            intervals = metric_intervals(draft_metrics, pickers, args.confidence)
+            print('After {} drafts: {}'.format(i + 1, _format_intervals(intervals)))
+            if all(trialstats.narrower_than(intervals[metric], width) for metric, width in target_widths.items()):
+                print('All confidence intervals are narrower than their targets, stopping')
+                break
+
+    if manifest:
+        print('Reused {} trials completed by earlier runs, from {}'.format(num_completed_before, args.results))
+
+    if args.profile:
+        profiler.disable()
+        sampler.stop()
+        write_profile(args.dir, stage_timer, profiler, sampler, args.profile_top)
+
+    for picker in pickers:
+        deck_metrics = [dm for metrics in draft_metrics[picker] for dm in metrics]
+        edge_counts = [dm.num_edges for dm in deck_metrics]
+        avg_power_values = [dm.avg_power for dm in deck_metrics]
+
+        if len(pickers) > 1:
+            print('{}:'.format(picker))
+        print('Mean # of edges: {}'.format(statistics.mean(edge_counts)))
+        print('Median # of edges: {}'.format(statistics.median(edge_counts)))
+        print('Mean avg deck power: {}'.format(statistics.mean(avg_power_values)))
+        print('Median avg deck power: {}'.format(statistics.median(avg_power_values)))
+
+    print('{:.0%} confidence intervals: {}'.format(
+        args.confidence, _format_intervals(metric_intervals(draft_metrics, pickers, args.confidence))))
+
+    if args.component_timings:
+        for picker in pickers:
+            timings = drafter_factories[picker].timings
+            timings_file = os.path.join(args.dir, 'component-timings_{}.json'.format(picker))
+            with open(timings_file, 'w') as f:
+                json.dump(timings.to_dict(), f)
+            print('{} component timings over {} picks, written to {}:\n{}'.format(
+                picker, timings.num_picks, timings_file, timings.format_summary()))
+
+
+def metric_intervals(draft_metrics, pickers, confidence=0.95):
+    """Computes confidence intervals for mean # of edges and mean avg deck power.
+
+    Decks from the same draft aren't independent, so each draft is one observation: the mean over its decks. With
+    two pickers, the intervals are for the first picker's metrics minus the second's, paired by draft.
+
+    Args:
+        draft_metrics (Dict[str, List[List[DeckMetrics]]]): Metrics for each deck from each draft, per picker.
+        pickers (List[str]): One or two pickers from draft_metrics.
+        confidence (float): Confidence level of the intervals.
+
+    Returns:
+        Dict[str, ConfidenceInterval]: Intervals for the 'edges' and 'power' metrics.
+    """
+    intervals = {}
+    for metric, field in [('edges', 'num_edges'), ('power', 'avg_power')]:
+        per_draft = [[statistics.mean(getattr(dm, field) for dm in metrics) for metrics in draft_metrics[picker]]
+                     for picker in pickers]
+        if len(pickers) == 1:
+            intervals[metric] = trialstats.confidence_interval(per_draft[0], confidence)
+        else:
+            intervals[metric] = trialstats.paired_confidence_interval(per_draft[0], per_draft[1], confidence)
+    return intervals
+
+
+def write_profile(output_dir, stage_timer, profiler, sampler, top_n):
+    """Writes the time taken by each stage, the top_n hottest functions by cumulative and by own time, the raw
+    cProfile stats (e.g. for snakeviz) and the sampled call stacks (e.g. for flamegraph.pl or speedscope)."""
+    stages_file = os.path.join(output_dir, 'profile-stages.txt')
+    with open(stages_file, 'w') as f:
+        f.write(stage_timer.format_report() + '\n')
+    print('Time by stage, written to {}:\n{}'.format(stages_file, stage_timer.format_report()))
+
+    top_file = os.path.join(output_dir, 'profile-top.txt')
+    with open(top_file, 'w') as f:
+        stats = pstats.Stats(profiler, stream=f).strip_dirs()
+        for sort_key, description in [('cumulative', 'cumulative time'), ('tottime', 'own time')]:
+            f.write('Top {} functions by {}:\n'.format(top_n, description))
+            stats.sort_stats(sort_key).print_stats(top_n)
+
+    stats_file = os.path.join(output_dir, 'profile.prof')
+    profiler.dump_stats(stats_file)
+    stacks_file = os.path.join(output_dir, 'profile-stacks.txt')
+    sampler.write_collapsed(stacks_file)
+    print('Hot functions written to {}, cProfile stats to {} and collapsed stacks to {}'.format(
+        top_file, stats_file, stacks_file))
+
+
+def _format_intervals(intervals):
+    return ', '.join('{} {}'.format(metric, trialstats.format_interval(interval))
+                     for metric, interval in intervals.items())
 
 
 DeckMetrics = namedtuple('DeckMetrics', ['num_edges', 'avg_power'])
 
 
-def run_trial(name, output_dir, draft_info, drafter_factory, deckbuild_fn):
-    draft_log_file = os.path.join(output_dir, 'draft-log_{}.txt'.format(name))
-    draft_html_file = os.path.join(output_dir, 'draft_{}.html'.format(name))
-    draft_debug_file = os.path.join(output_dir, 'draft-debug_{}.txt'.format(name))
-    build_html_file = os.path.join(output_dir, 'build_{}.html'.format(name))
-    build_debug_file = os.path.join(output_dir, 'build-debug_{}.txt'.format(name))
+def run_trial(name, output_dir, draft_info, drafter_factory, deckbuild_fn, log_format='toml', scorer=None,
+              stage_timer=None, archive=None):
+    log_extension = 'bin' if log_format == 'binary' else 'txt'
+    draft_log_file = 'draft-log.{}'.format(log_extension)
+    draft_html_file = 'draft.html'
+    draft_debug_file = 'draft-debug.txt'
+    build_html_file = 'build.html'
+    build_debug_file = 'build-debug.txt'
+
+    # Time taken by each stage, e.g. for trials.py --profile
+    stage = (stage_timer or profiling.StageTimer()).stage
+    artifacts = _ArtifactWriter(name, output_dir, archive)
 
     drafters = [Drafter(drafter_factory.create(), draft_info) for _ in range(0, draft_info.num_drafters)]
 
     # Run draft, redirecting output to debug file
-    with open(draft_debug_file, 'w') as f:
+    with stage('draft'), artifacts.open(draft_debug_file) as f:
         with contextlib.redirect_stdout(f):
             controller = DraftController.create(draft_info, drafters)
             controller.run_draft()
@@ -59,54 +244,91 @@ def run_trial(name, output_dir, draft_info, drafter_factory, deckbuild_fn):
             for drafter in drafters:
                 print('{}\n'.format(drafter))
 
-    # Write draft log - toml file recording all picks in draft
-    with open(draft_log_file, 'w') as f:
-        f.write(draftlog.dumps_log(drafters, draft_info))
-    print('Draft log written to {}'.format(draft_log_file))
+    # Write draft log - toml or binary file recording all picks in draft
+    with stage('log_write'):
+        if log_format == 'binary':
+            with artifacts.open(draft_log_file, 'wb') as f:
+                f.write(draftlog.dumps_binary_log(drafters, draft_info))
+        else:
+            with artifacts.open(draft_log_file) as f:
+                f.write(draftlog.dumps_log(drafters, draft_info))
+    print('Draft log written to {}'.format(artifacts.location(draft_log_file)))
 
     # Write draft.html - HTML display of full draft from every seat
-    html = draftlog.log_to_html(draft_log_file)
-    with open(draft_html_file, 'w') as f:
-        f.write(html)
-    print('Draft HTML written to {}'.format(draft_html_file))
+    with stage('html_render'), artifacts.open(draft_html_file) as f:
+        draftlog.write_drafters_html(drafters, f)
+    print('Draft HTML written to {}'.format(artifacts.location(draft_html_file)))
 
     # Run deckbuild, redirecting output to debug file
-    with open(build_debug_file, 'w') as f:
+    with stage('deckbuild'), artifacts.open(build_debug_file) as f:
         with contextlib.redirect_stdout(f):
-            decks = [deckbuild_fn(d.cards_owned) for d in drafters]
+            decks = []
+            for seat, drafter in enumerate(drafters):
+                print('Seat {}:'.format(seat))
+                decks.append(deckbuild_fn(drafter.cards_owned))
+
+    # Score every deck at once against the cube's synergy graph
+    with stage('metrics'):
+        scorer = scorer or deckscore.DeckScorer(draft_info.card_list)
+        scores = scorer.score([scorer.card_ids(d) for d in decks])
 
     # Write build.html - HTML display of final built decks for every seat
-    with open(build_html_file, 'w') as f:
-        f.write(decks_to_html(decks))
-    print('Build HTML written to {}'.format(build_html_file))
+    with stage('html_render'), artifacts.open(build_html_file) as f:
+        sorted_decks = [scorer.cards_for(order) for order in scores.centrality_orders]
+        write_sorted_decks_html(sorted_decks, scores.num_edges, f)
+    print('Build HTML written to {}'.format(artifacts.location(build_html_file)))
+
+    if archive is not None:
+        with stage('archive_write'):
+            artifacts.flush()
 
     # Return # of edges in each deck
-    return [DeckMetrics(num_edges=edges_in_deck(d), avg_power=avg_power(d)) for d in decks]
+    return [DeckMetrics(num_edges=int(num_edges), avg_power=float(power))
+            for num_edges, power in zip(scores.num_edges, scores.avg_power)]
+
+
+def _print_build_results(results):
+    print(deckbuild.format_build_results(results))
 
 
-def edges_in_deck(deck):
-    deck_graph = synergy.create_graph(deck)
-    return len(deck_graph.edges)
+class _ArtifactWriter:
+    """Opens a trial's artifacts as files in the output directory, or as in-memory files which flush adds to an
+    archive all at once."""
 
+    def __init__(self, trial, output_dir, archive=None):
+        self.trial = trial
+        self.output_dir = output_dir
+        self.archive = archive
+        self._contents = {}
 
-def avg_power(deck):
-    return statistics.mean([power_rating(card) for card in deck
-                            if 'land' not in card.types])
+    @contextlib.contextmanager
+    def open(self, artifact, mode='w'):
+        if self.archive is None:
+            with open(os.path.join(self.output_dir, trialarchive.file_name(self.trial, artifact)), mode) as f:
+                yield f
+        else:
+            f = io.BytesIO() if 'b' in mode else io.StringIO()
+            yield f
+            self._contents[artifact] = f.getvalue()
 
+    def location(self, artifact):
+        if self.archive is None:
+            return os.path.join(self.output_dir, trialarchive.file_name(self.trial, artifact))
+        return '{} ({} of trial {})'.format(self.archive.path, artifact, self.trial)
 
-def decks_to_html(decks):
-    html = display.default_style()
+    def flush(self):
+        if self.archive is not None:
+            self.archive.put(self.trial, self._contents)
+            self._contents = {}
 
-    i = 0
-    for deck in decks:
-        deck_graph = synergy.create_graph(deck, remove_isolated=False)
-        sorted_deck = [tup[0] for tup in synergy.sorted_centralities(deck_graph)]
 
-        html += 'Deck {} - {} - # Edges: {} \n'.format(i, deck_colors(sorted_deck), len(deck_graph.edges))
-        html += '<div>\n{}</div>\n'.format(display.cards_to_html(sorted_deck))
-        i += 1
+def write_sorted_decks_html(sorted_decks, edge_counts, f):
+    """Writes decks whose cards are already sorted for display (e.g. by centrality), with their edge counts."""
+    f.write(display.default_style())
 
-    return html
+    for i, (sorted_deck, num_edges) in enumerate(zip(sorted_decks, edge_counts)):
+        f.write('Deck {} - {} - # Edges: {} \n'.format(i, deck_colors(sorted_deck), num_edges))
+        f.write('<div>\n{}</div>\n'.format(display.cards_to_html(sorted_deck)))
 
 
 def deck_colors(deck):
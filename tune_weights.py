@@ -0,0 +1,65 @@
+import argparse
+import random
+import time
+
+from mtg_draft_ai import tuning
+from mtg_draft_ai.api import read_cube_toml
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Searches for better SynergyPowerFixingPicker weights with simulated drafts and deckbuilds.')
+    parser.add_argument('-n', '--num-configs', type=int, default=27,
+                        help='Number of configurations to sample. The whole grid is searched if it\'s smaller')
+    parser.add_argument('--search-space', type=str, default=None,
+                        help='TOML file with a table per component, mapping "start" and "end" (or "weight" for '
+                             'constant weights) to lists of candidate values')
+    parser.add_argument('--min-drafts', type=int, default=2,
+                        help='Number of drafts to evaluate every configuration with')
+    parser.add_argument('--max-drafts', type=int, default=18,
+                        help='Number of drafts to evaluate the best configurations with. Equal to --min-drafts for '
+                             'plain random search')
+    parser.add_argument('--eta', type=int, default=3,
+                        help='Keep the best 1/eta configurations after each round, with eta times as many drafts')
+    parser.add_argument('--metric', choices=tuning.METRICS, default='edges', help='Metric to maximize')
+    parser.add_argument('--card-data', type=str, help='Card data TOML file', default='cube_81183_tag_data.toml')
+    parser.add_argument('--fixer-data', type=str, help='Fixer data TOML file', default='cube_81183_fixer_data.toml')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed for sampling configurations and drafts')
+    parser.add_argument('--cache', type=str, default='output/tuning_cache.sqlite3',
+                        help='sqlite file to cache draft results for each configuration in')
+    parser.add_argument('--processes', type=int, default=None,
+                        help='Number of processes to run drafts on, defaults to the number of CPUs. 1 runs serially')
+
+    args = parser.parse_args()
+
+    search_space = tuning.load_search_space(args.search_space) if args.search_space else tuning.DEFAULT_SEARCH_SPACE
+
+    cube_list = read_cube_toml(args.card_data, args.fixer_data)
+    configs = tuning.sample_configs(search_space, args.num_configs, random.Random(args.seed))
+    # Always include the current weights, to compare the rest against
+    if tuning.default_config() not in configs:
+        configs.append(tuning.default_config())
+
+    def print_round(num_drafts, evaluations):
+        print('{} configurations with {} drafts each, after {:.1f}s:'.format(
+            len(evaluations), num_drafts, time.perf_counter() - start))
+        for evaluation in evaluations[:5]:
+            print('    edges {:.2f}, power {:.4f}{}: {}'.format(
+                evaluation.edges, evaluation.power,
+                ' (default)' if evaluation.config == tuning.default_config() else '',
+                tuning.changed_params(evaluation.config)))
+
+    start = time.perf_counter()
+    cache = tuning.ResultCache(args.cache)
+    if args.processes == 1:
+        tuner = tuning.WeightTuner(cube_list, seed=args.seed, cache=cache)
+        tuner.successive_halving(configs, args.min_drafts, args.max_drafts, args.metric, args.eta, print_round)
+    else:
+        with tuning.create_executor(cube_list, max_workers=args.processes) as executor:
+            tuner = tuning.WeightTuner(cube_list, seed=args.seed, cache=cache, executor=executor)
+            tuner.successive_halving(configs, args.min_drafts, args.max_drafts, args.metric, args.eta, print_round)
+    cache.close()
+
+
+if __name__ == '__main__':
+    main()
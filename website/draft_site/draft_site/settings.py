@@ -113,6 +113,18 @@ LOGGING = {
     },
 }
 
+# Number of worker processes used to build color combinations concurrently on the auto-build page.
+# 0 builds them one at a time in the request thread.
+AUTOBUILD_PROCESSES = int(os.getenv('AUTOBUILD_PROCESSES', '0'))
+
+# Seconds spent searching for a better deck for each color combination on the auto-build page, on top of the
+# community-based build. 0 uses the community-based build only.
+AUTOBUILD_SEARCH_SECONDS = float(os.getenv('AUTOBUILD_SEARCH_SECONDS', '0.02'))
+
+# Sqlite file the auto-build page caches built decks in, keyed by pool, so decks for pools that were already built
+# (e.g. completed drafts) are shown without rebuilding them.
+DECKBUILD_CACHE_PATH = os.getenv('DECKBUILD_CACHE_PATH', os.path.join(BASE_DIR, 'deckbuild_cache.sqlite3'))
+
 # Password validation
 # https://docs.djangoproject.com/en/2.1/ref/settings/#auth-password-validators
 
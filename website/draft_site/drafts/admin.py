@@ -6,3 +6,4 @@ from .models import *
 admin.site.register(Draft)
 admin.site.register(Card)
 admin.site.register(Drafter)
+admin.site.register(AutoBuild)
@@ -0,0 +1,166 @@
+"""Builds decks for drafters' pools on a background worker once their draft is complete."""
+
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import functools
+import hashlib
+import json
+import logging
+import statistics
+import threading
+
+from django.conf import settings
+from django.db import close_old_connections
+
+from . import models
+from .constants import CUBES_BY_ID
+from mtg_draft_ai.brains import power_rating
+from mtg_draft_ai.deckbuild import BUILD_VERSION, best_two_color_synergy_build, local_search_build
+from mtg_draft_ai.deckcache import DeckbuildCache, deckbuild_options
+from mtg_draft_ai import synergy
+
+LOGGER = logging.getLogger(__name__)
+
+_worker = None
+_executor = None
+_deck_cache = None
+_lock = threading.Lock()
+# Drafts and pools with builds queued on the background worker, so reloading a page doesn't queue them again
+_queued = set()
+
+
+def enqueue_auto_builds(draft):
+    """Queues builds for every seat of a completed draft on the background worker, unless they're already queued."""
+    _enqueue(('draft', draft.id), _build_draft, draft.id)
+
+
+def auto_build_for(drafter):
+    """Returns the drafter's AutoBuild for the current build version, or None if it's being built.
+
+    Builds never run on the request path. If a completed draft has no saved builds (e.g. it was completed before
+    builds were precomputed, or its background build failed), they're queued. A drafter who's still drafting gets an
+    unsaved AutoBuild of their current pool, once a queued build of it has added the deck to the deck cache.
+    """
+    cube_data = CUBES_BY_ID[drafter.draft.cube_id]
+    auto_build = models.AutoBuild.objects.filter(drafter=drafter, build_version=_build_version(cube_data)).first()
+    if auto_build:
+        return auto_build
+
+    if drafter.current_phase >= drafter.draft.num_phases:
+        enqueue_auto_builds(drafter.draft)
+        return None
+
+    pool = _pool(drafter, cube_data)
+    deck = _deckbuild_cache().lookup(pool, cube_data.version, deckbuild_options(_deckbuild_fn()))
+    if deck is None:
+        _enqueue(('pool', drafter.id, len(pool)), _build_pool, drafter.id)
+        return None
+    return models.AutoBuild(drafter=drafter, **_build_fields(deck, cube_data))
+
+
+def save_auto_build(drafter):
+    """Builds a deck from the drafter's pool and saves it as their AutoBuild."""
+    cube_data = CUBES_BY_ID[drafter.draft.cube_id]
+    auto_build, _ = models.AutoBuild.objects.update_or_create(
+        drafter=drafter, defaults=_build_fields(_build(drafter, cube_data), cube_data))
+    return auto_build
+
+
+def _build_version(cube_data):
+    key = json.dumps([cube_data.version, BUILD_VERSION, deckbuild_options(_deckbuild_fn())])
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+
+def _deckbuild_fn(executor=None):
+    # With no time to search, local_search_build returns the community-based build
+    build_fn = functools.partial(local_search_build, time_budget=settings.AUTOBUILD_SEARCH_SECONDS)
+    return functools.partial(best_two_color_synergy_build, build_fn=build_fn, executor=executor,
+                             batch_size=settings.AUTOBUILD_PROCESSES or None, prune=True)
+
+
+def _pool(drafter, cube_data):
+    return [cube_data.card_by_name(c.name) for c in drafter.owned_cards()]
+
+
+def _build(drafter, cube_data):
+    deckbuild_fn = _deckbuild_fn(_deckbuild_executor())
+    return _deckbuild_cache().build(_pool(drafter, cube_data), cube_data.version, deckbuild_fn,
+                                    options=deckbuild_options(deckbuild_fn))
+
+
+def _build_fields(deck, cube_data):
+    return {
+        'deck': json.dumps([c.name for c in deck]),
+        'num_edges': len(synergy.create_graph(deck, remove_isolated=False).edges),
+        # TODO: fix interface
+        'avg_power': statistics.mean([power_rating(c) for c in deck if 'land' not in c.types]),
+        'build_version': _build_version(cube_data),
+    }
+
+
+def _enqueue(key, fn, *args):
+    with _lock:
+        if key in _queued:
+            return
+        _queued.add(key)
+
+    def run():
+        try:
+            fn(*args)
+        finally:
+            with _lock:
+                _queued.discard(key)
+
+    _background_worker().submit(run)
+
+
+def _build_draft(draft_id):
+    # Runs on the worker thread, which needs its own database connection
+    close_old_connections()
+    try:
+        for drafter in models.Drafter.objects.filter(draft_id=draft_id).select_related('draft'):
+            try:
+                save_auto_build(drafter)
+            except Exception:
+                LOGGER.exception('Failed to precompute auto-build for draft %s, seat %s', draft_id, drafter.seat)
+    finally:
+        close_old_connections()
+
+
+def _build_pool(drafter_id):
+    # Builds the pool of a drafter who's still drafting into the deck cache, without saving it
+    close_old_connections()
+    try:
+        drafter = models.Drafter.objects.select_related('draft').get(id=drafter_id)
+        _build(drafter, CUBES_BY_ID[drafter.draft.cube_id])
+    except Exception:
+        LOGGER.exception('Failed to build the current pool of drafter %s', drafter_id)
+    finally:
+        close_old_connections()
+
+
+def _background_worker():
+    global _worker
+    with _lock:
+        if _worker is None:
+            # A single thread, so precomputing builds never takes more than one core away from serving requests
+            _worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix='autobuild')
+    return _worker
+
+
+def _deckbuild_executor():
+    global _executor
+    if not settings.AUTOBUILD_PROCESSES:
+        return None
+
+    with _lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(max_workers=settings.AUTOBUILD_PROCESSES)
+    return _executor
+
+
+def _deckbuild_cache():
+    global _deck_cache
+    with _lock:
+        if _deck_cache is None:
+            _deck_cache = DeckbuildCache(settings.DECKBUILD_CACHE_PATH)
+    return _deck_cache
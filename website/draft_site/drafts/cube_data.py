@@ -3,6 +3,7 @@ import urllib
 from multiprocessing.pool import ThreadPool
 
 from mtg_draft_ai.api import Card, read_cube_toml
+from mtg_draft_ai.deckcache import cube_version
 
 from django.conf import settings
 import requests
@@ -23,6 +24,8 @@ class CubeData:
         self.autobuild_enabled = autobuild_enabled
 
         self.cards_by_name = {c.name: c for c in cards}
+        # Identifies this version of the cube's card data, e.g. for caching built decks
+        self.version = cube_version(cards)
 
     @staticmethod
     def load(name, cube_id, cubecobra_id, cube_file_name, fixer_data_file_name, image_urls_file_name, picker_class,
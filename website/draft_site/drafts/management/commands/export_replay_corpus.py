@@ -0,0 +1,78 @@
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from drafts.models import Draft
+from drafts.pick_history import completed_drafts, pick_history
+
+from mtg_draft_ai import draftlog
+from mtg_draft_ai.api import Card, DraftInfo
+from mtg_draft_ai.api import Drafter as DraftLogDrafter
+
+
+DEFAULT_OUTPUT_DIR = os.path.join(settings.BASE_DIR, 'replay_corpus')
+
+
+class Command(BaseCommand):
+    help = 'Exports completed drafts as draft logs, for replaying through pickers with picker_benchmark.py'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output-dir',
+            default=DEFAULT_OUTPUT_DIR,
+            help='Directory to write draft logs to',
+        )
+        parser.add_argument(
+            '--cube-id',
+            type=int,
+            default=None,
+            help='Only exports drafts of this cube',
+        )
+        parser.add_argument(
+            '--log-format',
+            choices=['toml', 'binary'],
+            default='binary',
+            help='Format for draft logs',
+        )
+
+    def handle(self, *args, **options):
+        os.makedirs(options['output_dir'], exist_ok=True)
+        extension = 'bin' if options['log_format'] == 'binary' else 'txt'
+
+        drafts = Draft.objects.all()
+        if options['cube_id'] is not None:
+            drafts = drafts.filter(cube_id=options['cube_id'])
+
+        # Only completed drafts are exported. Logs which already exist are never rewritten, so the corpus stays fixed
+        # as new drafts are added to it.
+        num_exported = 0
+        for draft in completed_drafts(drafts):
+            path = os.path.join(options['output_dir'], 'draft-log_website-{}.{}'.format(draft.id, extension))
+            if os.path.exists(path):
+                continue
+
+            drafters, draft_info = _log_drafters(draft)
+            if options['log_format'] == 'binary':
+                with open(path, 'wb') as f:
+                    f.write(draftlog.dumps_binary_log(drafters, draft_info))
+            else:
+                with open(path, 'w') as f:
+                    f.write(draftlog.dumps_log(drafters, draft_info))
+            num_exported += 1
+
+        print('Exported {} new drafts to {}'.format(num_exported, options['output_dir']))
+
+
+def _log_drafters(draft):
+    """Converts a completed draft into mtg_draft_ai Drafters with pick history, ordered by seat."""
+    draft_info = DraftInfo(card_list=[], num_drafters=draft.num_drafters, num_phases=draft.num_phases,
+                           cards_per_pack=draft.cards_per_pack)
+
+    drafters = []
+    for drafter_picks in pick_history(draft, draft.drafter_set.order_by('seat')):
+        drafter = DraftLogDrafter(picker=None, draft_info=draft_info)
+        for pack, picked in drafter_picks:
+            drafter.pack_history.append([Card(name=c.name) for c in pack])
+            drafter.cards_owned.append(Card(name=picked.name))
+        drafters.append(drafter)
+    return drafters, draft_info
@@ -0,0 +1,61 @@
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from drafts.models import Draft
+from drafts.pick_history import completed_drafts
+
+from mtg_draft_ai.pickstats import PickOrderIndex
+
+
+DEFAULT_INDEX_FILE = os.path.join(settings.BASE_DIR, 'pick_order_index.npz')
+
+
+class Command(BaseCommand):
+    help = 'Adds picks from completed drafts which are not indexed yet to the pick order index'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--index-file',
+            default=DEFAULT_INDEX_FILE,
+            help='Path of the pick order index to update',
+        )
+        parser.add_argument(
+            '--top',
+            type=int,
+            default=0,
+            help='Prints the N cards with the earliest average pick after indexing',
+        )
+
+    def handle(self, *args, **options):
+        index = PickOrderIndex.load(options['index_file'])
+
+        # Only completed drafts are indexed, since picks from drafts in progress would never get added later
+        new_drafts = [d for d in completed_drafts(Draft.objects.all()) if _source_key(d) not in index.sources]
+
+        for draft in new_drafts:
+            index.add_source(_source_key(draft), _draft_picks(draft))
+
+        index.save(options['index_file'])
+        print('Indexed {} new drafts; {} sources indexed in total'.format(len(new_drafts), len(index.sources)))
+
+        for name, average_pick, times_taken, times_passed in index.rankings()[:options['top']]:
+            print('{}: average pick {:.2f}, taken {} times, passed {} times'.format(
+                name, average_pick + 1, times_taken, times_passed))
+
+
+def _source_key(draft):
+    return 'website-draft:{}'.format(draft.id)
+
+
+def _draft_picks(draft):
+    """Reconstructs (pick, pack, picked) for every pick in a completed draft from the Card models."""
+    cards_by_pack = {}
+    for card in draft.card_set.all():
+        cards_by_pack.setdefault((card.phase, card.start_seat), []).append(card)
+
+    for pack in cards_by_pack.values():
+        # Every card in a completed draft was picked, and the pack at pick N contains every card picked at N or later
+        for card in pack:
+            pack_at_pick = [c.name for c in pack if c.picked_at >= card.picked_at]
+            yield card.picked_at, pack_at_pick, card.name
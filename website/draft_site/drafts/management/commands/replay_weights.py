@@ -0,0 +1,100 @@
+import os
+import random
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from drafts.constants import CUBES_BY_ID
+from drafts.models import Draft
+from drafts.pick_history import completed_drafts, pick_history
+
+from mtg_draft_ai import tuning
+from mtg_draft_ai.brains import SynergyPowerFixingPicker
+from mtg_draft_ai.replay import ComponentCorpus, ReplayPick
+
+
+DEFAULT_CORPUS_FILE = os.path.join(settings.BASE_DIR, 'replay_components.npz')
+
+
+class Command(BaseCommand):
+    help = 'Scores SynergyPowerFixingPicker weight configurations by how often they agree with human picks'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--cube-id',
+            type=int,
+            default=81183,
+            help='Cube whose drafts to replay; its picker must be a SynergyPowerFixingPicker',
+        )
+        parser.add_argument(
+            '--corpus-file',
+            default=DEFAULT_CORPUS_FILE,
+            help='Path of the file to cache the rating components of every human pick in',
+        )
+        parser.add_argument(
+            '--num-configs',
+            type=int,
+            default=500,
+            help='Number of weight configurations to sample from the default search space',
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=0,
+            help='Random seed for sampling configurations',
+        )
+        parser.add_argument(
+            '--top',
+            type=int,
+            default=10,
+            help='Number of configurations to print',
+        )
+
+    def handle(self, *args, **options):
+        cube_data = CUBES_BY_ID[options['cube_id']]
+        picker = cube_data.picker_factory.create()
+        if not isinstance(picker, SynergyPowerFixingPicker):
+            raise CommandError('Cube {} does not use SynergyPowerFixingPicker'.format(options['cube_id']))
+
+        component_names = [cr.name() for cr in picker.component_raters]
+        corpus = ComponentCorpus.load(options['corpus_file'], component_names,
+                                      'SynergyPowerFixingPicker:{}'.format(cube_data.version))
+
+        # Only completed drafts are replayed, since picks from drafts in progress would never get added later
+        new_drafts = [d for d in completed_drafts(Draft.objects.filter(cube_id=options['cube_id']))
+                      if _source_key(d) not in corpus.sources]
+
+        for draft in new_drafts:
+            corpus.add_source(_source_key(draft), _human_picks(draft, cube_data), picker)
+
+        corpus.save(options['corpus_file'])
+        print('Replayed {} new drafts; {} human picks in total'.format(len(new_drafts), corpus.num_picks))
+        if corpus.num_picks == 0:
+            return
+
+        configs = tuning.sample_configs(tuning.DEFAULT_SEARCH_SPACE, options['num_configs'],
+                                        random.Random(options['seed']))
+        if tuning.default_config() not in configs:
+            configs.append(tuning.default_config())
+        agreement = corpus.agreement([tuning.weights_for(c) for c in configs])
+
+        ranked = sorted(zip(agreement, configs), key=lambda pair: pair[0], reverse=True)
+        for rank, (config_agreement, config) in enumerate(ranked):
+            is_default = config == tuning.default_config()
+            if rank < options['top'] or is_default:
+                print('{}. agreement {:.2%}{}: {}'.format(rank + 1, config_agreement,
+                                                          ' (default)' if is_default else '',
+                                                          tuning.changed_params(config)))
+
+
+def _source_key(draft):
+    return 'website-draft:{}'.format(draft.id)
+
+
+def _human_picks(draft, cube_data):
+    """Reconstructs the pack and cards owned at every pick made by a human in a completed draft."""
+    draft_info = draft.to_draft_info(cube_data.cards)
+    for drafter_picks in pick_history(draft, draft.drafter_set.filter(bot=False)):
+        owned = [cube_data.card_by_name(picked.name) for _, picked in drafter_picks]
+        for i, (pack, _) in enumerate(drafter_picks):
+            yield ReplayPick(pack=[cube_data.card_by_name(c.name) for c in pack], cards_owned=owned[:i],
+                             picked=owned[i], draft_info=draft_info)
@@ -0,0 +1,71 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from drafts.constants import CUBES_BY_ID
+from drafts.models import Draft
+from drafts.pick_history import completed_drafts, pick_history
+
+from mtg_draft_ai import pickertiming
+from mtg_draft_ai.brains import TwoColorComboRatingsPicker
+
+
+class Command(BaseCommand):
+    help = 'Times every component rater of a cube\'s bot picker, replaying the pick states of completed drafts'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--cube-id',
+            type=int,
+            default=81183,
+            help='Cube whose drafts to replay through its bot picker',
+        )
+        parser.add_argument(
+            '--max-drafts',
+            type=int,
+            default=None,
+            help='Only replay this many of the most recent completed drafts',
+        )
+        parser.add_argument(
+            '--bins',
+            type=int,
+            default=10,
+            help='Number of bins in the histogram of time per pick',
+        )
+        parser.add_argument(
+            '--json',
+            default=None,
+            help='Optional path to write the timings of every pick to, as JSON',
+        )
+
+    def handle(self, *args, **options):
+        cube_data = CUBES_BY_ID[options['cube_id']]
+        picker = cube_data.picker_factory.create()
+        if not isinstance(picker, TwoColorComboRatingsPicker):
+            raise CommandError('Cube {} does not use a TwoColorComboRatingsPicker'.format(options['cube_id']))
+        timings = picker.enable_timing()
+
+        # Picks from drafts in progress are skipped, since their packs are still changing
+        drafts = completed_drafts(Draft.objects.filter(cube_id=options['cube_id']))
+        drafts = drafts.order_by('-id')[:options['max_drafts']]
+
+        for draft in drafts:
+            draft_info = draft.to_draft_info(cube_data.cards)
+            for drafter_picks in pick_history(draft, draft.drafter_set.all()):
+                owned = [cube_data.card_by_name(picked.name) for _, picked in drafter_picks]
+                for i, (pack, _) in enumerate(drafter_picks):
+                    picker.pick([cube_data.card_by_name(c.name) for c in pack], owned[:i], draft_info)
+
+        print('Timed {} picks from {} drafts'.format(timings.num_picks, len(drafts)))
+        if timings.num_picks == 0:
+            return
+        print(timings.format_summary())
+
+        counts, edges = timings.histogram(*pickertiming.TOTAL, bins=options['bins'])
+        print('\nTime per pick:')
+        for count, low, high in zip(counts, edges, edges[1:]):
+            print('{:>9.2f} - {:>9.2f} ms: {}'.format(low, high, count))
+
+        if options['json']:
+            with open(options['json'], 'w') as f:
+                json.dump(timings.to_dict(), f)
+            print('Timings written to {}'.format(options['json']))
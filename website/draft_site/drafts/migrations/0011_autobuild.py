@@ -0,0 +1,25 @@
+# Generated by Django 3.0.3 on 2026-10-19 18:20
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('drafts', '0010_draft_cube_id'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AutoBuild',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('deck', models.TextField()),
+                ('num_edges', models.IntegerField()),
+                ('avg_power', models.FloatField()),
+                ('cube_version', models.CharField(max_length=64)),
+                ('drafter', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, to='drafts.Drafter')),
+            ],
+        ),
+    ]
@@ -0,0 +1,16 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('drafts', '0011_autobuild'),
+    ]
+
+    operations = [
+        migrations.RenameField(
+            model_name='autobuild',
+            old_name='cube_version',
+            new_name='build_version',
+        ),
+    ]
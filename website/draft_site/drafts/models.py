@@ -1,3 +1,5 @@
+import json
+
 from django.db import models
 from mtg_draft_ai.api import DraftInfo
 
@@ -140,3 +142,19 @@ class Card(models.Model):
 
     def __str__(self):
         return str(self.__dict__)
+
+
+class AutoBuild(models.Model):
+    """A deck automatically built from a drafter's pool once their draft is complete."""
+    drafter = models.OneToOneField(Drafter, on_delete=models.CASCADE)
+    deck = models.TextField()  # JSON list of card names
+    num_edges = models.IntegerField()
+    avg_power = models.FloatField()
+    # Changes with the cube, the deckbuilding algorithm and its settings, so builds from older versions are redone
+    build_version = models.CharField(max_length=64)
+
+    def __str__(self):
+        return 'Drafter: {}, # Edges: {}, Avg Power: {}'.format(self.drafter_id, self.num_edges, self.avg_power)
+
+    def deck_card_names(self):
+        return json.loads(self.deck)
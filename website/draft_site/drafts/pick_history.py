@@ -0,0 +1,42 @@
+from django.db.models import F
+
+from . import models
+
+
+def completed_drafts(drafts):
+    """Filters drafts to those which are complete, i.e. every drafter has finished every phase.
+
+    Args:
+        drafts (QuerySet): Drafts to filter.
+
+    Returns:
+        QuerySet: The completed drafts.
+    """
+    incomplete_draft_ids = models.Drafter.objects.filter(current_phase__lt=F('draft__num_phases')).values('draft_id')
+    return drafts.exclude(id__in=incomplete_draft_ids)
+
+
+def pick_history(draft, drafters):
+    """Reconstructs the pack each drafter picked from at every pick of a completed draft, from the Card models.
+
+    Args:
+        draft (Draft): A completed draft.
+        drafters (List[Drafter]): Drafters from the draft to reconstruct picks for.
+
+    Returns:
+        List[List[Tuple[List[Card], Card]]]: For each drafter, (pack, picked card) for each of their picks in order.
+    """
+    cards = list(draft.card_set.all())
+
+    cards_by_pack = {}
+    for card in cards:
+        cards_by_pack.setdefault((card.phase, card.start_seat), []).append(card)
+
+    history = []
+    for drafter in drafters:
+        picked = sorted((c for c in cards if c.picked_by_id == drafter.id), key=lambda c: (c.phase, c.picked_at))
+        # Every card in a completed draft was picked, and the pack at pick N contains every card picked at N or later
+        history.append([([c for c in cards_by_pack[(card.phase, card.start_seat)] if c.picked_at >= card.picked_at],
+                         card)
+                        for card in picked])
+    return history
@@ -1,3 +1,131 @@
+import importlib
+from unittest import mock
+
 from django.test import TestCase
 
-# Create your tests here.
+from . import autobuild, models
+from .pick_history import completed_drafts
+
+# views re-exports the pick_card view function under the module's name
+pick_card = importlib.import_module('.views.pick_card', __package__)
+
+
+ENABLED_CUBE_ID = 1
+DISABLED_CUBE_ID = 2
+CUBES_BY_ID = {
+    ENABLED_CUBE_ID: mock.Mock(name='enabled_cube', autobuild_enabled=True),
+    DISABLED_CUBE_ID: mock.Mock(name='disabled_cube', autobuild_enabled=False),
+}
+
+
+@mock.patch.object(pick_card, 'CUBES_BY_ID', CUBES_BY_ID)
+@mock.patch.object(pick_card, 'enqueue_auto_builds')
+class AdvancePhaseTest(TestCase):
+
+    def _draft(self, cube_id):
+        draft = models.Draft.objects.create(cube_id=cube_id, num_drafters=2, num_phases=3, cards_per_pack=2)
+        for seat in range(0, draft.num_drafters):
+            models.Drafter.objects.create(draft=draft, seat=seat, bot=False)
+        return draft
+
+    def _finish_every_phase(self, draft, enqueue_auto_builds):
+        """Finishes each phase in turn, returning the number of times builds were queued after each one."""
+        enqueue_counts = []
+        for phase in range(0, draft.num_phases):
+            draft.drafter_set.update(current_phase=phase, current_pick=draft.cards_per_pack)
+            with self.captureOnCommitCallbacks(execute=True):
+                pick_card._advance_phase_if_needed(draft)
+            enqueue_counts.append(enqueue_auto_builds.call_count)
+        return enqueue_counts
+
+    def test_builds_queued_once_when_draft_completes(self, enqueue_auto_builds):
+        draft = self._draft(ENABLED_CUBE_ID)
+
+        enqueue_counts = self._finish_every_phase(draft, enqueue_auto_builds)
+
+        assert enqueue_counts == [0, 0, 1]
+        enqueue_auto_builds.assert_called_once_with(draft)
+        assert all(d.current_phase == draft.num_phases for d in draft.drafter_set.all())
+
+    def test_builds_not_queued_for_unfinished_phase(self, enqueue_auto_builds):
+        draft = self._draft(ENABLED_CUBE_ID)
+        draft.drafter_set.filter(seat=0).update(current_phase=2, current_pick=draft.cards_per_pack)
+        draft.drafter_set.filter(seat=1).update(current_phase=2, current_pick=draft.cards_per_pack - 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            pick_card._advance_phase_if_needed(draft)
+
+        enqueue_auto_builds.assert_not_called()
+
+    def test_builds_not_queued_when_autobuild_disabled(self, enqueue_auto_builds):
+        draft = self._draft(DISABLED_CUBE_ID)
+
+        enqueue_counts = self._finish_every_phase(draft, enqueue_auto_builds)
+
+        assert enqueue_counts == [0, 0, 0]
+
+
+class CompletedDraftsTest(TestCase):
+
+    def _draft(self, drafter_phases):
+        draft = models.Draft.objects.create(cube_id=ENABLED_CUBE_ID, num_drafters=len(drafter_phases), num_phases=3,
+                                            cards_per_pack=2)
+        for seat, phase in enumerate(drafter_phases):
+            models.Drafter.objects.create(draft=draft, seat=seat, bot=False, current_phase=phase)
+        return draft
+
+    def test_only_drafts_every_drafter_finished(self):
+        complete = self._draft([3, 3])
+        self._draft([3, 2])
+        self._draft([0, 0])
+
+        assert list(completed_drafts(models.Draft.objects.all())) == [complete]
+
+    def test_filters_given_queryset(self):
+        complete = self._draft([3, 3])
+        models.Draft.objects.filter(id=complete.id).update(cube_id=DISABLED_CUBE_ID)
+
+        assert not completed_drafts(models.Draft.objects.filter(cube_id=ENABLED_CUBE_ID)).exists()
+
+
+@mock.patch.object(autobuild, 'CUBES_BY_ID', {ENABLED_CUBE_ID: mock.Mock(name='cube_data', version='v1')})
+@mock.patch.object(autobuild, '_background_worker')
+class AutoBuildForTest(TestCase):
+
+    def setUp(self):
+        autobuild._queued.clear()
+        self.draft = models.Draft.objects.create(cube_id=ENABLED_CUBE_ID, num_drafters=1, num_phases=3,
+                                                 cards_per_pack=2)
+        self.drafter = models.Drafter.objects.create(draft=self.draft, seat=0, bot=False, current_phase=3)
+
+    def _save_build(self, build_version):
+        models.AutoBuild.objects.create(drafter=self.drafter, deck='[]', num_edges=0, avg_power=0,
+                                        build_version=build_version)
+
+    def test_saved_build_returned(self, background_worker):
+        self._save_build(autobuild._build_version(autobuild.CUBES_BY_ID[ENABLED_CUBE_ID]))
+
+        assert autobuild.auto_build_for(self.drafter) == models.AutoBuild.objects.get(drafter=self.drafter)
+        background_worker.return_value.submit.assert_not_called()
+
+    def test_missing_build_queued_once(self, background_worker):
+        assert autobuild.auto_build_for(self.drafter) is None
+        assert autobuild.auto_build_for(self.drafter) is None
+
+        background_worker.return_value.submit.assert_called_once()
+        assert not models.AutoBuild.objects.exists()
+
+    def test_build_from_other_version_rebuilt(self, background_worker):
+        self._save_build('old version')
+
+        assert autobuild.auto_build_for(self.drafter) is None
+        background_worker.return_value.submit.assert_called_once()
+
+    @mock.patch.object(autobuild, '_deckbuild_cache')
+    def test_unfinished_pool_built_in_background(self, deckbuild_cache, background_worker):
+        self.drafter.current_phase = 1
+        deckbuild_cache.return_value.lookup.return_value = None
+
+        assert autobuild.auto_build_for(self.drafter) is None
+        background_worker.return_value.submit.assert_called_once()
+        deckbuild_cache.return_value.build.assert_not_called()
@@ -1,13 +1,9 @@
-import statistics
-
 from django.shortcuts import render, get_object_or_404
 
 from .. import models
+from ..autobuild import auto_build_for
 from ..constants import CUBES_BY_ID
 from .. import deck_export
-from mtg_draft_ai.brains import power_rating
-from mtg_draft_ai.deckbuild import best_two_color_synergy_build
-from mtg_draft_ai import synergy
 
 
 # /draft/<int:draft_id>/seat/<int:seat>/auto-build
@@ -16,27 +12,30 @@ def auto_build(request, draft_id, seat):
     drafter = draft.drafter_set.get(seat=seat)
     cube_data = CUBES_BY_ID[draft.cube_id]
 
-    # Convert from DB objects to Card objects with metadata
-    pool = [cube_data.card_by_name(c.name) for c in drafter.owned_cards()]
-
-    built_deck = best_two_color_synergy_build(pool)
-    deck_graph = synergy.create_graph(built_deck, remove_isolated=False)
-    leftovers = [c for c in pool if c not in built_deck]
-    # TODO: fix interface
-    avg_power = statistics.mean([power_rating(c) for c in built_deck
-                                 if 'land' not in c.types])
-
     context = {
         'draft': draft,
         'drafter': drafter,
         'cube_name': cube_data.name,
         'cubecobra_url': cube_data.cubecobra_url(),
         'seat_range': range(0, draft.num_drafters),  # Used by header
+    }
+
+    # Builds are precomputed when a draft completes, so this is usually just a lookup
+    saved_build = auto_build_for(drafter)
+    if saved_build is None:
+        return render(request, 'drafts/auto_build_pending.html', context)
+
+    # Convert from DB objects to Card objects with metadata
+    pool = [cube_data.card_by_name(c.name) for c in drafter.owned_cards()]
+    built_deck = [cube_data.card_by_name(name) for name in saved_build.deck_card_names()]
+    leftovers = [c for c in pool if c not in built_deck]
+
+    context.update({
         'built_deck_images': [cube_data.get_image_urls(c.name) for c in built_deck],
         'leftovers_images': [cube_data.get_image_urls(c.name) for c in leftovers],
-        'num_edges': len(deck_graph.edges),
-        'avg_power': round(avg_power, 2),
-    }
+        'num_edges': saved_build.num_edges,
+        'avg_power': round(saved_build.avg_power, 2),
+    })
 
     deck_exports_context = {
         'cockatrice_export': deck_export.cockatrice(built_deck, leftovers),
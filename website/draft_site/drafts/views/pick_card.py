@@ -6,6 +6,7 @@ from django.urls import reverse
 from django.db import transaction
 
 from .. import models
+from ..autobuild import enqueue_auto_builds
 from ..constants import CUBES_BY_ID
 
 LOGGER = logging.getLogger(__name__)
@@ -53,5 +54,12 @@ def _advance_phase_if_needed(draft):
         for drafter in all_drafters:
             drafter.advance_phase()
 
+        # Every drafter advances at once, so the draft is complete when they advance past the last phase (advance_phase
+        # only updates the database, so current_phase is still the phase they finished). Builds are queued once the
+        # picks are committed, so the worker sees the complete pools. Only cubes with auto-builds enabled need them.
+        draft_complete = all_drafters[0].current_phase + 1 == draft.num_phases
+        if draft_complete and CUBES_BY_ID[draft.cube_id].autobuild_enabled:
+            transaction.on_commit(lambda: enqueue_auto_builds(draft))
+
     if draft.eager_picks_enabled(all_drafters):
         draft.make_initial_bot_picks(CUBES_BY_ID[draft.cube_id])
@@ -2,6 +2,7 @@ from django.shortcuts import render, get_object_or_404
 
 from .. import deck_export
 from .. import models
+from .. import wheel
 from ..constants import CUBES_BY_ID
 
 
@@ -35,8 +36,10 @@ def show_seat(request, draft_id, seat):
     bot_ratings_table = [[r.card.name, r.rating, r.color_combo] + [r.components[k] for k in component_keys]
                          for r in bot_ratings]
 
+    wheel_probabilities = wheel.wheel_probabilities(drafter, current_pack, cube_data) if current_pack else {}
     current_pack_context = {
-        'cards': [(c, cube_data.get_image_urls(c.name)) for c in current_pack],
+        'cards': [(c, cube_data.get_image_urls(c.name), round(100 * wheel_probabilities[c.name]))
+                  for c in current_pack],
         'owned_cards': [(c, cube_data.get_image_urls(c.name)) for c in sorted_owned_cards],
         'bot_ratings_column_names': bot_ratings_column_names,
         'bot_ratings_table': bot_ratings_table,
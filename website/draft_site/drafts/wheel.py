@@ -0,0 +1,64 @@
+from collections import OrderedDict
+import threading
+
+from mtg_draft_ai import wheel
+
+# Wheel estimates only change when a pick is made, so cache them per (draft, seat, phase, pick).
+CACHE_SIZE = 1000
+NUM_SIMULATIONS = 200
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def wheel_probabilities(drafter, current_pack, cube_data):
+    """Estimates the probability of each card in the drafter's current pack coming back to them.
+
+    Args:
+        drafter (models.Drafter): The drafter viewing the pack.
+        current_pack (List[models.Card]): The drafter's current pack.
+        cube_data (CubeData): Cube data for the draft.
+
+    Returns:
+        Dict[str, float]: Wheel probability by card name.
+    """
+    draft = drafter.draft
+    key = (draft.id, drafter.seat, drafter.current_phase, drafter.current_pick)
+
+    with _cache_lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            return _cache[key]
+
+    pack = [cube_data.card_by_name(c.name) for c in current_pack]
+    seats = _downstream_seat_models(drafter, cube_data)
+    probabilities = {card.name: p for card, p in wheel.wheel_probabilities(pack, seats, NUM_SIMULATIONS).items()}
+
+    with _cache_lock:
+        _cache[key] = probabilities
+        if len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+
+    return probabilities
+
+
+def _downstream_seat_models(drafter, cube_data):
+    draft = drafter.draft
+    draft_info = draft.to_draft_info(cube_data.cards)
+    drafters_by_seat = {d.seat: d for d in draft.drafter_set.all()}
+
+    # Fetch every pool in a single query instead of one per drafter
+    owned_by_drafter_id = {}
+    for db_card in draft.card_set.filter(picked_by__isnull=False).order_by('phase', 'picked_at'):
+        owned_by_drafter_id.setdefault(db_card.picked_by_id, []).append(cube_data.card_by_name(db_card.name))
+
+    # The pack is passed in the opposite direction from the one it's received from.
+    seats = []
+    for i in range(1, draft.num_drafters):
+        seat = (drafter.seat + i * drafter.direction()) % draft.num_drafters
+        downstream = drafters_by_seat[seat]
+        temperature = None if downstream.bot else wheel.HUMAN_TEMPERATURE
+        seats.append(wheel.SeatModel(cube_data.picker_factory.create(), owned_by_drafter_id.get(downstream.id, []),
+                                     draft_info, temperature=temperature))
+
+    return seats